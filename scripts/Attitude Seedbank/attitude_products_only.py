@@ -1,22 +1,42 @@
 #!/usr/bin/env python3
-import requests
+import os
+import sys
 import json
-import boto3
 import re
-import time
-from bs4 import BeautifulSoup
 from datetime import datetime
-from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fetch_engine import FetchEngine
+from common.extraction_context import ExtractionContext
+from common.html_parser import make_soup
+from common.progress_journal import ProgressJournal
+from common.recrawl import RecrawlIndex
+from common.response_cache import ResponseCache
+from common.storage import open_storage
+from common.unlocker_client import UnlockerClient
 
 class AttitudeProductScraper:
-    def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-        self.table = self.dynamodb.Table('cannabis-strains-universal')
-        self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-        self.api_credentials = self.get_brightdata_credentials()
-        self.stats = {'total_processed': 0, 'successful': 0, 'failed': 0, 'cost_estimate': 0.0}
+    def __init__(self, offline=False):
+        """offline: replay pages from the response cache only, without AWS or BrightData (re-extraction)"""
+        if offline:
+            self.fetch_engine = FetchEngine.cache_only()
+        else:
+            import boto3
+            self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
+            self.api_credentials = self.get_brightdata_credentials()
+            if not self.api_credentials:
+                # Without a key every request would come back 401 and be retried and billed as a block
+                raise RuntimeError("No BrightData credentials (secret cannabis-brightdata-api); not scraping")
+            self.recrawl = RecrawlIndex.open('attitude-products')
+            self.sink = self.recrawl.wrap(open_storage())
+            self.journal = ProgressJournal.open('attitude-products')
+            self.journal.attach(self.sink)
+            self.unlocker = UnlockerClient(self.api_credentials['api_key'], 'cannabis_unlocker', timeout=300)
+            self.fetch_engine = FetchEngine(self.unlocker, cache=ResponseCache.from_env())
+        self.stats = {'total_processed': 0, 'successful': 0, 'failed': 0}
 
     def get_brightdata_credentials(self):
+        from botocore.exceptions import ClientError
         try:
             response = self.secrets_client.get_secret_value(SecretId='cannabis-brightdata-api')
             return json.loads(response['SecretString'])
@@ -25,23 +45,7 @@ class AttitudeProductScraper:
             return None
 
     def scrape_with_brightdata(self, url):
-        if not self.api_credentials:
-            return None
-            
-        api_url = "https://api.brightdata.com/request"
-        headers = {"Authorization": f"Bearer {self.api_credentials['api_key']}"}
-        payload = {"zone": "cannabis_unlocker", "url": url, "format": "raw"}
-        
-        try:
-            response = requests.post(api_url, headers=headers, json=payload, timeout=300)
-            self.stats['cost_estimate'] += 0.0015
-            
-            if response.status_code == 200:
-                return response.text
-            else:
-                return None
-        except Exception as e:
-            return None
+        return self.fetch_engine.fetch_one(url)
 
     def extract_strain_data(self, soup, url):
         data = {'bank_name': 'The Attitude Seed Bank', 'url': url, 'scraped_at': datetime.now().isoformat()}
@@ -74,7 +78,7 @@ class AttitudeProductScraper:
         # Extract description data
         desc_tab = soup.find('div', id='tabDesc')
         if desc_tab:
-            desc_text = desc_tab.get_text()
+            desc_text = soup.text_of(desc_tab)
             data['about_info'] = desc_text.strip()
             
             # Extract breeder
@@ -94,60 +98,82 @@ class AttitudeProductScraper:
         return data
 
     def save_to_dynamodb(self, strain_data):
-        try:
-            strain_id = f"{strain_data.get('strain_name', 'unknown')}_{strain_data.get('breeder_name', 'attitude')}"
-            strain_id = re.sub(r'[^a-z0-9_-]', '_', strain_id.lower())
-            strain_data['strain_id'] = strain_id
-            self.table.put_item(Item=strain_data)
-            return True
-        except Exception as e:
-            return False
+        """Queue the record for storage; errors propagate so the journal records them"""
+        strain_id = f"{strain_data.get('strain_name', 'unknown')}_{strain_data.get('breeder_name', 'attitude')}"
+        strain_id = re.sub(r'[^a-z0-9_-]', '_', strain_id.lower())
+        strain_data['strain_id'] = strain_id
+        self.sink.put(strain_data)
 
     def run_product_scraping(self):
-        # Load URLs from file
         try:
-            with open('attitude_product_urls.txt', 'r') as f:
-                urls = [line.strip() for line in f if line.strip()]
-        except FileNotFoundError:
-            print("No URLs file found. Run full scraper first.")
-            return
-        
-        print(f"Processing {len(urls)} product URLs...")
+            # Load URLs from file
+            try:
+                with open('attitude_product_urls.txt', 'r') as f:
+                    urls = [line.strip() for line in f if line.strip()]
+            except FileNotFoundError:
+                print("No URLs file found. Run full scraper first.")
+                return
+            
+            urls = self.journal.plan(urls)
+            print(f"Processing {len(urls)} product URLs...")
+            self.fetch_engine.phase = 'product'
         
-        for i, url in enumerate(urls, 1):
-            print(f"[{i}/{len(urls)}] Processing...")
+            for i, (url, html) in enumerate(self.fetch_engine.fetch_all(urls), 1):
+                print(f"[{i}/{len(urls)}] Processing...")
             
-            html = self.scrape_with_brightdata(url)
-            if html:
-                soup = BeautifulSoup(html, 'html.parser')
-                strain_data = self.extract_strain_data(soup, url)
+                if html:
+                    self.journal.mark(url, 'fetched')
+                    soup = ExtractionContext(make_soup(html), url)
+                    strain_data = self.extract_strain_data(soup, url)
                 
-                if strain_data.get('strain_name') and self.save_to_dynamodb(strain_data):
-                    strain_name = strain_data.get('strain_name', '').encode('ascii', 'ignore').decode('ascii')
-                    breeder_name = strain_data.get('breeder_name', 'Unknown').encode('ascii', 'ignore').decode('ascii')
-                    print(f"  SUCCESS: {strain_name} - {breeder_name}")
-                    self.stats['successful'] += 1
+                    if not strain_data.get('strain_name'):
+                        print(f"  ERROR: No strain name found")
+                        self.stats['failed'] += 1
+                        self.journal.mark(url, 'failed', 'no strain name')
+                    else:
+                        self.journal.mark(url, 'extracted')
+                        try:
+                            self.save_to_dynamodb(strain_data)
+                        except Exception as e:
+                            print(f"  ERROR: Failed to save: {e}")
+                            self.stats['failed'] += 1
+                            self.journal.mark(url, 'failed', f'save failed: {e}')
+                        else:
+                            strain_name = strain_data.get('strain_name', '').encode('ascii', 'ignore').decode('ascii')
+                            breeder_name = strain_data.get('breeder_name', 'Unknown').encode('ascii', 'ignore').decode('ascii')
+                            print(f"  SUCCESS: {strain_name} - {breeder_name}")
+                            self.stats['successful'] += 1
                 else:
-                    print(f"  ERROR: Failed to process")
+                    print(f"  ERROR: No HTML returned")
                     self.stats['failed'] += 1
-            else:
-                print(f"  ERROR: No HTML returned")
-                self.stats['failed'] += 1
-            
-            self.stats['total_processed'] += 1
+                    self.journal.mark(url, 'failed', 'fetch failed')
             
-            if i % 100 == 0:
-                success_rate = (self.stats['successful'] / self.stats['total_processed']) * 100
-                print(f"\\nProgress: {i}/{len(urls)} ({success_rate:.1f}% success)")
-                print(f"Cost: ${self.stats['cost_estimate']:.2f}")
+                self.stats['total_processed'] += 1
             
-            time.sleep(2)
+                if i % 100 == 0:
+                    success_rate = (self.stats['successful'] / self.stats['total_processed']) * 100
+                    print(f"\\nProgress: {i}/{len(urls)} ({success_rate:.1f}% success)")
+                    print(f"Cost: ${self.fetch_engine.cost:.2f}")
+        
+        finally:
+            # Written records are acknowledged before the journal decides whether the run is complete
+            self.sink.close()
+            self.journal.finish(self.fetch_engine.budget)
         
         # Final stats
         success_rate = (self.stats['successful'] / self.stats['total_processed']) * 100
         print(f"\\nFINAL: {self.stats['successful']}/{self.stats['total_processed']} ({success_rate:.1f}% success)")
-        print(f"Total Cost: ${self.stats['cost_estimate']:.2f}")
+        self.fetch_engine.print_cost(self.stats['successful'])
+        self.fetch_engine.print_stats()
+        self.sink.print_stats()
+        self.journal.print_stats()
+        self.recrawl.print_stats()
 
 if __name__ == "__main__":
     scraper = AttitudeProductScraper()
-    scraper.run_product_scraping()
\ No newline at end of file
+    try:
+        scraper.run_product_scraping()
+    finally:
+        scraper.fetch_engine.close()
+        scraper.journal.close()
+        scraper.recrawl.close()
\ No newline at end of file
@@ -4,24 +4,47 @@ The Attitude Seed Bank Scraper
 Target: 3,000-5,000+ strains across 167 pages for 10,000+ milestone
 """
 
-import requests
+import os
+import sys
 import json
-import boto3
 import re
-import time
-from bs4 import BeautifulSoup
 from datetime import datetime
-from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fetch_engine import FetchEngine
+from common.frontier import URLFrontier
+from common.extraction_context import ExtractionContext
+from common.html_parser import make_soup
+from common.pagination import ListingCrawler
+from common.patterns import ATTITUDE_DESCRIPTION, ATTITUDE_HEIGHT_RANGE
+from common.progress_journal import ProgressJournal
+from common.recrawl import RecrawlIndex
+from common.response_cache import ResponseCache
+from common.storage import open_storage
+from common.unlocker_client import UnlockerClient
 
 class AttitudeScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-        self.table = self.dynamodb.Table('cannabis-strains-universal')
-        self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-        self.api_credentials = self.get_brightdata_credentials()
+    def __init__(self, offline=False):
+        """offline: replay pages from the response cache only, without AWS or BrightData (re-extraction)"""
+        if offline:
+            self.fetch_engine = FetchEngine.cache_only()
+            self.frontier = URLFrontier('attitude')
+        else:
+            import boto3
+            self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
+            self.api_credentials = self.get_brightdata_credentials()
+            if not self.api_credentials:
+                # Without a key every request would come back 401 and be retried and billed as a block
+                raise RuntimeError("No BrightData credentials (secret cannabis-brightdata-api); not scraping")
+            self.frontier = URLFrontier.open('attitude')
+            self.recrawl = RecrawlIndex.open('attitude')
+            self.sink = self.recrawl.wrap(open_storage())
+            self.journal = ProgressJournal.open('attitude')
+            self.journal.attach(self.sink)
+            self.unlocker = UnlockerClient(self.api_credentials['api_key'], 'cannabis_unlocker', timeout=300)
+            self.fetch_engine = FetchEngine(self.unlocker, cache=ResponseCache.from_env())
         
-        # Category URLs with page counts
+        # Category URLs with page counts when last checked (the listing crawler finds the current ones)
         self.categories = {
             'feminized': {
                 'url': 'https://www.cannabis-seeds-bank.co.uk/feminized-seeds/cat_106',
@@ -41,11 +64,11 @@ class AttitudeScraper:
             'total_processed': 0,
             'successful': 0,
             'failed': 0,
-            'urls_collected': 0,
-            'cost_estimate': 0.0
+            'urls_collected': 0
         }
 
     def get_brightdata_credentials(self):
+        from botocore.exceptions import ClientError
         try:
             response = self.secrets_client.get_secret_value(SecretId='cannabis-brightdata-api')
             return json.loads(response['SecretString'])
@@ -54,71 +77,32 @@ class AttitudeScraper:
             return None
 
     def scrape_with_brightdata(self, url):
-        if not self.api_credentials:
-            return None
-            
-        api_url = "https://api.brightdata.com/request"
-        headers = {"Authorization": f"Bearer {self.api_credentials['api_key']}"}
-        payload = {
-            "zone": "cannabis_unlocker",
-            "url": url,
-            "format": "raw"
-        }
-        
-        try:
-            response = requests.post(api_url, headers=headers, json=payload, timeout=300)
-            self.stats['cost_estimate'] += 0.0015  # $1.50 per 1000 requests
-            
-            if response.status_code == 200:
-                return response.text
-            else:
-                print(f"BrightData error {response.status_code}: {response.text}")
-                return None
-        except Exception as e:
-            print(f"Request failed for {url}: {e}")
-            return None
+        return self.fetch_engine.fetch_one(url)
+
+    def _listing_product_urls(self, soup):
+        """Product URLs on one category page, made absolute"""
+        page_urls = []
+        for link in soup.find_all('a', href=True):
+            href = link.get('href', '')
+            if '/prod_' in href:
+                # Convert relative URL to absolute URL
+                if href.startswith('/'):
+                    page_urls.append(f"https://www.cannabis-seeds-bank.co.uk{href}")
+                else:
+                    page_urls.append(href)
+        return page_urls
 
     def collect_product_urls(self):
-        """Collect all product URLs from category pages"""
-        all_urls = []
+        """Collect all product URLs from category pages, new ones first"""
+        crawler = ListingCrawler(self.fetch_engine)
         
         for category_name, category_info in self.categories.items():
-            print(f"\nCollecting URLs from {category_name} category ({category_info['pages']} pages)...")
-            
-            for page in range(1, category_info['pages'] + 1):
-                if page == 1:
-                    page_url = category_info['url']
-                else:
-                    page_url = f"{category_info['url']}?page={page}"
-                
-                print(f"  Page {page}/{category_info['pages']}: {page_url}")
-                
-                html = self.scrape_with_brightdata(page_url)
-                if html:
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Extract product URLs from category page
-                    product_links = soup.find_all('a', href=True)
-                    page_urls = []
-                    
-                    for link in product_links:
-                        href = link.get('href', '')
-                        if '/prod_' in href:
-                            # Convert relative URL to absolute URL
-                            if href.startswith('/'):
-                                full_url = f"https://www.cannabis-seeds-bank.co.uk{href}"
-                            else:
-                                full_url = href
-                            
-                            if full_url not in all_urls:
-                                all_urls.append(full_url)
-                                page_urls.append(full_url)
-                    
-                    print(f"    Found {len(page_urls)} product URLs")
-                    time.sleep(3)  # Longer delay for slow pages
-                else:
-                    print(f"    Failed to scrape page {page}")
+            print(f"\nCollecting URLs from {category_name} category (~{category_info['pages']} pages)...")
+            category_url = category_info['url']
+            self.frontier.extend(crawler.crawl(category_url, lambda page: f"{category_url}?page={page}",
+                                               self._listing_product_urls))
         
+        all_urls = self.frontier.ordered()
         self.stats['urls_collected'] = len(all_urls)
         print(f"\nTotal URLs collected: {len(all_urls)}")
         
@@ -175,41 +159,14 @@ class AttitudeScraper:
         # Extract detailed information from description tab
         desc_tab = soup.find('div', id='tabDesc')
         if desc_tab:
-            desc_text = desc_tab.get_text()
+            desc_text = soup.text_of(desc_tab)
             data['about_info'] = desc_text.strip()
             
-            # Extract breeder using pattern matching
-            breeder_match = re.search(r'Cannabis Seeds by ([^\n]+?)(?:\s|$)', desc_text)
-            if breeder_match:
-                data['breeder_name'] = breeder_match.group(1).strip()
-            
-            # Extract specific cultivation data using regex
-            # THC content
-            thc_match = re.search(r'THC:\s*(\d+%)', desc_text)
-            if thc_match:
-                data['thc_content'] = thc_match.group(1)
-            
-            # Indoor specifications
-            indoor_yield_match = re.search(r'Yield:\s*([\d\s-]+gr/m2)', desc_text)
-            if indoor_yield_match:
-                data['yield_indoor'] = indoor_yield_match.group(1).strip()
-            
-            indoor_height_match = re.search(r'Height:\s*([\d\s-]+cm)', desc_text)
-            if indoor_height_match:
-                data['height_indoor'] = indoor_height_match.group(1).strip()
-            
-            # Cultivation time
-            cultivation_match = re.search(r'Total Cultivation:\s*([\d\s-]+days)', desc_text)
-            if cultivation_match:
-                data['cultivation_time'] = cultivation_match.group(1).strip()
-            
-            # Outdoor harvest period
-            harvest_match = re.search(r'Harvest:\s*(From [^\n]+)', desc_text)
-            if harvest_match:
-                data['harvest_period'] = harvest_match.group(1).strip()
+            # Breeder and cultivation data from the labelled description lines
+            data.update(ATTITUDE_DESCRIPTION.extract(desc_text))
             
             # Outdoor height - simple extraction, will be refined later
-            height_matches = re.findall(r'Height:\s*(\d+\s*-\s*\d+\s*cm)', desc_text)
+            height_matches = ATTITUDE_HEIGHT_RANGE.findall(desc_text)
             if len(height_matches) > 1:
                 data['height_outdoor'] = height_matches[1].strip()  # Second height match is usually outdoor
         
@@ -224,25 +181,28 @@ class AttitudeScraper:
             
             strain_data['strain_id'] = strain_id
             
-            self.table.put_item(Item=strain_data)
+            self.sink.put(strain_data)
             return True
         except Exception as e:
             print(f"Error saving to DynamoDB: {e}")
             return False
 
-    def scrape_product_page(self, url):
-        """Scrape individual product page"""
-        html = self.scrape_with_brightdata(url)
+    def scrape_product_page(self, url, html):
+        """Extract and store an individual product page fetched by the engine"""
         if not html:
+            self.journal.mark(url, 'failed', 'fetch failed')
             return False
         
-        soup = BeautifulSoup(html, 'html.parser')
+        self.journal.mark(url, 'fetched')
+        soup = ExtractionContext(make_soup(html), url)
         strain_data = self.extract_strain_data(soup, url)
         
         # Validate required fields
         if not strain_data.get('strain_name'):
             print(f"  ERROR: No strain name found")
+            self.journal.mark(url, 'failed', 'no strain name')
             return False
+        self.journal.mark(url, 'extracted')
         
         # Save to database
         if self.save_to_dynamodb(strain_data):
@@ -250,6 +210,7 @@ class AttitudeScraper:
             return True
         else:
             print(f"  ERROR: Failed to save {strain_data.get('strain_name')}")
+            self.journal.mark(url, 'failed', 'save failed')
             return False
 
     def run_full_scrape(self):
@@ -258,34 +219,39 @@ class AttitudeScraper:
         print("Target: 3,000-5,000+ strains for 10,000+ milestone")
         print("=" * 60)
         
-        # Phase 1: Collect URLs
-        print("\nPHASE 1: COLLECTING PRODUCT URLS")
-        urls = self.collect_product_urls()
-        
-        if not urls:
-            print("❌ No URLs collected. Exiting.")
-            return
-        
-        # Phase 2: Scrape products
-        print("\nPHASE 2: SCRAPING PRODUCT PAGES")
-        
-        for i, url in enumerate(urls, 1):
-            print(f"\n[{i}/{len(urls)}] {url}")
-            
-            if self.scrape_product_page(url):
-                self.stats['successful'] += 1
-            else:
-                self.stats['failed'] += 1
+        try:
+            # Phase 1: Collect URLs
+            print("\nPHASE 1: COLLECTING PRODUCT URLS")
+            urls = self.collect_product_urls()
             
-            self.stats['total_processed'] += 1
+            if not urls:
+                print("❌ No URLs collected. Exiting.")
+                return
             
-            # Progress update every 50 strains
-            if i % 50 == 0:
-                success_rate = (self.stats['successful'] / self.stats['total_processed']) * 100
-                print(f"\nProgress: {i}/{len(urls)} ({success_rate:.1f}% success rate)")
-                print(f"Estimated cost: ${self.stats['cost_estimate']:.2f}")
+            # Phase 2: Scrape products
+            print("\nPHASE 2: SCRAPING PRODUCT PAGES")
+            urls = self.journal.plan(urls)
+            self.fetch_engine.phase = 'product'
             
-            time.sleep(2)  # Longer delay for slow pages
+            for i, (url, html) in enumerate(self.fetch_engine.fetch_all(urls), 1):
+                print(f"\n[{i}/{len(urls)}] {url}")
+                
+                if self.scrape_product_page(url, html):
+                    self.stats['successful'] += 1
+                else:
+                    self.stats['failed'] += 1
+                
+                self.stats['total_processed'] += 1
+                
+                # Progress update every 50 strains
+                if i % 50 == 0:
+                    success_rate = (self.stats['successful'] / self.stats['total_processed']) * 100
+                    print(f"\nProgress: {i}/{len(urls)} ({success_rate:.1f}% success rate)")
+                    print(f"Metered cost: ${self.fetch_engine.cost:.2f}")
+        finally:
+            # Written records are acknowledged before the journal decides whether the run is complete
+            self.sink.close()
+            self.journal.finish(self.fetch_engine.budget)
         
         # Final statistics
         self.print_final_stats()
@@ -303,8 +269,12 @@ class AttitudeScraper:
         print(f"   Successful: {self.stats['successful']}")
         print(f"   Failed: {self.stats['failed']}")
         print(f"   Success Rate: {success_rate:.1f}%")
-        print(f"Total Cost: ${self.stats['cost_estimate']:.2f}")
-        print(f"Cost per Strain: ${self.stats['cost_estimate']/max(self.stats['successful'], 1):.4f}")
+        self.fetch_engine.print_cost(self.stats['successful'])
+        self.fetch_engine.print_stats()
+        self.frontier.print_stats()
+        self.sink.print_stats()
+        self.journal.print_stats()
+        self.recrawl.print_stats()
         
         if self.stats['successful'] >= 3000:
             print("\nMILESTONE ACHIEVED: 3,000+ strains collected!")
@@ -312,6 +282,16 @@ class AttitudeScraper:
         
         print("\nCannabis genetics revolution continues!")
 
+    def run(self):
+        """Full scrape, then release every resource however it ended"""
+        try:
+            self.run_full_scrape()
+        finally:
+            self.fetch_engine.close()
+            self.frontier.close()
+            self.journal.close()
+            self.recrawl.close()
+
 if __name__ == "__main__":
     scraper = AttitudeScraper()
-    scraper.run_full_scrape()
\ No newline at end of file
+    scraper.run()
\ No newline at end of file
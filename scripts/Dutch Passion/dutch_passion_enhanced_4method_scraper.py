@@ -4,13 +4,20 @@ Dutch Passion Enhanced 4-Method Scraper
 Targets legacy genetics from original seed company (1987)
 """
 
+import os
+import sys
 import json
-import boto3
-import requests
-import time
 import re
 from datetime import datetime
-from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fetch_engine import FetchEngine
+from common.frontier import URLFrontier
+from common.progress_journal import ProgressJournal
+from common.recrawl import RecrawlIndex
+from common.response_cache import ResponseCache
+from common.storage import open_storage
+from common.unlocker_client import UnlockerClient
 
 # Configuration
 SEED_BANK = "Dutch Passion"
@@ -25,19 +32,25 @@ CATEGORIES = [
 ]
 
 class DutchPassionScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        
-        # AWS clients
-        self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-        self.dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-        self.table = self.dynamodb.Table(DYNAMODB_TABLE)
-        
-        # Get BrightData credentials
-        self.api_key = self._get_brightdata_credentials()
+    def __init__(self, offline=False):
+        """offline: replay pages from the response cache only, without AWS or BrightData (re-extraction)"""
+        if offline:
+            self.fetch_engine = FetchEngine.cache_only()
+            self.frontier = URLFrontier('dutch-passion')
+        else:
+            self.frontier = URLFrontier.open('dutch-passion')
+            # AWS clients
+            import boto3
+            self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
+            self.recrawl = RecrawlIndex.open('dutch-passion')
+            self.sink = self.recrawl.wrap(open_storage(DYNAMODB_TABLE))
+            self.journal = ProgressJournal.open('dutch-passion')
+            self.journal.attach(self.sink)
+        
+            # Get BrightData credentials
+            self.api_key = self._get_brightdata_credentials()
+            self.unlocker = UnlockerClient(self.api_key, 'cannabis_strain_scraper')
+            self.fetch_engine = FetchEngine(self.unlocker, cache=ResponseCache.from_env())
         
         # Stats
         self.stats = {
@@ -57,21 +70,8 @@ class DutchPassionScraper:
             return None
 
     def _brightdata_request(self, url):
-        """Make request through BrightData Web Unlocker API"""
-        api_url = "https://api.brightdata.com/request"
-        headers = {"Authorization": f"Bearer {self.api_key}"}
-        payload = {"zone": "cannabis_strain_scraper", "url": url, "format": "raw"}
-        
-        try:
-            response = requests.post(api_url, headers=headers, json=payload, timeout=30)
-            if response.status_code == 200:
-                return response.text
-            else:
-                print(f"BrightData error {response.status_code}: {response.text}")
-                return None
-        except Exception as e:
-            print(f"Request error: {e}")
-            return None
+        """Make request through BrightData Web Unlocker API (pooled keep-alive client)"""
+        return self.fetch_engine.fetch_one(url)
 
     def extract_strain_urls(self, category_url):
         """Extract strain URLs from category page"""
@@ -94,9 +94,9 @@ class DutchPassionScraper:
                     url = f"https://dutch-passion.us{match}"
                 else:
                     url = match
-                if url not in urls:
-                    urls.append(url)
+                urls.append(url)
         
+        urls = list(dict.fromkeys(urls))
         print(f"Found {len(urls)} strain URLs")
         return urls
 
@@ -231,11 +231,10 @@ class DutchPassionScraper:
         self.stats['method_usage']['fallback'] += 1
         return data
 
-    def extract_strain_data(self, url):
+    def extract_strain_data(self, url, html):
         """Extract comprehensive strain data using 4 methods"""
         print(f"Processing: {url}")
         
-        html = self._brightdata_request(url)
         if not html:
             return None
         
@@ -309,7 +308,7 @@ class DutchPassionScraper:
                 **strain_data
             }
             
-            self.table.put_item(Item=item)
+            self.sink.put(item)
             print(f"Saved: {strain_data.get('strain_name', 'Unknown')}")
             return True
             
@@ -317,33 +316,40 @@ class DutchPassionScraper:
             print(f"DynamoDB error: {e}")
             return False
 
+    def collect_strain_urls(self):
+        """Collect unique strain URLs across all categories, new ones first"""
+        # Collect all strain URLs; the frontier drops duplicates across categories
+        for category in CATEGORIES:
+            self.frontier.extend(self.extract_strain_urls(category))
+        
+        unique_urls = self.frontier.ordered()
+        print(f"Total unique strains to process: {len(unique_urls)}")
+        return unique_urls
+
     def run_scraper(self):
         """Main scraper execution"""
         print(f"Starting Dutch Passion 4-Method Scraper")
         print(f"Target: {len(CATEGORIES)} categories")
         
-        all_urls = []
-        
-        # Collect all strain URLs
-        for category in CATEGORIES:
-            urls = self.extract_strain_urls(category)
-            all_urls.extend(urls)
-            time.sleep(2)
-        
-        # Remove duplicates
-        unique_urls = list(set(all_urls))
-        print(f"Total unique strains to process: {len(unique_urls)}")
+        unique_urls = self.journal.plan(self.collect_strain_urls())
+        self.fetch_engine.phase = 'product'
         
         # Process each strain
-        for i, url in enumerate(unique_urls, 1):
+        for i, (url, html) in enumerate(self.fetch_engine.fetch_all(unique_urls), 1):
             print(f"\n[{i}/{len(unique_urls)}] Processing strain...")
+            if not html:
+                self.journal.mark(url, 'failed', 'fetch failed')
+                continue
             
-            strain_data = self.extract_strain_data(url)
+            self.journal.mark(url, 'fetched')
+            strain_data = self.extract_strain_data(url, html)
             if strain_data:
-                self.save_to_dynamodb(strain_data)
-            
-            # Rate limiting
-            time.sleep(1)
+                self.journal.mark(url, 'extracted')
+                if not self.save_to_dynamodb(strain_data):
+                    self.journal.mark(url, 'failed', 'save failed')
+        
+        self.sink.close()
+        self.journal.finish(self.fetch_engine.budget)
         
         # Print final stats
         self._print_final_stats()
@@ -362,7 +368,22 @@ class DutchPassionScraper:
         print(f"\nQuality Distribution:")
         for quality, count in self.stats['quality_distribution'].items():
             print(f"  {quality.title()}: {count}")
+        
+        self.fetch_engine.print_cost(self.stats['successful_extractions'])
+        self.fetch_engine.print_stats()
+        self.frontier.print_stats()
+        self.sink.print_stats()
+        self.journal.print_stats()
+        self.recrawl.print_stats()
+
+    def run(self):
+        """Full scrape, then release every resource"""
+        self.run_scraper()
+        self.fetch_engine.close()
+        self.frontier.close()
+        self.journal.close()
+        self.recrawl.close()
 
 if __name__ == "__main__":
     scraper = DutchPassionScraper()
-    scraper.run_scraper()
\ No newline at end of file
+    scraper.run()
\ No newline at end of file
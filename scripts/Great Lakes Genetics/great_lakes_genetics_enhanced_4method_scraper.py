@@ -5,38 +5,52 @@ Target: 200+ US boutique breeder strains with 95%+ success rate
 Hardcoded: seed_bank as 'Great Lakes Genetics'
 """
 
-import json
-import boto3
-import requests
-import time
+import os
+import sys
 import re
-from bs4 import BeautifulSoup
-from decimal import Decimal
-from datetime import datetime
 
-class GreatLakesGeneticsEnhanced4MethodScraper:
-    def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-        self.table = self.dynamodb.Table('cannabis-strains-universal')
-        self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-        self.brightdata_config = self._get_brightdata_credentials()
-        
-        # Success tracking
-        self.total_processed = 0
-        self.successful_extractions = 0
-        self.method_stats = {'structured': 0, 'description': 0, 'patterns': 0, 'fallback': 0}
-        
-    def _get_brightdata_credentials(self):
-        response = self.secrets_client.get_secret_value(SecretId='cannabis-brightdata-api')
-        return json.loads(response['SecretString'])
-    
-    def _brightdata_request(self, url):
-        api_url = "https://api.brightdata.com/request"
-        headers = {"Authorization": f"Bearer {self.brightdata_config['api_key']}"}
-        payload = {"zone": self.brightdata_config['zone'], "url": url, "format": "raw"}
-        
-        response = requests.post(api_url, headers=headers, json=payload, timeout=30)
-        return response.text if response.status_code == 200 else None
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.four_method_scraper import FourMethodScraper
+from common.patterns import GREAT_LAKES_NOTES
+
+class GreatLakesGeneticsEnhanced4MethodScraper(FourMethodScraper):
+    SEED_BANK = 'Great Lakes Genetics'
+    KEY = 'great-lakes'
+    STRAIN_ID_SUFFIX = 'glg'
+    CATALOG_URLS = ['https://www.greatlakesgenetics.com/breeders/']  # breeders page lists every product
+    PRODUCT_URL_MARKERS = ('/product/',)
+    HIGHLIGHT_FIELDS = (('genetics', 'Genetics'), ('flowering_time', 'Flowering'))
+    UNIQUE_FEATURES = "US boutique breeders, detailed cultivation notes, breeder attribution"
+
+    # Weighted quality score optimized for Great Lakes Genetics
+    FIELD_WEIGHTS = {
+        # Core fields (required)
+        'strain_name': 10,
+        'seed_bank': 10,
+
+        # Great Lakes Genetics strengths
+        'breeder_name': 10,              # Clear breeder attribution
+        'genetics': 9,                   # Parent strain lineage
+        'cultivation_notes': 9,          # Comprehensive growing info
+        'flowering_time': 8,             # Cultivation timing
+        'yield': 8,                      # Production data
+        'strain_type': 7,                # Cannabis classification
+        'sex': 7,                        # Seed type
+        'growing_area': 6,               # Indoor/Outdoor suitability
+        'seeds_in_pack': 5,              # Pack information
+
+        # Enhanced fields from Notes mining
+        'effects_pattern': 7,            # Experience profiles
+        'aroma_pattern': 6,              # Scent profiles
+        'structure_pattern': 5,          # Growth patterns
+        'resin_pattern': 5,              # Quality indicators
+
+        # Additional info
+        'about_info': 6,                 # Detailed descriptions
+        'growth_type': 5,                # Auto/Photo classification
+        'seed_type': 5,                  # Feminized/Regular
+        'us_genetics': 3                 # US breeder indicator
+    }
 
     def method1_structured_extraction(self, soup, url):
         """Method 1: Great Lakes Genetics .et_pb_module_inner container extraction"""
@@ -117,7 +131,7 @@ class GreatLakesGeneticsEnhanced4MethodScraper:
         for selector in desc_selectors:
             elements = soup.select(selector)
             for element in elements:
-                text = element.get_text().strip()
+                text = soup.text_of(element).strip()
                 if text and len(text) > 100:  # Substantial content
                     about_parts.append(text)
         
@@ -126,17 +140,8 @@ class GreatLakesGeneticsEnhanced4MethodScraper:
             data['about_info'] = full_text
             
             # Extract specific patterns from Notes section
-            patterns = {
-                'effects_pattern': r'(?:euphoric|creative|stoned|relaxing|uplifting|energetic|calming)[^.]*',
-                'aroma_pattern': r'(?:nose|aroma|smell)[^.]*?(?:spicy|hash|lemon|fuel|sweet|earthy|pine)[^.]*',
-                'structure_pattern': r'(?:structure|tree|bush|plant)[^.]*?(?:christmas|uniform|branching)[^.]*',
-                'resin_pattern': r'(?:resin|sticky|trichome)[^.]*?(?:production|impressive|coverage)[^.]*'
-            }
-            
-            for key, pattern in patterns.items():
-                matches = re.findall(pattern, full_text, re.IGNORECASE)
-                if matches:
-                    data[key] = '; '.join(matches[:3])  # Limit to 3 matches
+            for key, matches in GREAT_LAKES_NOTES.findall(full_text).items():
+                data[key] = '; '.join(matches[:3])  # Limit to 3 matches
         
         return data
 
@@ -159,7 +164,7 @@ class GreatLakesGeneticsEnhanced4MethodScraper:
                     break
         
         # Detect seed type from content
-        page_text = soup.get_text().lower()
+        page_text = soup.text_lower
         if 'autoflower' in page_text or 'auto' in page_text:
             data['growth_type'] = 'Autoflower'
             data['seed_type'] = 'Feminized'  # Most autos are feminized
@@ -176,7 +181,7 @@ class GreatLakesGeneticsEnhanced4MethodScraper:
             'thug pug', 'exotic genetix', 'oni seed', 'clearwater', 'bloom'
         ]
         
-        page_text_lower = soup.get_text().lower()
+        page_text_lower = soup.text_lower
         for breeder in us_breeders:
             if breeder in page_text_lower:
                 data['us_genetics'] = True
@@ -219,213 +224,9 @@ class GreatLakesGeneticsEnhanced4MethodScraper:
         
         return data
 
-    def apply_4_methods(self, html_content, url):
-        """Apply all 4 extraction methods with Great Lakes Genetics hardcoded values"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        strain_data = {
-            'seed_bank': 'Great Lakes Genetics',
-            'source_url': url,
-            'extraction_methods_used': []
-        }
-        
-        # Method 1: Structured extraction
-        method1_data = self.method1_structured_extraction(soup, url)
-        if method1_data:
-            strain_data.update(method1_data)
-            strain_data['extraction_methods_used'].append('structured')
-            self.method_stats['structured'] += 1
-        
-        # Method 2: Description mining
-        method2_data = self.method2_description_mining(soup, url)
-        if method2_data:
-            strain_data.update(method2_data)
-            strain_data['extraction_methods_used'].append('description')
-            self.method_stats['description'] += 1
-        
-        # Method 3: Advanced patterns
-        method3_data = self.method3_advanced_patterns(soup, url)
-        if method3_data:
-            strain_data.update(method3_data)
-            strain_data['extraction_methods_used'].append('patterns')
-            self.method_stats['patterns'] += 1
-        
-        # Method 4: Fallback extraction
-        method4_data = self.method4_fallback_extraction(soup, url)
-        if method4_data:
-            strain_data.update(method4_data)
-            strain_data['extraction_methods_used'].append('fallback')
-            self.method_stats['fallback'] += 1
-        
-        # Calculate quality score
-        strain_data['data_completeness_score'] = self.calculate_quality_score(strain_data)
-        strain_data['quality_tier'] = self.determine_quality_tier(strain_data['data_completeness_score'])
-        strain_data['field_count'] = len([v for v in strain_data.values() if v])
-        
-        # Create strain ID
-        strain_name = strain_data.get('strain_name', 'Unknown')
-        breeder_name = strain_data.get('breeder_name', 'Unknown')
-        strain_data['strain_id'] = self.create_strain_id(strain_name, breeder_name)
-        
-        # Add timestamps
-        now = datetime.utcnow().isoformat() + 'Z'
-        strain_data['created_at'] = now
-        strain_data['updated_at'] = now
-        
-        return strain_data
-
-    def calculate_quality_score(self, strain_data):
-        """Calculate weighted quality score optimized for Great Lakes Genetics"""
-        field_weights = {
-            # Core fields (required)
-            'strain_name': 10,
-            'seed_bank': 10,
-            
-            # Great Lakes Genetics strengths
-            'breeder_name': 10,              # Clear breeder attribution
-            'genetics': 9,                   # Parent strain lineage
-            'cultivation_notes': 9,          # Comprehensive growing info
-            'flowering_time': 8,             # Cultivation timing
-            'yield': 8,                      # Production data
-            'strain_type': 7,                # Cannabis classification
-            'sex': 7,                        # Seed type
-            'growing_area': 6,               # Indoor/Outdoor suitability
-            'seeds_in_pack': 5,              # Pack information
-            
-            # Enhanced fields from Notes mining
-            'effects_pattern': 7,            # Experience profiles
-            'aroma_pattern': 6,              # Scent profiles
-            'structure_pattern': 5,          # Growth patterns
-            'resin_pattern': 5,              # Quality indicators
-            
-            # Additional info
-            'about_info': 6,                 # Detailed descriptions
-            'growth_type': 5,                # Auto/Photo classification
-            'seed_type': 5,                  # Feminized/Regular
-            'us_genetics': 3                 # US breeder indicator
-        }
-        
-        total_possible = sum(field_weights.values())
-        actual_score = 0
-        
-        for field, weight in field_weights.items():
-            if strain_data.get(field) and len(str(strain_data[field]).strip()) > 2:
-                actual_score += weight
-        
-        return round((actual_score / total_possible) * 100, 1)
-
-    def determine_quality_tier(self, score):
-        if score >= 80: return "Premium"
-        elif score >= 60: return "High"
-        elif score >= 40: return "Medium"
-        elif score >= 20: return "Basic"
-        else: return "Minimal"
-
-    def create_strain_id(self, strain_name, breeder_name):
-        combined = f"{strain_name}-{breeder_name}-glg".lower()
-        combined = re.sub(r'[^a-z0-9-]', '', combined.replace(' ', '-'))
-        return combined[:50]
-
-    def collect_strain_urls(self):
-        """Phase 1: Collect all strain URLs from Great Lakes Genetics breeders page"""
-        print("PHASE 1: Collecting Great Lakes Genetics strain URLs...")
-        
-        breeders_url = "https://www.greatlakesgenetics.com/breeders/"
-        
-        print(f"Scraping breeders page: {breeders_url}")
-        
-        html = self._brightdata_request(breeders_url)
-        if not html:
-            print(f"Failed to fetch breeders page: {breeders_url}")
-            return []
-        
-        soup = BeautifulSoup(html, 'html.parser')
-        strain_urls = []
-        
-        # Extract product URLs
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
-            if href and '/product/' in href:
-                if href.startswith('/'):
-                    full_url = f"https://www.greatlakesgenetics.com{href}"
-                else:
-                    full_url = href
-                strain_urls.append(full_url)
-        
-        unique_urls = list(set(strain_urls))  # Remove duplicates
-        print(f"Total unique strains found: {len(unique_urls)}")
-        return unique_urls
-
-    def scrape_strain_details(self, strain_urls):
-        """Phase 2: Extract detailed strain data using 4-method approach"""
-        print(f"\nPHASE 2: Scraping {len(strain_urls)} strains with 4-method extraction...")
-        
-        for i, url in enumerate(strain_urls, 1):
-            self.total_processed += 1
-            print(f"\n[{i}/{len(strain_urls)}] {url}")
-            
-            html = self._brightdata_request(url)
-            if html:
-                strain_data = self.apply_4_methods(html, url)
-                
-                # Quality validation (minimum 20% score)
-                if strain_data['data_completeness_score'] >= 20:
-                    try:
-                        # Convert Decimal for DynamoDB
-                        strain_data['data_completeness_score'] = Decimal(str(strain_data['data_completeness_score']))
-                        
-                        self.table.put_item(Item=strain_data)
-                        self.successful_extractions += 1
-                        
-                        print(f"  SUCCESS: {strain_data.get('strain_name', 'Unknown')} - {strain_data.get('breeder_name', 'Unknown Breeder')}")
-                        print(f"     Quality: {strain_data['quality_tier']} ({float(strain_data['data_completeness_score']):.1f}%)")
-                        print(f"     Methods: {', '.join(strain_data['extraction_methods_used'])}")
-                        
-                        # Show key Great Lakes Genetics fields if present
-                        if strain_data.get('genetics'):
-                            print(f"     Genetics: {strain_data['genetics']}")
-                        if strain_data.get('flowering_time'):
-                            print(f"     Flowering: {strain_data['flowering_time']}")
-                        
-                    except Exception as e:
-                        print(f"  STORAGE FAILED: {e}")
-                else:
-                    print(f"  LOW QUALITY: {strain_data['data_completeness_score']:.1f}% - skipped")
-            else:
-                print(f"  FETCH FAILED")
-            
-            time.sleep(1)
-
-    def print_final_stats(self):
-        """Print comprehensive scraping statistics"""
-        success_rate = (self.successful_extractions / self.total_processed * 100) if self.total_processed > 0 else 0
-        
-        print(f"\nGREAT LAKES GENETICS ENHANCED SCRAPING COMPLETE!")
-        print(f"FINAL STATISTICS:")
-        print(f"   Total Processed: {self.total_processed}")
-        print(f"   Successful: {self.successful_extractions}")
-        print(f"   Success Rate: {success_rate:.1f}%")
-        print(f"\nMETHOD USAGE:")
-        for method, count in self.method_stats.items():
-            print(f"   {method.title()}: {count} strains")
-        print(f"\nCost: ~${self.total_processed * 0.0015:.2f} (BrightData)")
-        print(f"Unique Features: US boutique breeders, detailed cultivation notes, breeder attribution")
-
 def main():
     scraper = GreatLakesGeneticsEnhanced4MethodScraper()
-    
-    # Phase 1: Collect URLs
-    strain_urls = scraper.collect_strain_urls()
-    
-    if not strain_urls:
-        print("No strain URLs found. Exiting.")
-        return
-    
-    # Phase 2: Scrape details
-    scraper.scrape_strain_details(strain_urls)
-    
-    # Final statistics
-    scraper.print_final_stats()
+    scraper.run()
 
 if __name__ == "__main__":
     print("GREAT LAKES GENETICS - ENHANCED 4-METHOD SCRAPER")
@@ -5,38 +5,61 @@ Target: 200-300 autoflower strains with 95%+ success rate
 Hardcoded: seed_bank and breeder_name as 'Mephisto Genetics'
 """
 
+import os
+import sys
 import json
-import boto3
-import requests
-import time
 import re
-from bs4 import BeautifulSoup
-from decimal import Decimal
-from datetime import datetime
 
-class MephistoEnhanced4MethodScraper:
-    def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-        self.table = self.dynamodb.Table('cannabis-strains-universal')
-        self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-        self.brightdata_config = self._get_brightdata_credentials()
-        
-        # Success tracking
-        self.total_processed = 0
-        self.successful_extractions = 0
-        self.method_stats = {'structured': 0, 'description': 0, 'patterns': 0, 'fallback': 0}
-        
-    def _get_brightdata_credentials(self):
-        response = self.secrets_client.get_secret_value(SecretId='cannabis-brightdata-api')
-        return json.loads(response['SecretString'])
-    
-    def _brightdata_request(self, url):
-        api_url = "https://api.brightdata.com/request"
-        headers = {"Authorization": f"Bearer {self.brightdata_config['api_key']}"}
-        payload = {"zone": self.brightdata_config['zone'], "url": url, "format": "raw"}
-        
-        response = requests.post(api_url, headers=headers, json=payload, timeout=30)
-        return response.text if response.status_code == 200 else None
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.four_method_scraper import FourMethodScraper
+from common.patterns import MEPHISTO_DESCRIPTION
+
+class MephistoEnhanced4MethodScraper(FourMethodScraper):
+    SEED_BANK = 'Mephisto Genetics'
+    KEY = 'mephisto'
+    STRAIN_ID_SUFFIX = 'mephisto'
+    STRAIN_ID_BREEDER = 'Mephisto Genetics'
+    BASE_FIELDS = {
+        'breeder_name': 'Mephisto Genetics',  # Always the same for ALL strains
+        'seed_type': 'Feminized',            # Always feminized autoflowers
+        'growth_type': 'Autoflower',         # Always autoflowers
+    }
+    SITEMAP_URL = 'https://mephistogenetics.com/sitemap.xml'
+    SITEMAP_FILTER = 'sitemap_products'
+    CATALOG_URLS = ['https://mephistogenetics.com/collections/all']  # single collections page
+    PRODUCT_URL_MARKERS = ('/products/',)
+    HIGHLIGHT_FIELDS = (('medicinal_effect', 'Medical'), ('growth_odour', 'Odour'))
+    UNIQUE_FEATURES = "Medicinal effects, growth odour, autoflower specialization"
+
+    # Weighted quality score with Mephisto-optimized weights
+    FIELD_WEIGHTS = {
+        # Core fields (required)
+        'strain_name': 10,
+        'breeder_name': 10,  # Always "Mephisto Genetics"
+
+        # Mephisto's strengths (high value)
+        'flowering_time': 9,      # Precise "65 to 75 days from sprout"
+        'plant_height': 8,        # Exact measurements "40 to 60cm"
+        'yield': 8,               # Specific yields "60 to 90 grams"
+        'medicinal_effect': 8,    # UNIQUE - Medical applications
+        'effects': 7,             # Detailed effect descriptions
+
+        # Autoflower specific
+        'growth_type': 6,         # Always "Autoflower"
+        'seed_type': 6,           # Always "Feminized"
+        'grow_difficulty': 6,     # Cultivation difficulty ratings
+        'growth_odour': 5,        # UNIQUE - Odor intensity ratings
+
+        # Breeding documentation
+        'genetics': 7,            # Parent strain lineage
+        'about_info': 6,          # Project + Strain tab content
+        'breeding_generation': 4, # BX, F2, F3 indicators
+        'limited_edition': 3,     # Illuminauto, Artisanal releases
+
+        # Sensory data
+        'aroma_flavour': 6,       # Combined aroma and flavor
+        'availability': 3         # Stock status
+    }
 
     def method1_structured_extraction(self, soup, url):
         """Method 1: Mephisto's unique field-based structure"""
@@ -78,29 +101,19 @@ class MephistoEnhanced4MethodScraper:
         if project_tab:
             project_content = project_tab.find('div', class_='metafield-rich_text_field')
             if project_content:
-                about_parts.append(project_content.get_text().strip())
+                about_parts.append(soup.text_of(project_content).strip())
         
         if strain_tab:
             strain_content = strain_tab.find('div', class_='metafield-rich_text_field')
             if strain_content:
-                about_parts.append(strain_content.get_text().strip())
+                about_parts.append(soup.text_of(strain_content).strip())
         
         if about_parts:
             data['about_info'] = ' '.join(about_parts)
             
             # Mephisto-specific patterns in descriptions
             desc_text = data['about_info']
-            patterns = {
-                'genetics': r'(?:genetics|lineage|cross)[:\s]*([^.]+?)(?:\.|$)',
-                'indica_sativa': r'([0-9]+)%?\s*(?:indica|sativa)',
-                'breeding_notes': r'(?:bred|breeding|selection)[:\s]*([^.]+?)(?:\.|$)',
-                'awards': r'(?:award|cup|winner|champion)[:\s]*([^.]+?)(?:\.|$)'
-            }
-            
-            for key, pattern in patterns.items():
-                match = re.search(pattern, desc_text, re.IGNORECASE)
-                if match:
-                    data[key] = match.group(1).strip()
+            data.update(MEPHISTO_DESCRIPTION.extract(desc_text))
         
         return data
 
@@ -181,7 +194,7 @@ class MephistoEnhanced4MethodScraper:
         product_form = soup.find('form', {'action': '/cart/add'})
         if product_form:
             # Check for sold out indicators
-            sold_out = soup.find(text=re.compile(r'sold out|unavailable', re.IGNORECASE))
+            sold_out = re.search(r'sold out|unavailable', soup.text, re.IGNORECASE)
             if sold_out:
                 data['availability'] = 'SoldOut'
             else:
@@ -189,211 +202,9 @@ class MephistoEnhanced4MethodScraper:
         
         return data
 
-    def apply_4_methods(self, html_content, url):
-        """Apply all 4 extraction methods with Mephisto hardcoded values"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        strain_data = {
-            'seed_bank': 'Mephisto Genetics',
-            'breeder_name': 'Mephisto Genetics',  # Always the same for ALL strains
-            'seed_type': 'Feminized',            # Always feminized autoflowers
-            'growth_type': 'Autoflower',         # Always autoflowers
-            'source_url': url,
-            'extraction_methods_used': []
-        }
-        
-        # Method 1: Structured extraction
-        method1_data = self.method1_structured_extraction(soup, url)
-        if method1_data:
-            strain_data.update(method1_data)
-            strain_data['extraction_methods_used'].append('structured')
-            self.method_stats['structured'] += 1
-        
-        # Method 2: Description mining
-        method2_data = self.method2_description_mining(soup, url)
-        if method2_data:
-            strain_data.update(method2_data)
-            strain_data['extraction_methods_used'].append('description')
-            self.method_stats['description'] += 1
-        
-        # Method 3: Advanced patterns
-        method3_data = self.method3_advanced_patterns(soup, url)
-        if method3_data:
-            strain_data.update(method3_data)
-            strain_data['extraction_methods_used'].append('patterns')
-            self.method_stats['patterns'] += 1
-        
-        # Method 4: Fallback extraction
-        method4_data = self.method4_fallback_extraction(soup, url)
-        if method4_data:
-            strain_data.update(method4_data)
-            strain_data['extraction_methods_used'].append('fallback')
-            self.method_stats['fallback'] += 1
-        
-        # Calculate quality score
-        strain_data['data_completeness_score'] = self.calculate_quality_score(strain_data)
-        strain_data['quality_tier'] = self.determine_quality_tier(strain_data['data_completeness_score'])
-        strain_data['field_count'] = len([v for v in strain_data.values() if v])
-        
-        # Create strain ID
-        strain_name = strain_data.get('strain_name', 'Unknown')
-        strain_data['strain_id'] = self.create_strain_id(strain_name, 'Mephisto Genetics')
-        
-        # Add timestamps
-        now = datetime.utcnow().isoformat() + 'Z'
-        strain_data['created_at'] = now
-        strain_data['updated_at'] = now
-        
-        return strain_data
-
-    def calculate_quality_score(self, strain_data):
-        """Calculate weighted quality score with Mephisto-optimized weights"""
-        field_weights = {
-            # Core fields (required)
-            'strain_name': 10,
-            'breeder_name': 10,  # Always "Mephisto Genetics"
-            
-            # Mephisto's strengths (high value)
-            'flowering_time': 9,      # Precise "65 to 75 days from sprout"
-            'plant_height': 8,        # Exact measurements "40 to 60cm"
-            'yield': 8,               # Specific yields "60 to 90 grams"
-            'medicinal_effect': 8,    # UNIQUE - Medical applications
-            'effects': 7,             # Detailed effect descriptions
-            
-            # Autoflower specific
-            'growth_type': 6,         # Always "Autoflower"
-            'seed_type': 6,           # Always "Feminized"
-            'grow_difficulty': 6,     # Cultivation difficulty ratings
-            'growth_odour': 5,        # UNIQUE - Odor intensity ratings
-            
-            # Breeding documentation
-            'genetics': 7,            # Parent strain lineage
-            'about_info': 6,          # Project + Strain tab content
-            'breeding_generation': 4, # BX, F2, F3 indicators
-            'limited_edition': 3,     # Illuminauto, Artisanal releases
-            
-            # Sensory data
-            'aroma_flavour': 6,       # Combined aroma and flavor
-            'availability': 3         # Stock status
-        }
-        
-        total_possible = sum(field_weights.values())
-        actual_score = 0
-        
-        for field, weight in field_weights.items():
-            if strain_data.get(field) and len(str(strain_data[field]).strip()) > 2:
-                actual_score += weight
-        
-        return round((actual_score / total_possible) * 100, 1)
-
-    def determine_quality_tier(self, score):
-        if score >= 80: return "Premium"
-        elif score >= 60: return "High"
-        elif score >= 40: return "Medium"
-        elif score >= 20: return "Basic"
-        else: return "Minimal"
-
-    def create_strain_id(self, strain_name, breeder_name):
-        combined = f"{strain_name}-{breeder_name}-mephisto".lower()
-        combined = re.sub(r'[^a-z0-9-]', '', combined.replace(' ', '-'))
-        return combined[:50]
-
-    def collect_strain_urls(self):
-        """Phase 1: Collect all strain URLs from single collections page"""
-        print("PHASE 1: Collecting Mephisto strain URLs...")
-        
-        catalog_url = "https://mephistogenetics.com/collections/all"
-        print(f"Scraping catalog: {catalog_url}")
-        
-        html = self._brightdata_request(catalog_url)
-        if not html:
-            print("Failed to fetch catalog page")
-            return []
-        
-        soup = BeautifulSoup(html, 'html.parser')
-        strain_urls = []
-        
-        # Extract product URLs from Shopify collection
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
-            if href and '/products/' in href:
-                full_url = f"https://mephistogenetics.com{href}"
-                strain_urls.append(full_url)
-        
-        unique_urls = list(set(strain_urls))  # Remove duplicates
-        print(f"Total unique strains found: {len(unique_urls)}")
-        return unique_urls
-
-    def scrape_strain_details(self, strain_urls):
-        """Phase 2: Extract detailed strain data using 4-method approach"""
-        print(f"\nPHASE 2: Scraping {len(strain_urls)} strains with 4-method extraction...")
-        
-        for i, url in enumerate(strain_urls, 1):
-            self.total_processed += 1
-            print(f"\n[{i}/{len(strain_urls)}] {url}")
-            
-            html = self._brightdata_request(url)
-            if html:
-                strain_data = self.apply_4_methods(html, url)
-                
-                # Quality validation (minimum 20% score)
-                if strain_data['data_completeness_score'] >= 20:
-                    try:
-                        # Convert Decimal for DynamoDB
-                        strain_data['data_completeness_score'] = Decimal(str(strain_data['data_completeness_score']))
-                        
-                        self.table.put_item(Item=strain_data)
-                        self.successful_extractions += 1
-                        
-                        print(f"  SUCCESS: {strain_data.get('strain_name', 'Unknown')} - Mephisto Genetics")
-                        print(f"     Quality: {strain_data['quality_tier']} ({float(strain_data['data_completeness_score']):.1f}%)")
-                        print(f"     Methods: {', '.join(strain_data['extraction_methods_used'])}")
-                        
-                        # Show unique Mephisto fields if present
-                        if strain_data.get('medicinal_effect'):
-                            print(f"     Medical: {strain_data['medicinal_effect']}")
-                        if strain_data.get('growth_odour'):
-                            print(f"     Odour: {strain_data['growth_odour']}")
-                        
-                    except Exception as e:
-                        print(f"  STORAGE FAILED: {e}")
-                else:
-                    print(f"  LOW QUALITY: {strain_data['data_completeness_score']:.1f}% - skipped")
-            else:
-                print(f"  FETCH FAILED")
-            
-            time.sleep(1)
-
-    def print_final_stats(self):
-        """Print comprehensive scraping statistics"""
-        success_rate = (self.successful_extractions / self.total_processed * 100) if self.total_processed > 0 else 0
-        
-        print(f"\nMEPHISTO GENETICS ENHANCED SCRAPING COMPLETE!")
-        print(f"FINAL STATISTICS:")
-        print(f"   Total Processed: {self.total_processed}")
-        print(f"   Successful: {self.successful_extractions}")
-        print(f"   Success Rate: {success_rate:.1f}%")
-        print(f"\nMETHOD USAGE:")
-        for method, count in self.method_stats.items():
-            print(f"   {method.title()}: {count} strains")
-        print(f"\nCost: ~${self.total_processed * 0.0015:.2f} (BrightData)")
-        print(f"Unique Features: Medicinal effects, growth odour, autoflower specialization")
-
 def main():
     scraper = MephistoEnhanced4MethodScraper()
-    
-    # Phase 1: Collect URLs
-    strain_urls = scraper.collect_strain_urls()
-    
-    if not strain_urls:
-        print("No strain URLs found. Exiting.")
-        return
-    
-    # Phase 2: Scrape details
-    scraper.scrape_strain_details(strain_urls)
-    
-    # Final statistics
-    scraper.print_final_stats()
+    scraper.run()
 
 if __name__ == "__main__":
     print("MEPHISTO GENETICS - ENHANCED 4-METHOD SCRAPER")
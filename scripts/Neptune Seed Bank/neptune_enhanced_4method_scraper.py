@@ -5,38 +5,37 @@ Based on North Atlantic's 100% success rate methodology
 Target: 2,500+ strains with 95%+ success rate
 """
 
-import json
-import boto3
-import requests
-import time
+import os
+import sys
 import re
-from bs4 import BeautifulSoup
-from decimal import Decimal
-from datetime import datetime
 
-class NeptuneEnhanced4MethodScraper:
-    def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-        self.table = self.dynamodb.Table('cannabis-strains-universal')
-        self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-        self.brightdata_config = self._get_brightdata_credentials()
-        
-        # Success tracking
-        self.total_processed = 0
-        self.successful_extractions = 0
-        self.method_stats = {'structured': 0, 'description': 0, 'patterns': 0, 'fallback': 0}
-        
-    def _get_brightdata_credentials(self):
-        response = self.secrets_client.get_secret_value(SecretId='cannabis-brightdata-api')
-        return json.loads(response['SecretString'])
-    
-    def _brightdata_request(self, url):
-        api_url = "https://api.brightdata.com/request"
-        headers = {"Authorization": f"Bearer {self.brightdata_config['api_key']}"}
-        payload = {"zone": self.brightdata_config['zone'], "url": url, "format": "raw"}
-        
-        response = requests.post(api_url, headers=headers, json=payload, timeout=30)
-        return response.text if response.status_code == 200 else None
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.four_method_scraper import FourMethodScraper
+from common.patterns import NEPTUNE_DESCRIPTION
+
+class NeptuneEnhanced4MethodScraper(FourMethodScraper):
+    SEED_BANK = 'Neptune Seed Bank'
+    KEY = 'neptune'
+    STRAIN_ID_SUFFIX = 'neptune'
+    DEFAULT_BREEDER = 'Neptune Seed Bank'
+    SITEMAP_URL = 'https://neptuneseedbank.com/sitemap_index.xml'
+    SITEMAP_FILTER = 'product-sitemap'
+    LISTINGS = [
+        'https://neptuneseedbank.com/product_tag/feminized/',
+        'https://neptuneseedbank.com/product_tag/regular-seeds/',
+        'https://neptuneseedbank.com/product_tag/auto-flowering/',
+    ]
+    LISTING_FIRST_PAGE = '{listing}page/1/'
+    LISTING_MAX_PAGES = 50            # up to 50 pages per tag
+    PRODUCT_URL_MARKERS = ('/product/',)
+
+    FIELD_WEIGHTS = {
+        'strain_name': 10, 'breeder_name': 10,
+        'genetics': 8, 'flowering_time': 8, 'strain_type': 8,
+        'feelings': 7, 'grow_difficulty': 7,  # Neptune unique fields
+        'yield': 6, 'plant_height': 6, 'terpenes': 6,
+        'effects': 5, 'seed_type': 4, 'about_info': 4
+    }
 
     def method1_structured_extraction(self, soup, url):
         """Method 1: Extract from WooCommerce attributes table"""
@@ -87,23 +86,11 @@ class NeptuneEnhanced4MethodScraper:
         # Find description content
         description = soup.find('div', id='description')
         if description:
-            desc_text = description.get_text()
+            desc_text = soup.text_of(description)
             data['about_info'] = desc_text.strip()
             
             # Neptune-specific patterns
-            patterns = {
-                'thc_content': r'THC[:\s]*([0-9.-]+%?(?:\s*-\s*[0-9.-]+%?)?)',
-                'cbd_content': r'CBD[:\s]*([0-9.-]+%?(?:\s*-\s*[0-9.-]+%?)?)',
-                'flowering_time': r'(?:flowering|flower|harvest)[:\s]*([0-9-]+\s*(?:days?|weeks?))',
-                'genetics': r'(?:genetics|cross|lineage)[:\s]*([^.]+?)(?:\.|$)',
-                'effects': r'effects?[:\s]*([^.]+?)(?:\.|$)',
-                'breeder_name': r'by\s+([A-Za-z\s&]+?)(?:\s|$|\.)'
-            }
-            
-            for key, pattern in patterns.items():
-                match = re.search(pattern, desc_text, re.IGNORECASE)
-                if match:
-                    data[key] = match.group(1).strip()
+            data.update(NEPTUNE_DESCRIPTION.extract(desc_text))
         
         return data
 
@@ -176,197 +163,13 @@ class NeptuneEnhanced4MethodScraper:
         
         return data
 
-    def apply_4_methods(self, html_content, url):
-        """Apply all 4 extraction methods"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        strain_data = {
-            'seed_bank': 'Neptune Seed Bank',
-            'source_url': url,
-            'extraction_methods_used': []
-        }
-        
-        # Method 1: Structured extraction
-        method1_data = self.method1_structured_extraction(soup, url)
-        if method1_data:
-            strain_data.update(method1_data)
-            strain_data['extraction_methods_used'].append('structured')
-            self.method_stats['structured'] += 1
-        
-        # Method 2: Description mining
-        method2_data = self.method2_description_mining(soup, url)
-        if method2_data:
-            strain_data.update(method2_data)
-            strain_data['extraction_methods_used'].append('description')
-            self.method_stats['description'] += 1
-        
-        # Method 3: Advanced patterns
-        method3_data = self.method3_advanced_patterns(soup, url)
-        if method3_data:
-            strain_data.update(method3_data)
-            strain_data['extraction_methods_used'].append('patterns')
-            self.method_stats['patterns'] += 1
-        
-        # Method 4: Fallback extraction
-        method4_data = self.method4_fallback_extraction(soup, url)
-        if method4_data:
-            strain_data.update(method4_data)
-            strain_data['extraction_methods_used'].append('fallback')
-            self.method_stats['fallback'] += 1
-        
-        # Calculate quality score
-        strain_data['data_completeness_score'] = self.calculate_quality_score(strain_data)
-        strain_data['quality_tier'] = self.determine_quality_tier(strain_data['data_completeness_score'])
-        strain_data['field_count'] = len([v for v in strain_data.values() if v])
-        
-        # Create strain ID
-        strain_name = strain_data.get('strain_name', 'Unknown')
-        breeder_name = strain_data.get('breeder_name', 'Neptune Seed Bank')
-        strain_data['strain_id'] = self.create_strain_id(strain_name, breeder_name)
-        
-        # Add timestamps
-        now = datetime.utcnow().isoformat() + 'Z'
-        strain_data['created_at'] = now
-        strain_data['updated_at'] = now
-        
-        return strain_data
-
-    def calculate_quality_score(self, strain_data):
-        """Calculate weighted quality score"""
-        field_weights = {
-            'strain_name': 10, 'breeder_name': 10,
-            'genetics': 8, 'flowering_time': 8, 'strain_type': 8,
-            'feelings': 7, 'grow_difficulty': 7,  # Neptune unique fields
-            'yield': 6, 'plant_height': 6, 'terpenes': 6,
-            'effects': 5, 'seed_type': 4, 'about_info': 4
-        }
-        
-        total_possible = sum(field_weights.values())
-        actual_score = 0
-        
-        for field, weight in field_weights.items():
-            if strain_data.get(field) and len(str(strain_data[field]).strip()) > 2:
-                actual_score += weight
-        
-        return round((actual_score / total_possible) * 100, 1)
-
-    def determine_quality_tier(self, score):
-        if score >= 80: return "Premium"
-        elif score >= 60: return "High"
-        elif score >= 40: return "Medium"
-        elif score >= 20: return "Basic"
-        else: return "Minimal"
-
-    def create_strain_id(self, strain_name, breeder_name):
-        combined = f"{strain_name}-{breeder_name}-neptune".lower()
-        combined = re.sub(r'[^a-z0-9-]', '', combined.replace(' ', '-'))
-        return combined[:50]
-
-    def collect_strain_urls(self):
-        """Phase 1: Collect all strain URLs from Neptune"""
-        print("PHASE 1: Collecting Neptune strain URLs...")
-        
-        tag_urls = [
-            'https://neptuneseedbank.com/product_tag/feminized/',
-            'https://neptuneseedbank.com/product_tag/regular-seeds/',
-            'https://neptuneseedbank.com/product_tag/auto-flowering/'
-        ]
-        
-        all_urls = []
-        
-        for tag_url in tag_urls:
-            print(f"\nScraping tag: {tag_url}")
-            
-            for page in range(1, 51):  # Check up to 50 pages per tag
-                page_url = f"{tag_url}page/{page}/"
-                print(f"  Page {page}")
-                
-                html = self._brightdata_request(page_url)
-                if html:
-                    soup = BeautifulSoup(html, 'html.parser')
-                    urls = []
-                    
-                    # Extract product URLs
-                    for link in soup.find_all('a', class_='product-title-link'):
-                        href = link.get('href')
-                        if href:
-                            urls.append(href)
-                    
-                    if urls:
-                        all_urls.extend(urls)
-                        print(f"    Found {len(urls)} strains")
-                    else:
-                        print(f"    No strains - end of tag")
-                        break
-                else:
-                    print(f"    Failed to fetch")
-                    break
-                
-                time.sleep(1)
-        
-        unique_urls = list(set(all_urls))
-        print(f"\nTotal unique strains found: {len(unique_urls)}")
-        return unique_urls
-
-    def scrape_strain_details(self, strain_urls):
-        """Phase 2: Extract detailed strain data using 4-method approach"""
-        print(f"\nPHASE 2: Scraping {len(strain_urls)} strains with 4-method extraction...")
-        
-        for i, url in enumerate(strain_urls, 1):
-            self.total_processed += 1
-            print(f"\n[{i}/{len(strain_urls)}] {url}")
-            
-            html = self._brightdata_request(url)
-            if html:
-                strain_data = self.apply_4_methods(html, url)
-                
-                # Quality validation (minimum 20% score)
-                if strain_data['data_completeness_score'] >= 20:
-                    try:
-                        # Convert Decimal for DynamoDB
-                        strain_data['data_completeness_score'] = Decimal(str(strain_data['data_completeness_score']))
-                        
-                        self.table.put_item(Item=strain_data)
-                        self.successful_extractions += 1
-                        
-                        print(f"  SUCCESS: {strain_data.get('strain_name', 'Unknown')} - {strain_data.get('breeder_name', 'Unknown')}")
-                        print(f"     Quality: {strain_data['quality_tier']} ({float(strain_data['data_completeness_score']):.1f}%)")
-                        print(f"     Methods: {', '.join(strain_data['extraction_methods_used'])}")
-                        
-                    except Exception as e:
-                        print(f"  STORAGE FAILED: {e}")
-                else:
-                    print(f"  LOW QUALITY: {strain_data['data_completeness_score']:.1f}% - skipped")
-            else:
-                print(f"  FETCH FAILED")
-            
-            time.sleep(1)
-
-    def print_final_stats(self):
-        """Print comprehensive scraping statistics"""
-        success_rate = (self.successful_extractions / self.total_processed * 100) if self.total_processed > 0 else 0
-        
-        print(f"\nNEPTUNE ENHANCED SCRAPING COMPLETE!")
-        print(f"FINAL STATISTICS:")
-        print(f"   Total Processed: {self.total_processed}")
-        print(f"   Successful: {self.successful_extractions}")
-        print(f"   Success Rate: {success_rate:.1f}%")
-        print(f"\nMETHOD USAGE:")
-        for method, count in self.method_stats.items():
-            print(f"   {method.title()}: {count} strains")
-        print(f"\nCost: ~${self.total_processed * 0.0015:.2f} (BrightData)")
+    def listing_product_urls(self, soup):
+        """Product URLs on one tag page"""
+        return [link.get('href') for link in soup.find_all('a', class_='product-title-link') if link.get('href')]
 
 def main():
     scraper = NeptuneEnhanced4MethodScraper()
-    
-    # Phase 1: Collect URLs
-    strain_urls = scraper.collect_strain_urls()
-    
-    # Phase 2: Scrape details
-    scraper.scrape_strain_details(strain_urls)
-    
-    # Final statistics
-    scraper.print_final_stats()
+    scraper.run()
 
 if __name__ == "__main__":
     print("NEPTUNE SEED BANK - ENHANCED 4-METHOD SCRAPER")
@@ -5,38 +5,64 @@ Target: 100-200 strains with 95%+ success rate
 Hardcoded: seed_bank and breeder_name as 'Royal Queen Seeds'
 """
 
-import json
-import boto3
-import requests
-import time
+import os
+import sys
 import re
-from bs4 import BeautifulSoup
-from decimal import Decimal
-from datetime import datetime
 
-class RoyalQueenEnhanced4MethodScraper:
-    def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-        self.table = self.dynamodb.Table('cannabis-strains-universal')
-        self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-        self.brightdata_config = self._get_brightdata_credentials()
-        
-        # Success tracking
-        self.total_processed = 0
-        self.successful_extractions = 0
-        self.method_stats = {'structured': 0, 'description': 0, 'patterns': 0, 'fallback': 0}
-        
-    def _get_brightdata_credentials(self):
-        response = self.secrets_client.get_secret_value(SecretId='cannabis-brightdata-api')
-        return json.loads(response['SecretString'])
-    
-    def _brightdata_request(self, url):
-        api_url = "https://api.brightdata.com/request"
-        headers = {"Authorization": f"Bearer {self.brightdata_config['api_key']}"}
-        payload = {"zone": self.brightdata_config['zone'], "url": url, "format": "raw"}
-        
-        response = requests.post(api_url, headers=headers, json=payload, timeout=30)
-        return response.text if response.status_code == 200 else None
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.four_method_scraper import FourMethodScraper
+from common.patterns import ROYAL_QUEEN_DESCRIPTION
+
+class RoyalQueenEnhanced4MethodScraper(FourMethodScraper):
+    SEED_BANK = 'Royal Queen Seeds'
+    KEY = 'royal-queen'
+    STRAIN_ID_SUFFIX = 'rqs'
+    STRAIN_ID_BREEDER = 'Royal Queen Seeds'
+    BASE_FIELDS = {'breeder_name': 'Royal Queen Seeds'}  # Always the same
+    CATALOG_URLS = [
+        'https://www.royalqueenseeds.com/us/33-feminized-cannabis-seeds',
+        'https://www.royalqueenseeds.com/us/34-autoflowering-cannabis-seeds',
+        'https://www.royalqueenseeds.com/us/36-cbd-seeds',
+    ]
+    PRODUCT_URL_MARKERS = ('/feminized-cannabis-seeds/', '/autoflowering-cannabis-seeds/', '/cbd-seeds/')
+    HIGHLIGHT_FIELDS = (('thc', 'THC'), ('yield_indoor', 'Yield Indoor'))
+    UNIQUE_FEATURES = "Comprehensive cultivation data, dual yield measurements"
+
+    # Weighted quality score optimized for Royal Queen Seeds
+    FIELD_WEIGHTS = {
+        # Core fields (required)
+        'strain_name': 10,
+        'breeder_name': 10,
+
+        # Royal Queen Seeds strengths
+        'thc': 9,                    # THC percentages
+        'cbd': 8,                    # CBD content
+        'yield_indoor': 8,           # Indoor yield data
+        'yield_outdoor': 8,          # Outdoor yield data
+        'flowering_time': 9,         # Flowering time
+        'height_indoor': 7,          # Indoor height
+        'height_outdoor': 7,         # Outdoor height
+        'effects': 7,                # Effect descriptions
+        'flavour': 6,                # Flavor profiles
+
+        # Seed type classification
+        'seed_type': 6,              # Feminized/Regular
+        'growth_type': 6,            # Autoflower/Photoperiod
+        'variety': 5,                # Variety classification
+
+        # Genetics and breeding
+        'genetic_background': 7,     # Genetic lineage
+        'genetics_type': 6,          # Indica/Sativa ratios
+
+        # Environmental data
+        'climate': 5,                # Climate requirements
+        'harvest_month': 5,          # Harvest timing
+
+        # Additional info
+        'about_info': 6,             # Product descriptions
+        'availability': 3,           # Stock status
+        'price': 3                   # Pricing data
+    }
 
     def method1_structured_extraction(self, soup, url):
         """Method 1: Royal Queen Seeds structured table extraction"""
@@ -96,7 +122,7 @@ class RoyalQueenEnhanced4MethodScraper:
         for selector in desc_selectors:
             elements = soup.select(selector)
             for element in elements:
-                text = element.get_text().strip()
+                text = soup.text_of(element).strip()
                 if text and len(text) > 50:
                     about_parts.append(text)
         
@@ -105,17 +131,7 @@ class RoyalQueenEnhanced4MethodScraper:
             
             # Extract patterns from descriptions
             desc_text = data['about_info']
-            patterns = {
-                'genetics': r'(?:genetics|lineage|cross|bred from)[:\s]*([^.]+?)(?:\.|$)',
-                'indica_sativa': r'([0-9]+)%?\s*(?:indica|sativa)',
-                'flowering_pattern': r'(?:flower|bloom)[s]?\s+(?:in|for|after)\s+([^.]+?)(?:\.|$)',
-                'yield_pattern': r'(?:yield|produce)[s]?\s+(?:up to|around|about)?\s*([^.]+?)(?:\.|$)'
-            }
-            
-            for key, pattern in patterns.items():
-                match = re.search(pattern, desc_text, re.IGNORECASE)
-                if match:
-                    data[key] = match.group(1).strip()
+            data.update(ROYAL_QUEEN_DESCRIPTION.extract(desc_text))
         
         return data
 
@@ -159,7 +175,7 @@ class RoyalQueenEnhanced4MethodScraper:
                 data['price'] = price_match.group(1)
         
         # Check availability
-        if soup.find(text=re.compile(r'out of stock|sold out|unavailable', re.IGNORECASE)):
+        if re.search(r'out of stock|sold out|unavailable', soup.text, re.IGNORECASE):
             data['availability'] = 'OutOfStock'
         else:
             data['availability'] = 'InStock'
@@ -198,227 +214,9 @@ class RoyalQueenEnhanced4MethodScraper:
         
         return data
 
-    def apply_4_methods(self, html_content, url):
-        """Apply all 4 extraction methods with Royal Queen Seeds hardcoded values"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        strain_data = {
-            'seed_bank': 'Royal Queen Seeds',
-            'breeder_name': 'Royal Queen Seeds',  # Always the same
-            'source_url': url,
-            'extraction_methods_used': []
-        }
-        
-        # Method 1: Structured extraction
-        method1_data = self.method1_structured_extraction(soup, url)
-        if method1_data:
-            strain_data.update(method1_data)
-            strain_data['extraction_methods_used'].append('structured')
-            self.method_stats['structured'] += 1
-        
-        # Method 2: Description mining
-        method2_data = self.method2_description_mining(soup, url)
-        if method2_data:
-            strain_data.update(method2_data)
-            strain_data['extraction_methods_used'].append('description')
-            self.method_stats['description'] += 1
-        
-        # Method 3: Advanced patterns
-        method3_data = self.method3_advanced_patterns(soup, url)
-        if method3_data:
-            strain_data.update(method3_data)
-            strain_data['extraction_methods_used'].append('patterns')
-            self.method_stats['patterns'] += 1
-        
-        # Method 4: Fallback extraction
-        method4_data = self.method4_fallback_extraction(soup, url)
-        if method4_data:
-            strain_data.update(method4_data)
-            strain_data['extraction_methods_used'].append('fallback')
-            self.method_stats['fallback'] += 1
-        
-        # Calculate quality score
-        strain_data['data_completeness_score'] = self.calculate_quality_score(strain_data)
-        strain_data['quality_tier'] = self.determine_quality_tier(strain_data['data_completeness_score'])
-        strain_data['field_count'] = len([v for v in strain_data.values() if v])
-        
-        # Create strain ID
-        strain_name = strain_data.get('strain_name', 'Unknown')
-        strain_data['strain_id'] = self.create_strain_id(strain_name, 'Royal Queen Seeds')
-        
-        # Add timestamps
-        now = datetime.utcnow().isoformat() + 'Z'
-        strain_data['created_at'] = now
-        strain_data['updated_at'] = now
-        
-        return strain_data
-
-    def calculate_quality_score(self, strain_data):
-        """Calculate weighted quality score optimized for Royal Queen Seeds"""
-        field_weights = {
-            # Core fields (required)
-            'strain_name': 10,
-            'breeder_name': 10,
-            
-            # Royal Queen Seeds strengths
-            'thc': 9,                    # THC percentages
-            'cbd': 8,                    # CBD content
-            'yield_indoor': 8,           # Indoor yield data
-            'yield_outdoor': 8,          # Outdoor yield data
-            'flowering_time': 9,         # Flowering time
-            'height_indoor': 7,          # Indoor height
-            'height_outdoor': 7,         # Outdoor height
-            'effects': 7,                # Effect descriptions
-            'flavour': 6,                # Flavor profiles
-            
-            # Seed type classification
-            'seed_type': 6,              # Feminized/Regular
-            'growth_type': 6,            # Autoflower/Photoperiod
-            'variety': 5,                # Variety classification
-            
-            # Genetics and breeding
-            'genetic_background': 7,     # Genetic lineage
-            'genetics_type': 6,          # Indica/Sativa ratios
-            
-            # Environmental data
-            'climate': 5,                # Climate requirements
-            'harvest_month': 5,          # Harvest timing
-            
-            # Additional info
-            'about_info': 6,             # Product descriptions
-            'availability': 3,           # Stock status
-            'price': 3                   # Pricing data
-        }
-        
-        total_possible = sum(field_weights.values())
-        actual_score = 0
-        
-        for field, weight in field_weights.items():
-            if strain_data.get(field) and len(str(strain_data[field]).strip()) > 2:
-                actual_score += weight
-        
-        return round((actual_score / total_possible) * 100, 1)
-
-    def determine_quality_tier(self, score):
-        if score >= 80: return "Premium"
-        elif score >= 60: return "High"
-        elif score >= 40: return "Medium"
-        elif score >= 20: return "Basic"
-        else: return "Minimal"
-
-    def create_strain_id(self, strain_name, breeder_name):
-        combined = f"{strain_name}-{breeder_name}-rqs".lower()
-        combined = re.sub(r'[^a-z0-9-]', '', combined.replace(' ', '-'))
-        return combined[:50]
-
-    def collect_strain_urls(self):
-        """Phase 1: Collect all strain URLs from Royal Queen Seeds categories"""
-        print("PHASE 1: Collecting Royal Queen Seeds strain URLs...")
-        
-        category_urls = [
-            "https://www.royalqueenseeds.com/us/33-feminized-cannabis-seeds",
-            "https://www.royalqueenseeds.com/us/34-autoflowering-cannabis-seeds",
-            "https://www.royalqueenseeds.com/us/36-cbd-seeds"
-        ]
-        
-        strain_urls = []
-        
-        for category_url in category_urls:
-            print(f"Scraping category: {category_url}")
-            
-            html = self._brightdata_request(category_url)
-            if not html:
-                print(f"Failed to fetch category: {category_url}")
-                continue
-            
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Extract product URLs
-            for link in soup.find_all('a', href=True):
-                href = link.get('href')
-                if href and ('/feminized-cannabis-seeds/' in href or 
-                           '/autoflowering-cannabis-seeds/' in href or 
-                           '/cbd-seeds/' in href):
-                    if href.startswith('/'):
-                        full_url = f"https://www.royalqueenseeds.com{href}"
-                    else:
-                        full_url = href
-                    strain_urls.append(full_url)
-        
-        unique_urls = list(set(strain_urls))  # Remove duplicates
-        print(f"Total unique strains found: {len(unique_urls)}")
-        return unique_urls
-
-    def scrape_strain_details(self, strain_urls):
-        """Phase 2: Extract detailed strain data using 4-method approach"""
-        print(f"\nPHASE 2: Scraping {len(strain_urls)} strains with 4-method extraction...")
-        
-        for i, url in enumerate(strain_urls, 1):
-            self.total_processed += 1
-            print(f"\n[{i}/{len(strain_urls)}] {url}")
-            
-            html = self._brightdata_request(url)
-            if html:
-                strain_data = self.apply_4_methods(html, url)
-                
-                # Quality validation (minimum 20% score)
-                if strain_data['data_completeness_score'] >= 20:
-                    try:
-                        # Convert Decimal for DynamoDB
-                        strain_data['data_completeness_score'] = Decimal(str(strain_data['data_completeness_score']))
-                        
-                        self.table.put_item(Item=strain_data)
-                        self.successful_extractions += 1
-                        
-                        print(f"  SUCCESS: {strain_data.get('strain_name', 'Unknown')} - Royal Queen Seeds")
-                        print(f"     Quality: {strain_data['quality_tier']} ({float(strain_data['data_completeness_score']):.1f}%)")
-                        print(f"     Methods: {', '.join(strain_data['extraction_methods_used'])}")
-                        
-                        # Show key Royal Queen Seeds fields if present
-                        if strain_data.get('thc'):
-                            print(f"     THC: {strain_data['thc']}")
-                        if strain_data.get('yield_indoor'):
-                            print(f"     Yield Indoor: {strain_data['yield_indoor']}")
-                        
-                    except Exception as e:
-                        print(f"  STORAGE FAILED: {e}")
-                else:
-                    print(f"  LOW QUALITY: {strain_data['data_completeness_score']:.1f}% - skipped")
-            else:
-                print(f"  FETCH FAILED")
-            
-            time.sleep(1)
-
-    def print_final_stats(self):
-        """Print comprehensive scraping statistics"""
-        success_rate = (self.successful_extractions / self.total_processed * 100) if self.total_processed > 0 else 0
-        
-        print(f"\nROYAL QUEEN SEEDS ENHANCED SCRAPING COMPLETE!")
-        print(f"FINAL STATISTICS:")
-        print(f"   Total Processed: {self.total_processed}")
-        print(f"   Successful: {self.successful_extractions}")
-        print(f"   Success Rate: {success_rate:.1f}%")
-        print(f"\nMETHOD USAGE:")
-        for method, count in self.method_stats.items():
-            print(f"   {method.title()}: {count} strains")
-        print(f"\nCost: ~${self.total_processed * 0.0015:.2f} (BrightData)")
-        print(f"Unique Features: Comprehensive cultivation data, dual yield measurements")
-
 def main():
     scraper = RoyalQueenEnhanced4MethodScraper()
-    
-    # Phase 1: Collect URLs
-    strain_urls = scraper.collect_strain_urls()
-    
-    if not strain_urls:
-        print("No strain URLs found. Exiting.")
-        return
-    
-    # Phase 2: Scrape details
-    scraper.scrape_strain_details(strain_urls)
-    
-    # Final statistics
-    scraper.print_final_stats()
+    scraper.run()
 
 if __name__ == "__main__":
     print("ROYAL QUEEN SEEDS - ENHANCED 4-METHOD SCRAPER")
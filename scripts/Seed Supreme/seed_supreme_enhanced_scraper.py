@@ -5,42 +5,42 @@ Based on Neptune's 99.9% success rate methodology
 Seed Supreme specific HTML: #product-attribute-specs-table with comprehensive THC/CBD ranges
 """
 
-import json
-import boto3
-import requests
-import time
+import os
+import sys
 import re
-from bs4 import BeautifulSoup
-from decimal import Decimal
-from datetime import datetime
 
-class SeedSupremeEnhancedScraper:
-    def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-        self.table = self.dynamodb.Table('cannabis-strains-universal')
-        self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-        self.brightdata_config = self._get_brightdata_credentials()
-        
-    def _get_brightdata_credentials(self):
-        """Get BrightData credentials from AWS Secrets Manager"""
-        response = self.secrets_client.get_secret_value(SecretId='cannabis-brightdata-api')
-        return json.loads(response['SecretString'])
-    
-    def _make_brightdata_request(self, url):
-        """Make request through BrightData Web Unlocker API"""
-        api_url = "https://api.brightdata.com/request"
-        headers = {
-            "Authorization": f"Bearer {self.brightdata_config['api_key']}",
-            "Content-Type": "application/json"
-        }
-        payload = {
-            "zone": self.brightdata_config['zone'],
-            "url": url,
-            "format": "raw"
-        }
-        
-        response = requests.post(api_url, headers=headers, json=payload, timeout=30)
-        return response.text if response.status_code == 200 else None
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.four_method_scraper import FourMethodScraper
+from common.patterns import SEED_SUPREME_DESCRIPTION
+
+class SeedSupremeEnhancedScraper(FourMethodScraper):
+    SEED_BANK = 'Seed Supreme'
+    KEY = 'seed-supreme'
+    STRAIN_ID_SUFFIX = 'seed-supreme'
+    DEFAULT_BREEDER = 'Seed Supreme'
+    SITEMAP_URL = 'https://seedsupreme.com/sitemap.xml'  # Magento sitemap: every product page in a few requests
+    # Use path.txt URLs as starting points; Magento serves the last page again for ?p= past the end,
+    # which the crawler treats as the end of the listing
+    LISTINGS = [
+        'https://seedsupreme.com/feminized-seeds.html',
+        'https://seedsupreme.com/autoflowering-seeds.html',
+        'https://seedsupreme.com/regular-seeds.html',
+    ]
+    LISTING_PAGE = '{listing}?p={page}'
+    MIN_QUALITY = 0               # every extracted strain is stored
+
+    # Seed Supreme specific field weights (emphasizing their strengths)
+    FIELD_WEIGHTS = {
+        'strain_name': 10, 'breeder_name': 10,
+        'thc_content': 9,  # Seed Supreme's strength: precise ranges
+        'cbd_content': 8,  # Seed Supreme's strength: precise ranges
+        'terpenes': 8,     # Seed Supreme's strength: specific terpenes
+        'effects': 7,      # Seed Supreme's strength: detailed effects
+        'flavors': 6,      # Seed Supreme's strength: multiple flavors
+        'genetics': 8, 'flowering_time': 6, 'yield': 5,
+        'plant_height': 5, 'variety': 4, 'flowering_type': 4,
+        'about_info': 3, 'sku': 2
+    }
 
     def method1_structured_extraction(self, soup, url):
         """Method 1: Extract from Seed Supreme's comprehensive table (#product-attribute-specs-table)"""
@@ -89,25 +89,11 @@ class SeedSupremeEnhancedScraper:
         if description:
             value_div = description.find('div', class_='value')
             if value_div:
-                desc_text = value_div.get_text()
+                desc_text = soup.text_of(value_div)
                 data['about_info'] = desc_text.strip()
                 
                 # Seed Supreme specific patterns for THC/CBD ranges
-                patterns = {
-                    'thc_range_detailed': r'THC[:\s]*([0-9.-]+%?\s*-\s*[0-9.-]+%?)',
-                    'cbd_range_detailed': r'CBD[:\s]*([0-9.-]+%?\s*-\s*[0-9.-]+%?)',
-                    'flowering_weeks': r'(?:flowering|flower)[:\s]*([0-9-]+\s*weeks?)',
-                    'strain_effects_detailed': r'effects?[:\s]*([^.]+)',
-                    'terpene_profile_detailed': r'terpenes?[:\s]*([^.]+)',
-                    'flavor_notes_detailed': r'flavou?rs?[:\s]*([^.]+)',
-                    'genetics_lineage': r'(?:genetics|cross|lineage)[:\s]*([^.]+)',
-                    'breeder_attribution': r'(?:by|from|bred by)[:\s]*([A-Za-z\s&]+?)(?:\s|$|\.)'
-                }
-                
-                for key, pattern in patterns.items():
-                    match = re.search(pattern, desc_text, re.IGNORECASE)
-                    if match:
-                        data[key] = match.group(1).strip()
+                data.update(SEED_SUPREME_DESCRIPTION.extract(desc_text))
         
         return data
 
@@ -173,240 +159,43 @@ class SeedSupremeEnhancedScraper:
                         
         return data
 
-    def calculate_quality_score(self, strain_data):
-        """Calculate data completeness score with Seed Supreme weights"""
-        # Seed Supreme specific field weights (emphasizing their strengths)
-        field_weights = {
-            'strain_name': 10, 'breeder_name': 10,
-            'thc_content': 9,  # Seed Supreme's strength: precise ranges
-            'cbd_content': 8,  # Seed Supreme's strength: precise ranges
-            'terpenes': 8,     # Seed Supreme's strength: specific terpenes
-            'effects': 7,      # Seed Supreme's strength: detailed effects
-            'flavors': 6,      # Seed Supreme's strength: multiple flavors
-            'genetics': 8, 'flowering_time': 6, 'yield': 5,
-            'plant_height': 5, 'variety': 4, 'flowering_type': 4,
-            'about_info': 3, 'sku': 2
-        }
-        
-        total_possible = sum(field_weights.values())
-        actual_score = 0
-        
-        for field, weight in field_weights.items():
-            if strain_data.get(field) and len(str(strain_data[field]).strip()) > 2:
-                actual_score += weight
-        
-        return round((actual_score / total_possible) * 100, 1)
-
-    def determine_quality_tier(self, score):
-        """Determine quality tier based on score"""
-        if score >= 80: return "Premium"
-        elif score >= 60: return "High"
-        elif score >= 40: return "Medium"
-        elif score >= 20: return "Basic"
-        else: return "Minimal"
-
-    def create_strain_id(self, strain_name, breeder_name):
-        """Create unique strain ID"""
-        combined = f"{strain_name}-{breeder_name}-seed-supreme".lower()
-        combined = re.sub(r'[^a-z0-9-]', '', combined.replace(' ', '-'))
-        return combined[:50]
-
-    def extract_strain_data(self, html_content, url):
-        """Enhanced 4-method extraction for Seed Supreme"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        strain_data = {
-            'seed_bank': 'Seed Supreme',
-            'source_url': url,
-            'extraction_methods_used': []
-        }
-        
-        # Apply all 4 methods in sequence
-        methods = [
-            ('structured', self.method1_structured_extraction),
-            ('description', self.method2_description_mining),
-            ('patterns', self.method3_advanced_patterns),
-            ('fallback', self.method4_fallback_extraction)
-        ]
-        
-        for method_name, method_func in methods:
-            try:
-                method_data = method_func(soup, url)
-                if method_data:
-                    strain_data.update(method_data)
-                    strain_data['extraction_methods_used'].append(method_name)
-            except Exception as e:
-                print(f"Method {method_name} failed: {e}")
-        
-        # Post-processing: use fallback strain name if needed
+    def post_process(self, strain_data):
+        """Use the strain name from the URL if the page gave none"""
         if not strain_data.get('strain_name') and strain_data.get('strain_name_from_url'):
             strain_data['strain_name'] = strain_data['strain_name_from_url']
-        
-        # Calculate quality metrics
-        strain_data['data_completeness_score'] = Decimal(str(self.calculate_quality_score(strain_data)))
-        strain_data['quality_tier'] = self.determine_quality_tier(float(strain_data['data_completeness_score']))
-        strain_data['field_count'] = len([v for v in strain_data.values() if v])
-        
-        # Create strain ID
-        strain_name = strain_data.get('strain_name', 'Unknown')
-        breeder_name = strain_data.get('breeder_name', 'Seed Supreme')
-        strain_data['strain_id'] = self.create_strain_id(strain_name, breeder_name)
-        
-        # Add timestamps
-        now = datetime.utcnow().isoformat() + 'Z'
-        strain_data['created_at'] = now
-        strain_data['updated_at'] = now
-        
-        return strain_data
 
-    def save_to_dynamodb(self, strain_data):
-        """Save strain data to DynamoDB"""
-        try:
-            self.table.put_item(Item=strain_data)
-            return True
-        except Exception as e:
-            print(f"DynamoDB save error: {e}")
-            return False
+    def is_product_url(self, href):
+        """Filter for Seed Supreme strain pages"""
+        return (href.endswith('.html') and 
+                any(keyword in href for keyword in ['feminized', 'autoflower', 'regular']) and
+                not any(exclude in href for exclude in ['category', 'seed-banks', 'cannabis-seeds/', 'sitemap', 'bogos', 'free-cannabis', 'best-sellers']))
 
-    def scrape_seed_supreme_catalog(self):
-        """Scrape Seed Supreme catalog pages for strain URLs"""
-        print("Collecting Seed Supreme strain URLs...")
-        
-        # Use path.txt URLs as starting points
-        catalog_urls = [
-            "https://seedsupreme.com/feminized-seeds.html",
-            "https://seedsupreme.com/autoflowering-seeds.html", 
-            "https://seedsupreme.com/regular-seeds.html"
-        ]
-        
-        all_strain_urls = set()
-        
-        for catalog_url in catalog_urls:
-            print(f"Scraping catalog: {catalog_url}")
+    def listing_product_urls(self, soup):
+        """Strain page links on one catalog page in page order, each once - Seed Supreme specific"""
+        page_urls = {}
+        for link in soup.find_all('a', href=True):
+            href = link.get('href', '')
             
-            # Try multiple pages per catalog
-            for page in range(1, 11):  # Up to 10 pages per catalog
-                if page == 1:
-                    page_url = catalog_url
-                else:
-                    page_url = f"{catalog_url}?p={page}"
-                
-                html = self._make_brightdata_request(page_url)
-                if html:
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Find product links - Seed Supreme specific
-                    page_urls = set()
-                    
-                    # Look for strain page links
-                    links = soup.find_all('a', href=True)
-                    for link in links:
-                        href = link.get('href', '')
-                        
-                        # Filter for Seed Supreme strain pages
-                        if (href.endswith('.html') and 
-                            any(keyword in href for keyword in ['feminized', 'autoflower', 'regular']) and
-                            not any(exclude in href for exclude in ['category', 'seed-banks', 'cannabis-seeds/', 'sitemap', 'bogos', 'free-cannabis', 'best-sellers'])):
-                            
-                            if href.startswith('/'):
-                                full_url = f"https://seedsupreme.com{href}"
-                            elif href.startswith('http'):
-                                full_url = href
-                            else:
-                                continue
-                            
-                            if 'seedsupreme.com' in full_url:
-                                page_urls.add(full_url)
-                    
-                    print(f"  Page {page}: Found {len(page_urls)} strain URLs")
-                    all_strain_urls.update(page_urls)
-                    
-                    # If no new URLs found, likely reached end
-                    if not page_urls:
-                        break
-                        
+            if self.is_product_url(href):
+                if href.startswith('/'):
+                    full_url = f"https://seedsupreme.com{href}"
+                elif href.startswith('http'):
+                    full_url = href
                 else:
-                    print(f"  Failed to fetch page {page}")
-                    break
+                    continue
                 
-                time.sleep(2)  # Rate limiting
-        
-        strain_urls = sorted(list(all_strain_urls))
-        print(f"Total strain URLs collected: {len(strain_urls)}")
-        
-        # Save URLs for reference
+                if 'seedsupreme.com' in full_url:
+                    page_urls.setdefault(full_url)
+        return list(page_urls)
+
+    def discover_catalog_urls(self):
+        """Catalog strain URLs as found; the sorted list is saved for reference once the catalog is read"""
+        yield from super().discover_catalog_urls()
         with open('seed_supreme_collected_urls.txt', 'w') as f:
-            for url in strain_urls:
+            for url in sorted(self.frontier.ordered()):
                 f.write(f"{url}\n")
-        
-        return strain_urls
-
-    def run_enhanced_scraping(self):
-        """Run enhanced 4-method scraping on Seed Supreme"""
-        print("Starting Seed Supreme Enhanced 4-Method Scraping")
-        print("Target: Comprehensive THC/CBD ranges and detailed terpene profiles")
-        
-        # Get strain URLs
-        strain_urls = self.scrape_seed_supreme_catalog()
-        
-        if len(strain_urls) == 0:
-            print("No URLs found, exiting")
-            return
-        
-        successful_extractions = 0
-        failed_extractions = 0
-        method_stats = {'structured': 0, 'description': 0, 'patterns': 0, 'fallback': 0}
-        quality_distribution = {'Premium': 0, 'High': 0, 'Medium': 0, 'Basic': 0, 'Minimal': 0}
-        
-        for i, url in enumerate(strain_urls, 1):
-            print(f"Processing {i}/{len(strain_urls)}: {url.split('/')[-1]}")
-            
-            html = self._make_brightdata_request(url)
-            if html:
-                strain_data = self.extract_strain_data(html, url)
-                
-                # Update statistics
-                for method in strain_data.get('extraction_methods_used', []):
-                    method_stats[method] += 1
-                
-                quality_tier = strain_data.get('quality_tier', 'Minimal')
-                quality_distribution[quality_tier] += 1
-                
-                # Save to database
-                if self.save_to_dynamodb(strain_data):
-                    successful_extractions += 1
-                    strain_name = strain_data.get('strain_name', 'Unknown')[:30]
-                    breeder = strain_data.get('breeder_name', 'Unknown')[:20]
-                    score = strain_data.get('data_completeness_score', 0)
-                    print(f"  Saved: {strain_name} ({breeder}) - {quality_tier} ({score}%)")
-                else:
-                    failed_extractions += 1
-                    print(f"  Failed to save: {url}")
-            else:
-                failed_extractions += 1
-                print(f"  Failed to fetch: {url}")
-            
-            time.sleep(1)  # Rate limiting
-        
-        # Final statistics
-        success_rate = (successful_extractions / len(strain_urls)) * 100 if len(strain_urls) > 0 else 0
-        print(f"\nSEED SUPREME ENHANCED SCRAPING COMPLETE!")
-        print(f"Success Rate: {success_rate:.1f}% ({successful_extractions}/{len(strain_urls)})")
-        print(f"Method Performance:")
-        for method, count in method_stats.items():
-            coverage = (count / successful_extractions) * 100 if successful_extractions > 0 else 0
-            print(f"   {method.title()}: {count} strains ({coverage:.1f}% coverage)")
-        
-        print(f"Quality Distribution:")
-        for tier, count in quality_distribution.items():
-            percentage = (count / successful_extractions) * 100 if successful_extractions > 0 else 0
-            print(f"   {tier}: {count} strains ({percentage:.1f}%)")
-        
-        # Cost calculation
-        total_requests = len(strain_urls) + 30  # URLs + catalog pages
-        total_cost = total_requests * 0.0015
-        print(f"Cost: ${total_cost:.2f} (${total_cost/successful_extractions:.4f} per strain)")
 
 if __name__ == "__main__":
-    scraper = SeedSupremeEnhancedScraper()
-    scraper.run_enhanced_scraping()
\ No newline at end of file
+    print("Starting Seed Supreme Enhanced 4-Method Scraping")
+    print("Target: Comprehensive THC/CBD ranges and detailed terpene profiles")
+    SeedSupremeEnhancedScraper().run()
@@ -2,68 +2,211 @@
 """
 Seedsman GraphQL Scraper - THE PROVEN APPROACH
 Based on successful previous implementation that collected 747 strains
+
+Catalog mode (default) pages through the whole seed category with every spec attribute requested in the query
+itself, fetching all pages concurrently, so ~1,000 strains take a few dozen GraphQL requests and no product pages.
+SEEDSMAN_GRAPHQL_MODE=search runs the original search terms + product page extraction instead
 """
 
+import os
+import sys
 import json
-import boto3
-import requests
-import time
 import re
-from bs4 import BeautifulSoup
 from decimal import Decimal
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fetch_engine import FetchEngine
+from common.html_parser import make_soup
+from common.progress_journal import ProgressJournal
+from common.recrawl import RecrawlIndex
+from common.response_cache import ResponseCache
+from common.storage import open_storage
+from common.unlocker_client import UnlockerClient
+
+GRAPHQL_URL = "https://www.seedsman.com/graphql"
+PRODUCT_URL = "https://www.seedsman.com/us-en/{url_key}"
+CATALOG_CATEGORY = "cannabis-seeds"     # category_url_path holding every seed product
+CATALOG_PAGE_SIZE = 100
+
+# Spec table label -> record field; the same labels name the attributes in the GraphQL metadata
+SPEC_FIELDS = {
+    'Brand/breeder': 'breeder_name',
+    'THC content': 'thc_content',
+    'Yield indoor': 'yield_indoor',
+    'Yield outdoor': 'yield_outdoor',
+    'Photoperiod flowering time': 'flowering_time',
+    'Suitable climates': 'suitable_climates',
+    'Aroma': 'aroma',
+    'Variety': 'variety',
+    'Sex': 'sex',
+    'Flowering type': 'flowering_type'
+}
+
+ATTRIBUTES_QUERY = """
+query ProductAttributes {
+    attributesList(entityType: CATALOG_PRODUCT) {
+        items {
+            code
+            label
+        }
+    }
+}
+"""
+
+CATALOG_QUERY = """
+query CatalogPage($category: String!, $pageSize: Int!, $currentPage: Int!) {
+    products(
+        filter: {category_url_path: {eq: $category}}
+        pageSize: $pageSize
+        currentPage: $currentPage
+        sort: {name: ASC}
+    ) {
+        total_count
+        page_info {
+            current_page
+            total_pages
+        }
+        items {
+            id
+            name
+            sku
+            url_key
+            short_description {
+                html
+            }
+            custom_attributesV2 {
+                items {
+                    code
+                    ... on AttributeValue {
+                        value
+                    }
+                    ... on AttributeSelectedOptions {
+                        selected_options {
+                            label
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+"""
+
 class SeedsmanGraphQLScraper:
-    def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-        self.table = self.dynamodb.Table('cannabis-strains-universal')
-        self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-        self.brightdata_config = self._get_brightdata_credentials()
+    def __init__(self, offline=False):
+        """offline: replay pages from the response cache only, without AWS or BrightData (re-extraction)"""
+        if offline:
+            self.fetch_engine = FetchEngine.cache_only()
+        else:
+            self.recrawl = RecrawlIndex.open('seedsman-graphql')
+            self.sink = self.recrawl.wrap(open_storage())
+            self.journal = ProgressJournal.open('seedsman-graphql')
+            self.journal.attach(self.sink)
+            import boto3
+            self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
+            self.brightdata_config = self._get_brightdata_credentials()
+            self.unlocker = UnlockerClient(self.brightdata_config['api_key'], self.brightdata_config['zone'])
+            self.fetch_engine = FetchEngine(self.unlocker, cache=ResponseCache.from_env())
         
         # Success tracking
         self.total_processed = 0
         self.successful_extractions = 0
+        self.attribute_codes = {}     # GraphQL attribute code -> record field, see catalog_attribute_codes()
+        self.missing_pages = []       # catalog pages that failed even after a retry
         
     def _get_brightdata_credentials(self):
         response = self.secrets_client.get_secret_value(SecretId='cannabis-brightdata-api')
         return json.loads(response['SecretString'])
     
+    def _graphql_options(self, query, variables=None):
+        """Unlocker request options for one GraphQL POST"""
+        return {
+            'method': "POST",
+            'headers': {"Content-Type": "application/json"},
+            'body': json.dumps({"query": query, "variables": variables or {}})
+        }
+
     def _brightdata_graphql_request(self, query, variables=None):
         """Make GraphQL request via BrightData Web Unlocker"""
-        payload = {
-            "zone": self.brightdata_config['zone'],
-            "url": "https://www.seedsman.com/graphql",
-            "method": "POST",
-            "headers": {"Content-Type": "application/json"},
-            "body": json.dumps({"query": query, "variables": variables or {}}),
-            "format": "raw"
-        }
-        
-        response = requests.post("https://api.brightdata.com/request", 
-                               headers={"Authorization": f"Bearer {self.brightdata_config['api_key']}"}, 
-                               json=payload, timeout=30)
-        
-        if response.status_code == 200:
+        return self._graphql_result(self.fetch_engine.request(GRAPHQL_URL, **self._graphql_options(query, variables)))
+
+    def _graphql_result(self, response):
+        """Parsed GraphQL response body, or None"""
+        if response is None:
+            return None
+        if response.ok:
             try:
                 result = json.loads(response.text)
                 if 'errors' in result:
                     print(f"GraphQL errors: {result['errors']}")
                 return result
-            except:
+            except (ValueError, KeyError, TypeError):
                 print(f"JSON parse error: {response.text[:200]}")
                 return None
         else:
-            print(f"HTTP error {response.status_code}: {response.text[:200]}")
+            print(f"HTTP error {response.status}: {response.text[:200]}")
         return None
     
     def _brightdata_request(self, url):
         """Standard BrightData request for individual pages"""
-        api_url = "https://api.brightdata.com/request"
-        headers = {"Authorization": f"Bearer {self.brightdata_config['api_key']}"}
-        payload = {"zone": self.brightdata_config['zone'], "url": url, "format": "raw"}
+        return self.fetch_engine.fetch_one(url)
+
+    def catalog_attribute_codes(self):
+        """GraphQL attribute code -> record field for every spec table label in SPEC_FIELDS"""
+        result = self._brightdata_graphql_request(ATTRIBUTES_QUERY)
+        items = (((result or {}).get('data') or {}).get('attributesList') or {}).get('items') or []
+        codes = {item['code']: SPEC_FIELDS[item['label']] for item in items
+                 if item.get('code') and item.get('label') in SPEC_FIELDS}
+        print(f"Mapped {len(codes)} of {len(SPEC_FIELDS)} spec attributes to GraphQL attribute codes")
+        return codes
+
+    def _catalog_variables(self, page):
+        return {"category": CATALOG_CATEGORY, "pageSize": CATALOG_PAGE_SIZE, "currentPage": page}
+
+    def collect_products_catalog(self):
+        """Phase 1 in catalog mode: every product of the seed category with its spec attributes, pages in parallel"""
+        print("PHASE 1: Pulling the Seedsman catalog via GraphQL...")
+        self.attribute_codes = self.catalog_attribute_codes()
+        if not self.attribute_codes:
+            return []
         
-        response = requests.post(api_url, headers=headers, json=payload, timeout=30)
-        return response.text if response.status_code == 200 else None
+        # Page 1 tells how many pages there are; the rest go out at once
+        result = self._brightdata_graphql_request(CATALOG_QUERY, self._catalog_variables(1))
+        if not result or not (result.get('data') or {}).get('products'):
+            return []
+        first = result['data']['products']
+        total_pages = first['page_info']['total_pages']
+        print(f"  {first['total_count']} products on {total_pages} pages of {CATALOG_PAGE_SIZE}")
+        
+        pages = {1: first['items']}
+        calls = [(page, GRAPHQL_URL, self._graphql_options(CATALOG_QUERY, self._catalog_variables(page)))
+                 for page in range(2, total_pages + 1)]
+        for page, response in self.fetch_engine.request_all(calls):
+            result = self._graphql_result(response)
+            if not result or not (result.get('data') or {}).get('products'):
+                print(f"  Page {page}: FAILED")
+                continue
+            pages[page] = result['data']['products']['items']
+            print(f"  Page {page}: {len(pages[page])} products")
+        
+        # One more try for failed pages, one at a time; up to CATALOG_PAGE_SIZE products each
+        for page in range(2, total_pages + 1):
+            if page in pages:
+                continue
+            result = self._brightdata_graphql_request(CATALOG_QUERY, self._catalog_variables(page))
+            if result and (result.get('data') or {}).get('products'):
+                pages[page] = result['data']['products']['items']
+                print(f"  Page {page} (retry): {len(pages[page])} products")
+        self.missing_pages = [page for page in range(1, total_pages + 1) if page not in pages]
+        
+        # Keyed by id: a product moving between pages mid-pull is only counted once
+        products = {product['id']: product for n in sorted(pages) for product in pages[n]}
+        print(f"\nTotal unique products collected: {len(products)} "
+              f"({len(pages)} of {total_pages} pages)")
+        if self.missing_pages:
+            print(f"Catalog incomplete, pages {', '.join(map(str, self.missing_pages))} missing")
+        return list(products.values())
 
     def collect_products_graphql(self):
         """Phase 1: Collect product URLs using proven GraphQL approach"""
@@ -94,6 +237,7 @@ class SeedsmanGraphQLScraper:
         # Use proven search terms from previous success
         search_terms = ["seeds", "cannabis", "auto", "fem", "photoperiod", "indica", "sativa"]
         all_products = []
+        seen_ids = set()
         
         for search_term in search_terms:
             print(f"\nSearching for: {search_term}")
@@ -117,11 +261,8 @@ class SeedsmanGraphQLScraper:
                     break
                     
                 # Filter duplicates by ID
-                new_products = []
-                existing_ids = {p['id'] for p in all_products}
-                for product in products:
-                    if product['id'] not in existing_ids:
-                        new_products.append(product)
+                new_products = [product for product in products if product['id'] not in seen_ids]
+                seen_ids.update(product['id'] for product in new_products)
                 
                 all_products.extend(new_products)
                 print(f"    Found {len(new_products)} new products (total: {len(all_products)})")
@@ -130,14 +271,13 @@ class SeedsmanGraphQLScraper:
                     break
                     
                 page += 1
-                time.sleep(0.5)
         
         print(f"\nTotal unique products collected: {len(all_products)}")
         return all_products
 
     def extract_strain_data_4method(self, html_content, url, product_info):
         """Apply 4-method extraction to individual product pages"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = make_soup(html_content)
         
         strain_data = {
             'seed_bank': 'Seedsman',
@@ -170,21 +310,8 @@ class SeedsmanGraphQLScraper:
                             value = h3.get_text().strip() if h3 else data_td.get_text().strip()
                         
                         # Map Seedsman fields
-                        field_map = {
-                            'Brand/breeder': 'breeder_name',
-                            'THC content': 'thc_content',
-                            'Yield indoor': 'yield_indoor',
-                            'Yield outdoor': 'yield_outdoor',
-                            'Photoperiod flowering time': 'flowering_time',
-                            'Suitable climates': 'suitable_climates',
-                            'Aroma': 'aroma',
-                            'Variety': 'variety',
-                            'Sex': 'sex',
-                            'Flowering type': 'flowering_type'
-                        }
-                        
-                        if label in field_map and value:
-                            strain_data[field_map[label]] = value
+                        if label in SPEC_FIELDS and value:
+                            strain_data[SPEC_FIELDS[label]] = value
         
         # Method 2: Description mining
         desc_div = soup.find('div', class_='ProductActions-ShortDescription')
@@ -192,6 +319,44 @@ class SeedsmanGraphQLScraper:
             strain_data['extraction_methods_used'].append('description')
             strain_data['about_info'] = desc_div.get_text().strip()
         
+        return self._finish_record(strain_data, product_info)
+
+    def catalog_record(self, product):
+        """Strain record straight from one catalog item: its attributes stand in for the spec table"""
+        strain_data = {
+            'seed_bank': 'Seedsman',
+            'source_url': PRODUCT_URL.format(url_key=product['url_key']),
+            'sku': product.get('sku', ''),
+            'extraction_methods_used': []
+        }
+        
+        # Method 1: Structured extraction from the spec attributes in the catalog query
+        specs = {}
+        for attribute in (product.get('custom_attributesV2') or {}).get('items') or []:
+            field = self.attribute_codes.get(attribute.get('code'))
+            if not field:
+                continue
+            options = attribute.get('selected_options')
+            values = [option.get('label') for option in options] if options else [attribute.get('value')]
+            values = [str(value).strip() for value in values if value and str(value).strip()]
+            if values:
+                specs[field] = ' | '.join(values)
+        if specs:
+            strain_data['extraction_methods_used'].append('structured')
+            strain_data.update(specs)
+        
+        # Method 2: Description mining
+        description = (product.get('short_description') or {}).get('html')
+        if description:
+            about = make_soup(description).get_text().strip()
+            if about:
+                strain_data['extraction_methods_used'].append('description')
+                strain_data['about_info'] = about
+        
+        return self._finish_record(strain_data, product)
+
+    def _finish_record(self, strain_data, product_info):
+        """Methods 3 and 4, then score, identify and timestamp the record"""
         # Method 3: Advanced patterns - strain name extraction
         strain_data['extraction_methods_used'].append('patterns')
         strain_name = product_info.get('name', '')
@@ -264,44 +429,70 @@ class SeedsmanGraphQLScraper:
         combined = re.sub(r'[^a-z0-9-]', '', combined.replace(' ', '-'))
         return combined[:50]
 
+    def store_record(self, url, strain_data):
+        """Quality check, then queue the record for storage"""
+        # Quality validation (minimum 20% score)
+        if strain_data['data_completeness_score'] >= 20:
+            try:
+                # Convert Decimal for DynamoDB
+                strain_data['data_completeness_score'] = Decimal(str(strain_data['data_completeness_score']))
+                
+                self.sink.put(strain_data)
+                self.successful_extractions += 1
+                
+                print(f"  SUCCESS: {strain_data.get('strain_name', 'Unknown')} - {strain_data.get('breeder_name', 'Unknown')}")
+                print(f"     Quality: {strain_data['quality_tier']} ({float(strain_data['data_completeness_score']):.1f}%)")
+                print(f"     Methods: {', '.join(strain_data['extraction_methods_used'])}")
+                
+                if strain_data.get('thc_content'):
+                    print(f"     THC: {strain_data['thc_content']}")
+                
+            except Exception as e:
+                print(f"  STORAGE FAILED: {e}")
+                self.journal.mark(url, 'failed', e)
+        else:
+            print(f"  LOW QUALITY: {strain_data['data_completeness_score']:.1f}% - skipped")
+            self.journal.mark(url, 'skipped', f"quality {strain_data['data_completeness_score']:.1f}%")
+
+    def store_catalog_products(self, products):
+        """Phase 2 in catalog mode: records from the catalog items, no product page fetches"""
+        print(f"\nPHASE 2: Building {len(products)} records from catalog attributes...")
+        
+        records = {}
+        for product in products:
+            strain_data = self.catalog_record(product)
+            records[strain_data['source_url']] = (product, strain_data)
+        urls = self.journal.plan(records)
+        
+        for i, url in enumerate(urls, 1):
+            self.total_processed += 1
+            product, strain_data = records[url]
+            print(f"\n[{i}/{len(urls)}] {product['name']}")
+            self.journal.mark(url, 'extracted')
+            self.store_record(url, strain_data)
+
     def scrape_individual_products(self, products):
         """Phase 2: Scrape individual product pages"""
         print(f"\nPHASE 2: Scraping {len(products)} individual product pages...")
         
-        for i, product in enumerate(products, 1):
+        products_by_url = {f"https://www.seedsman.com/us-en/{product['url_key']}": product for product in products}
+        products_by_url = {url: products_by_url[url] for url in self.journal.plan(products_by_url)}
+        self.fetch_engine.phase = 'product'
+        
+        for i, (url, html) in enumerate(self.fetch_engine.fetch_all(products_by_url), 1):
             self.total_processed += 1
-            url = f"https://www.seedsman.com/us-en/{product['url_key']}"
-            print(f"\n[{i}/{len(products)}] {product['name']}")
+            product = products_by_url[url]
+            print(f"\n[{i}/{len(products_by_url)}] {product['name']}")
             print(f"  URL: {url}")
             
-            html = self._brightdata_request(url)
             if html:
+                self.journal.mark(url, 'fetched')
                 strain_data = self.extract_strain_data_4method(html, url, product)
-                
-                # Quality validation (minimum 20% score)
-                if strain_data['data_completeness_score'] >= 20:
-                    try:
-                        # Convert Decimal for DynamoDB
-                        strain_data['data_completeness_score'] = Decimal(str(strain_data['data_completeness_score']))
-                        
-                        self.table.put_item(Item=strain_data)
-                        self.successful_extractions += 1
-                        
-                        print(f"  SUCCESS: {strain_data.get('strain_name', 'Unknown')} - {strain_data.get('breeder_name', 'Unknown')}")
-                        print(f"     Quality: {strain_data['quality_tier']} ({float(strain_data['data_completeness_score']):.1f}%)")
-                        print(f"     Methods: {', '.join(strain_data['extraction_methods_used'])}")
-                        
-                        if strain_data.get('thc_content'):
-                            print(f"     THC: {strain_data['thc_content']}")
-                        
-                    except Exception as e:
-                        print(f"  STORAGE FAILED: {e}")
-                else:
-                    print(f"  LOW QUALITY: {strain_data['data_completeness_score']:.1f}% - skipped")
+                self.journal.mark(url, 'extracted')
+                self.store_record(url, strain_data)
             else:
                 print(f"  FETCH FAILED")
-            
-            time.sleep(1)
+                self.journal.mark(url, 'failed', 'fetch failed')
 
     def print_final_stats(self):
         """Print final statistics"""
@@ -313,24 +504,45 @@ class SeedsmanGraphQLScraper:
         print(f"   Total Processed: {self.total_processed}")
         print(f"   Successful: {self.successful_extractions}")
         print(f"   Success Rate: {success_rate:.1f}%")
-        print(f"\nCost: ~${self.total_processed * 0.0015:.2f} (BrightData)")
+        self.fetch_engine.print_cost(self.successful_extractions)
+        self.fetch_engine.print_stats()
+        self.sink.print_stats()
+        self.journal.print_stats()
+        self.recrawl.print_stats()
         print(f"Achievement: Seedsman conquered using proven GraphQL approach!")
 
+    def run(self):
+        """Catalog pull (falling back to search terms + product pages), final statistics, then release resources"""
+        catalog_mode = os.environ.get('SEEDSMAN_GRAPHQL_MODE', 'catalog').lower() != 'search'
+        products = self.collect_products_catalog() if catalog_mode else []
+        if products:
+            self.store_catalog_products(products)
+        if not products or self.missing_pages:
+            if catalog_mode:
+                print("Catalog pull incomplete, falling back to search terms + product pages for the rest")
+            # Phase 1: Collect products via GraphQL search (those already built from the catalog left out)
+            from_catalog = {product['id'] for product in products}
+            searched = [product for product in self.collect_products_graphql() if product['id'] not in from_catalog]
+            if searched:
+                # Phase 2: Scrape individual pages
+                self.scrape_individual_products(searched)
+            elif not products:
+                print("No products found via GraphQL.")
+        
+        # Final statistics
+        self.sink.close()
+        if self.missing_pages:
+            # The search terms may not reach every product of the missing pages: resume with a new catalog pull
+            print(f"Run left open for the next start to resume (catalog pages missing): {self.journal.path}")
+        else:
+            self.journal.finish(self.fetch_engine.budget)
+        self.print_final_stats()
+        self.fetch_engine.close()
+        self.journal.close()
+        self.recrawl.close()
+
 def main():
-    scraper = SeedsmanGraphQLScraper()
-    
-    # Phase 1: Collect products via GraphQL
-    products = scraper.collect_products_graphql()
-    
-    if not products:
-        print("No products found via GraphQL. Exiting.")
-        return
-    
-    # Phase 2: Scrape individual pages
-    scraper.scrape_individual_products(products)
-    
-    # Final statistics
-    scraper.print_final_stats()
+    SeedsmanGraphQLScraper().run()
 
 if __name__ == "__main__":
     print("SEEDSMAN GRAPHQL SCRAPER - THE PROVEN APPROACH")
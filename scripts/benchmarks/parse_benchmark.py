@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+HTML Parser Benchmark
+Per-page parse and full 4-method extraction time for each parser backend,
+measured on saved product pages from every seed bank in the registry.
+
+Pages come from the response cache, or from --pages-dir laid out as <seed_bank_key>/*.html
+
+Usage:
+    python scripts/benchmarks/parse_benchmark.py
+    python scripts/benchmarks/parse_benchmark.py --pages 50 --pages-dir saved_pages/
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import html_parser
+from common.html_parser import make_soup
+from common.rate_limiter import domain_of
+from common.response_cache import ResponseCache
+from common.seed_banks import SEED_BANKS
+
+PARSERS = ['lxml', 'html.parser', 'html5lib']
+
+
+def available_parsers():
+    parsers = []
+    for parser in PARSERS:
+        try:
+            BeautifulSoup('<p>x</p>', parser)
+            parsers.append(parser)
+        except FeatureNotFound:
+            pass
+    return parsers
+
+
+def load_pages(bank, limit, pages_dir=None, cache=None):
+    """Up to limit (url, html) pairs for one seed bank"""
+    if pages_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(pages_dir, bank.key, '*.html')))[:limit]:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                pages.append((path, f.read()))
+        return pages
+    if cache is None:
+        return []
+    urls = [url for url in cache.urls() if domain_of(url) == bank.domain][:limit]
+    return [(url, cache.get(url, max_age=float('inf'), touch=False)) for url in urls]
+
+
+def time_per_page(func, pages, rounds):
+    """Best-of-rounds mean milliseconds per page"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for url, html in pages:
+            func(url, html)
+        elapsed = (time.perf_counter() - start) / len(pages) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on saved seed bank pages")
+    parser.add_argument('--pages', type=int, default=25, help="pages per seed bank")
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--pages-dir', help="directory of saved pages (<seed_bank_key>/*.html)")
+    parser.add_argument('--no-extract', action='store_true', help="time parsing only, skip 4-method extraction")
+    args = parser.parse_args()
+
+    parsers = available_parsers()
+    cache = None if args.pages_dir else ResponseCache.from_env(ttl=float('inf'))
+    print(f"Parsers: {', '.join(parsers)}")
+    print(f"\n{'Seed bank':<28}{'Pages':>6}  " + ''.join(f"{p + ' parse':>18}{p + ' extract':>20}" for p in parsers))
+
+    totals = {p: [0.0, 0.0] for p in parsers}
+    for bank in SEED_BANKS.values():
+        pages = load_pages(bank, args.pages, args.pages_dir, cache)
+        if not pages:
+            print(f"{bank.name:<28}{0:>6}  (no saved pages)")
+            continue
+
+        scraper = None if args.no_extract else bank.create_scraper(offline=True)
+        row = f"{bank.name:<28}{len(pages):>6}  "
+        for p in parsers:
+            parse_ms = time_per_page(lambda url, html: make_soup(html, p), pages, args.rounds)
+            extract_ms = 0.0
+            if scraper:
+                html_parser.DEFAULT_PARSER = p
+                with contextlib.redirect_stdout(io.StringIO()):  # scrapers print per page
+                    extract_ms = time_per_page(lambda url, html: bank.extract_record(scraper, url, html),
+                                               pages, args.rounds)
+            totals[p][0] += parse_ms
+            totals[p][1] += extract_ms
+            row += f"{parse_ms:>15.2f} ms{extract_ms:>17.2f} ms"
+        print(row)
+        if scraper:
+            scraper.fetch_engine.close()
+
+    print(f"\n{'Sum of per-page means':<36}" + ''.join(f"{t[0]:>15.2f} ms{t[1]:>17.2f} ms" for t in totals.values()))
+    if 'lxml' in totals and 'html.parser' in totals and totals['lxml'][0]:
+        print(f"lxml parse speedup over html.parser: {totals['html.parser'][0] / totals['lxml'][0]:.1f}x")
+    print(f"Parser fallbacks to html.parser: {html_parser.stats['fallbacks']}")
+
+
+if __name__ == "__main__":
+    main()
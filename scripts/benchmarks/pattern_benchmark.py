@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Description Pattern Benchmark
+Time to mine every description with each registered pattern set, three ways:
+    inline       - the old per-call re.search(pattern_literal, text, flags) loop
+    alternation  - one combined named-group alternation scan per set
+    registry     - PatternSet.search (compiled patterns + keyword prefilter)
+
+Descriptions are the about_info fields of a reextract.py JSONL file (or any JSONL/CSV with
+an about_info column), or generated with --synthetic
+
+Usage:
+    python scripts/reextract.py all --output records.jsonl
+    python scripts/benchmarks/pattern_benchmark.py records.jsonl
+    python scripts/benchmarks/pattern_benchmark.py --synthetic 14300
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import patterns
+from common.patterns import PatternSet
+
+SYNTHETIC_WORDS = (
+    "THC: 18-22% CBD: 0.5% flowering: 8-10 weeks flowers in 60 days harvest genetics: OG Kush x Haze. "
+    "lineage bred from effects: uplifting and creative. high buzz yield: 500 g/m2 produces up to 450g "
+    "height: 120 cm autoflower limited drop 70% indica sativa award winner Cannabis Seeds by Barney's Farm "
+    "Yield: 400-500 gr/m2 Height: 80 - 120 cm Total Cultivation: 70-80 days Harvest: From September "
+    "sweet earthy pine nose resin production tree structure grow indoor outdoor terpene flavours taste"
+).split()
+FILLER_WORDS = "the a this plant strain is with and of for dense buds great for any grower easy to grow".split()
+
+
+def registered_sets():
+    return {name: value for name, value in vars(patterns).items() if isinstance(value, PatternSet)}
+
+
+def load_descriptions(path):
+    with open(path, encoding='utf-8', errors='replace') as f:
+        if path.endswith('.csv'):
+            csv.field_size_limit(sys.maxsize)
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        return [row['about_info'] for row in rows if row.get('about_info')]
+
+
+def synthetic_descriptions(count, seed=0):
+    rng = random.Random(seed)
+    descriptions = []
+    for _ in range(count):
+        words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(40, 200))]
+        for _ in range(rng.randint(0, 8)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(SYNTHETIC_WORDS))
+        descriptions.append(' '.join(words))
+    return descriptions
+
+
+def inline_search(pattern_set, text):
+    """The pre-registry loop: look up each pattern literal in re's cache on every call"""
+    results = {}
+    for field, compiled in pattern_set.fields:
+        for regex, _ in compiled:
+            match = re.search(regex.pattern, text, regex.flags)
+            if match:
+                results[field] = match
+                break
+    return results
+
+
+def combined_alternation(pattern_set):
+    """One (?P<field>p1|p2)|(?P<field2>...) scan; the first hit per field wins"""
+    flags = pattern_set.fields[0][1][0][0].flags
+    branches = [f"(?P<{field}>{'|'.join(regex.pattern for regex, _ in compiled)})"
+                for field, compiled in pattern_set.fields]
+    combined = re.compile('|'.join(branches), flags)
+
+    def search(text):
+        results = {}
+        for match in combined.finditer(text):
+            results.setdefault(match.lastgroup, match)
+        return results
+    return search
+
+
+def time_run(func, descriptions, rounds):
+    """Best-of-rounds total seconds over all descriptions"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in descriptions:
+            func(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled description pattern registry")
+    parser.add_argument('descriptions', nargs='?', help="reextract.py JSONL or CSV with an about_info column")
+    parser.add_argument('--synthetic', type=int, metavar='N', help="generate N synthetic descriptions instead")
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.descriptions:
+        descriptions = load_descriptions(args.descriptions)
+    else:
+        descriptions = synthetic_descriptions(args.synthetic or 14300)
+    if not descriptions:
+        print("No descriptions found")
+        return
+    print(f"Descriptions: {len(descriptions):,} ({sum(map(len, descriptions)) / len(descriptions):,.0f} chars avg)")
+    print(f"\n{'Pattern set':<30}{'inline':>12}{'alternation':>14}{'registry':>12}{'speedup':>10}  results")
+
+    totals = [0.0, 0.0, 0.0]
+    for name, pattern_set in registered_sets().items():
+        combined = combined_alternation(pattern_set)
+        inline = time_run(lambda text: inline_search(pattern_set, text), descriptions, args.rounds)
+        alternation = time_run(combined, descriptions, args.rounds)
+        registry = time_run(pattern_set.search, descriptions, args.rounds)
+
+        identical = all({f: m.group(0) for f, m in inline_search(pattern_set, text).items()} ==
+                        {f: m.group(0) for f, m in pattern_set.search(text).items()}
+                        for text in descriptions)
+        for i, seconds in enumerate((inline, alternation, registry)):
+            totals[i] += seconds
+        print(f"{name:<30}{inline:>11.3f}s{alternation:>13.3f}s{registry:>11.3f}s{inline / registry:>9.1f}x  "
+              f"{'identical' if identical else 'DIFFERENT'}")
+
+    print(f"\n{'Total':<30}{totals[0]:>11.3f}s{totals[1]:>13.3f}s{totals[2]:>11.3f}s{totals[0] / totals[2]:>9.1f}x")
+    print("(alternation results are not comparable: overlapping fields lose matches in a single scan)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Storage Backend Benchmark
+Records per second written through each open_storage() backend, using strain records from a
+reextract.py JSONL file or synthetic ones, then the same records again into the same store - a re-run
+where nothing changed, which local backends skip by content_hash (Parquet always starts empty)
+
+DynamoDB is only included when a local stand-in is given (DynamoDB Local or a moto server);
+the table must already exist there with strain_id as its hash key
+
+Usage:
+    python scripts/benchmarks/storage_benchmark.py --records 20000
+    python scripts/benchmarks/storage_benchmark.py records.jsonl --dynamodb http://localhost:8000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.storage import open_storage
+
+
+def load_records(path):
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line, parse_float=Decimal) for line in f if line.strip()]
+    for i, record in enumerate(records):
+        record.setdefault('strain_id', record.get('source_url') or record.get('url') or f'record-{i}')
+    return records
+
+
+def synthetic_records(count):
+    return [{
+        'strain_id': f'benchmark-strain-{i}',
+        'strain_name': f'Benchmark Strain {i}',
+        'seed_bank': 'Benchmark Seeds',
+        'breeder_name': 'Benchmark Genetics',
+        'about_info': 'Dense resinous buds with a sweet earthy aroma. ' * 8,
+        'thc_content': '18-22%',
+        'flowering_time': '8-9 weeks',
+        'data_completeness_score': Decimal('72.5'),
+        'extraction_methods_used': ['structured', 'description', 'patterns'],
+    } for i in range(count)]
+
+
+def run(url, records, table_name):
+    storage = open_storage(table_name, url)
+    start = time.perf_counter()
+    for record in records:
+        storage.put(record)
+    storage.close()
+    return time.perf_counter() - start, storage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark strain storage backends")
+    parser.add_argument('records_file', nargs='?', help="reextract.py JSONL output")
+    parser.add_argument('--records', type=int, default=20000, help="synthetic record count")
+    parser.add_argument('--table', default='storage-benchmark')
+    parser.add_argument('--dynamodb', metavar='ENDPOINT_URL', help="also time DynamoDB against a local stand-in")
+    args = parser.parse_args()
+
+    records = load_records(args.records_file) if args.records_file else synthetic_records(args.records)
+    workdir = tempfile.mkdtemp(prefix='storage_benchmark_')
+    urls = [
+        f"sqlite:///{workdir}/strains.sqlite",
+        f"duckdb:///{workdir}/strains.duckdb",
+        f"parquet:///{workdir}/strains.parquet",
+    ]
+    if args.dynamodb:
+        urls.append(f"dynamodb://{args.table}?endpoint_url={args.dynamodb}")
+
+    print(f"Records: {len(records):,}")
+    print(f"\n{'Backend':<12}{'Seconds':>10}{'Records/s':>14}{'Re-run s':>10}{'Failed':>9}")
+    try:
+        for url in urls:
+            backend = url.split(':', 1)[0]
+            try:
+                elapsed, storage = run(url, records, args.table)
+            except ImportError as e:
+                print(f"{backend:<12}  skipped ({e})")
+                continue
+            rerun, storage = run(url, records, args.table)
+            print(f"{backend:<12}{elapsed:>10.2f}{len(records) / elapsed:>14,.0f}{rerun:>10.2f}"
+                  f"{storage.stats['failed']:>9}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Shared scraping infrastructure for the seed bank scrapers
+Scrapers live in per-site folders and import this package via sys.path
+"""
+
+from .budget import RequestBudget
+from .dead_letter import DeadLetterStore
+from .extraction_context import ExtractionContext
+from .fetch_engine import FetchEngine
+from .fingerprint import fingerprint
+from .four_method_scraper import FourMethodScraper
+from .frontier import URLFrontier, normalize_url
+from .metering import CostMeter
+from .html_parser import make_soup
+from .pagination import ListingCrawler
+from .parse_pool import ParsePool
+from .patterns import PatternSet
+from .pipeline import Pipeline
+from .progress_journal import ProgressJournal
+from .rate_limiter import DomainRateLimiter
+from .recrawl import RecrawlIndex
+from .response_cache import ResponseCache
+from .retry import FetchFailure, RetryPolicy
+from .seed_banks import SEED_BANKS, SeedBank
+from .sitemap import SitemapReader
+from .storage import DuckDBSink, SQLiteSink, open_storage
+from .unlocker_client import UnlockerClient
@@ -0,0 +1,92 @@
+"""
+Request Budget
+Caps the BrightData requests of a run, across every seed bank sharing the fetch engine
+Only requests that actually go out count: cache hits are free. Past the soft cap every further request is still
+sent but the run is flagged; once the hard cap is spent, further cache misses fail like any other fetch failure
+and the progress journal stays open, so the next run resumes and retries them
+"""
+
+import os
+import threading
+
+COST_PER_REQUEST = 0.0015         # BrightData Web Unlocker, per page
+
+
+def _requests_cap(max_requests, max_cost, cost_per_request):
+    """Tighter of a request cap and a dollar cap converted to requests, None when neither is set"""
+    caps = []
+    if max_requests is not None:
+        caps.append(max_requests)
+    if max_cost is not None:
+        caps.append(int(max_cost / cost_per_request))
+    return min(caps) if caps else None
+
+
+class RequestBudget:
+    def __init__(self, max_requests=None, max_cost=None, cost_per_request=COST_PER_REQUEST,
+                 soft_requests=None, soft_cost=None):
+        """
+        max_requests / max_cost: hard cap on unlocker requests or dollars, None for no cap
+        soft_requests / soft_cost: warning threshold; requests past it are still sent
+        """
+        self.limit = _requests_cap(max_requests, max_cost, cost_per_request)
+        self.soft_limit = _requests_cap(soft_requests, soft_cost, cost_per_request)
+        self.cost_per_request = cost_per_request
+        self.used = 0
+        self.refused = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Budget from SCRAPER_MAX_REQUESTS / SCRAPER_MAX_COST (hard) and SCRAPER_SOFT_MAX_REQUESTS /
+        SCRAPER_SOFT_MAX_COST (soft), or None when none is set
+        """
+        values = [os.environ.get(name) for name in ('SCRAPER_MAX_REQUESTS', 'SCRAPER_MAX_COST',
+                                                    'SCRAPER_SOFT_MAX_REQUESTS', 'SCRAPER_SOFT_MAX_COST')]
+        if not any(values):
+            return None
+        max_requests, max_cost, soft_requests, soft_cost = values
+        return cls(int(max_requests) if max_requests else None, float(max_cost) if max_cost else None,
+                   soft_requests=int(soft_requests) if soft_requests else None,
+                   soft_cost=float(soft_cost) if soft_cost else None)
+
+    @property
+    def cost(self):
+        return self.used * self.cost_per_request
+
+    @property
+    def capped(self):
+        return self.limit is not None or self.soft_limit is not None
+
+    @property
+    def exhausted(self):
+        return self.limit is not None and self.used >= self.limit
+
+    @property
+    def over_soft_limit(self):
+        return self.soft_limit is not None and self.used > self.soft_limit
+
+    def take(self, url):
+        """Reserve one request for url; False once the hard cap is spent"""
+        with self.lock:
+            if self.exhausted:
+                self.refused += 1
+                if self.refused == 1:
+                    print(f"\nBUDGET EXHAUSTED after {self.used} requests (${self.cost:.2f}), "
+                          f"remaining pages are left for the next run")
+                return False
+            self.used += 1
+            if self.soft_limit is not None and self.used == self.soft_limit + 1:
+                print(f"\nBUDGET WARNING: soft cap of {self.soft_limit} requests "
+                      f"(${self.soft_limit * self.cost_per_request:.2f}) passed")
+            return True
+
+    def print_stats(self):
+        """Print budget usage"""
+        print(f"\nREQUEST BUDGET:")
+        for label, limit in (('Hard cap', self.limit), ('Soft cap', self.soft_limit)):
+            if limit is not None:
+                print(f"   {label}: {limit} (${limit * self.cost_per_request:.2f})")
+        print(f"   Used: {self.used} (${self.cost:.2f}){' - over soft cap' if self.over_soft_limit else ''}")
+        print(f"   Refused: {self.refused}")
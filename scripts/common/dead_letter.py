@@ -0,0 +1,148 @@
+"""
+Dead-Letter Store
+Every URL a run gave up on is kept in a SQLite table with its seed bank, phase, the stage it failed at, the error
+and how many attempts it took, so a targeted replay (scripts/replay.py) can re-run just those product pages instead
+of re-crawling the whole catalog. A URL leaves the store once a later run gets it past the stage it failed at
+
+    fetch         the fetch engine gave up on the page (failure kind from retry.py, attempts made)
+    extract       page fetched but the scraper could not build a record from it
+    storage       the storage sink rejected the record
+    low_quality   record scored below the scraper's quality bar and was skipped
+
+The fetch engine records fetch failures; the progress journal records the other stages from its state changes,
+so every scraper that keeps a journal feeds the store without code of its own
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from .rate_limiter import domain_of
+from .seed_banks import SEED_BANKS
+
+DEFAULT_DEAD_LETTER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                        '.cache', 'dead_letters.sqlite')
+STAGES = ('fetch', 'extract', 'storage', 'low_quality')
+PERMANENT_KINDS = ('not_found', 'client')   # replaying these only repeats the failure
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dead_letters (
+    url TEXT PRIMARY KEY,
+    seed_bank TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    kind TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    first_failed REAL NOT NULL,
+    last_failed REAL NOT NULL
+);
+"""
+UPSERT = """
+INSERT INTO dead_letters (url, seed_bank, phase, stage, kind, error, attempts, failures, first_failed, last_failed)
+VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
+ON CONFLICT(url) DO UPDATE SET phase = excluded.phase, stage = excluded.stage, kind = excluded.kind,
+    error = excluded.error, attempts = excluded.attempts, failures = failures + 1, last_failed = excluded.last_failed
+"""
+COLUMNS = ('url', 'seed_bank', 'phase', 'stage', 'kind', 'error', 'attempts', 'failures', 'first_failed',
+           'last_failed')
+
+BANK_BY_DOMAIN = {bank.domain: bank.key for bank in SEED_BANKS.values()}
+
+
+def seed_bank_of(url):
+    """Registry key of the seed bank serving url, or its domain for unregistered sites"""
+    domain = domain_of(url)
+    return BANK_BY_DOMAIN.get(domain, domain)
+
+
+class DeadLetterStore:
+    _shared = {}                  # path -> store, so engines and journals in one process share a connection
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=DEFAULT_DEAD_LETTER_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.stages = dict(self.conn.execute("SELECT url, stage FROM dead_letters"))   # open URL -> stage
+        self.added = Counter()    # (stage, kind) -> URLs dead-lettered this run
+        self.resolved = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        The process-wide store at SCRAPER_DEAD_LETTER_PATH, or None with SCRAPER_DEAD_LETTER=off
+        """
+        if os.environ.get('SCRAPER_DEAD_LETTER', 'on').lower() in ('off', '0', 'false', 'no'):
+            return None
+        path = os.path.abspath(os.environ.get('SCRAPER_DEAD_LETTER_PATH', DEFAULT_DEAD_LETTER_PATH))
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path)
+            return cls._shared[path]
+
+    def add(self, url, stage, error, attempts=1, kind=None, phase='product'):
+        """Record (or update) a URL given up on at stage"""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown dead-letter stage: {stage}")
+        kind = kind or stage
+        now = time.time()
+        with self.lock:
+            self.conn.execute(UPSERT, (url, seed_bank_of(url), phase, stage, kind, str(error)[:500], attempts,
+                                       now, now))
+            self.conn.commit()
+            self.stages[url] = stage
+            self.added[(stage, kind)] += 1
+
+    def resolve(self, url, stage=None):
+        """Drop url once it got past the stage it failed at (any stage when stage is None)"""
+        if url not in self.stages or (stage is not None and self.stages[url] != stage):
+            return
+        with self.lock:
+            self.conn.execute("DELETE FROM dead_letters WHERE url = ?", (url,))
+            self.conn.commit()
+            self.stages.pop(url, None)
+            self.resolved += 1
+
+    def entries(self, seed_banks=None, stages=None, include_permanent=False, phase='product'):
+        """Open dead letters as dicts, oldest first; permanent fetch failures (404s) only with include_permanent"""
+        query = f"SELECT {', '.join(COLUMNS)} FROM dead_letters WHERE phase = ?"
+        params = [phase]
+        for column, values in (('seed_bank', seed_banks), ('stage', stages)):
+            if values:
+                query += f" AND {column} IN ({', '.join('?' * len(values))})"
+                params.extend(values)
+        if not include_permanent:
+            query += f" AND kind NOT IN ({', '.join('?' * len(PERMANENT_KINDS))})"
+            params.extend(PERMANENT_KINDS)
+        with self.lock:
+            rows = self.conn.execute(query + " ORDER BY first_failed", params).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def summary(self):
+        """{(seed_bank, phase, stage, kind): URLs} over every open dead letter"""
+        with self.lock:
+            return {key[:-1]: key[-1] for key in self.conn.execute(
+                "SELECT seed_bank, phase, stage, kind, COUNT(*) FROM dead_letters "
+                "GROUP BY seed_bank, phase, stage, kind")}
+
+    def print_stats(self):
+        """Print dead letters added and resolved this run"""
+        if not self.added and not self.resolved:
+            return
+        print(f"\nDEAD LETTERS ({self.path}):")
+        for (stage, kind), count in self.added.most_common():
+            print(f"   {stage}/{kind}: {count}")
+        print(f"   Resolved: {self.resolved}, still open: {len(self.stages)}")
+
+    def print_summary(self):
+        """Print every open dead letter by seed bank, phase, stage and failure kind"""
+        summary = self.summary()
+        print(f"\nOPEN DEAD LETTERS ({self.path}): {sum(summary.values())}")
+        print(f"   {'Seed bank':<28} {'Phase':<10} {'Stage':<12} {'Kind':<12} {'URLs':>6}")
+        for (seed_bank, phase, stage, kind), count in sorted(summary.items()):
+            print(f"   {seed_bank:<28} {phase:<10} {stage:<12} {kind:<12} {count:>6}")
@@ -0,0 +1,236 @@
+"""
+Batched DynamoDB Sink
+Replaces the per-strain synchronous table.put_item() calls in every scraper
+Records are queued and written by a background thread in 25-item BatchWriteItem requests,
+so a DynamoDB round trip or throttle never stalls fetching; UnprocessedItems and throttling
+errors are retried with exponential backoff
+Every item is written with its content_hash fingerprint; skipping unchanged records is left to the local
+recrawl index, since a read or a failed conditional write against the table costs capacity too
+"""
+
+import os
+import queue
+import random
+import threading
+import time
+
+try:
+    from botocore.exceptions import ClientError
+except ImportError:       # boto3 is optional; without it the sink only runs on an injected client
+    class ClientError(Exception):
+        """Never raised: an injected client reports errors through its own exceptions"""
+
+from .fingerprint import FINGERPRINT_FIELD, stamp
+
+DEFAULT_TABLE = 'cannabis-strains-universal'
+DEFAULT_REGION = 'us-east-1'
+BATCH_SIZE = 25                  # BatchWriteItem hard limit
+RETRYABLE_ERRORS = {
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+    'InternalServerError',
+    'ServiceUnavailable',
+}
+
+_FLUSH = object()
+_STOP = object()
+
+
+class DynamoDBSink:
+    def __init__(self, table_name=DEFAULT_TABLE, region_name=DEFAULT_REGION, endpoint_url=None,
+                 key_attributes=('strain_id',), flush_interval=1.0, max_retries=8,
+                 base_delay=0.05, max_delay=5.0, max_queue=1000, client=None):
+        """
+        endpoint_url: DynamoDB Local / moto server URL instead of AWS (e.g. http://localhost:8000)
+        key_attributes: table key; a repeated key within one batch keeps the latest record,
+            as sequential put_item calls would, and the earlier ones are acknowledged with it
+        flush_interval: seconds a partial batch may wait for more records
+        max_retries: backoff rounds for throttling and UnprocessedItems before records are failed
+        max_queue: queued records before put() blocks, bounding memory if DynamoDB falls behind
+        client: DynamoDB client to use instead of building one (resource.meta.client for native types)
+        """
+        self.table_name = table_name
+        if client is None:
+            import boto3          # only DynamoDB storage needs boto3; local backends run without it
+            client = boto3.resource('dynamodb', region_name=region_name, endpoint_url=endpoint_url).meta.client
+        self.client = client
+        self.key_attributes = key_attributes
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.lock = threading.Lock()
+        self.failed = []          # (item, error) pairs given up on
+        self.superseded = {}      # key -> earlier records of the batch being written (writer thread only)
+        self.stats = {'queued': 0, 'written': 0, 'batches': 0, 'retries': 0, 'throttled': 0, 'failed': 0,
+                      'superseded': 0}
+        self.on_written = None    # callback(items) once records are confirmed written
+        self.on_failed = None     # callback(items, error) for records given up on
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name=f'dynamodb-sink-{table_name}', daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def from_env(cls, table_name=DEFAULT_TABLE):
+        """
+        Sink configured from the environment
+        DYNAMODB_ENDPOINT_URL points at a local stand-in, DYNAMODB_TABLE overrides the table name
+        """
+        return cls(
+            table_name=os.environ.get('DYNAMODB_TABLE', table_name),
+            region_name=os.environ.get('AWS_DEFAULT_REGION', DEFAULT_REGION),
+            endpoint_url=os.environ.get('DYNAMODB_ENDPOINT_URL') or None,
+        )
+
+    def put(self, item):
+        """Queue one record for writing; only blocks when max_queue records are already waiting"""
+        if self.closed:
+            raise RuntimeError("DynamoDBSink is closed")
+        if not item.get(FINGERPRINT_FIELD):
+            stamp(item)
+        self.queue.put(item)
+        with self.lock:
+            self.stats['queued'] += 1
+
+    def flush(self):
+        """Block until every record queued so far has been written or failed"""
+        self.queue.put(_FLUSH)
+        self.queue.join()
+
+    def close(self):
+        """Write everything still queued and stop the writer thread"""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(_STOP)
+        self.thread.join()
+
+    def records(self):
+        """Every item in the table, one paginated Scan (run it after flush() to include queued records)"""
+        for page in self.client.get_paginator('scan').paginate(TableName=self.table_name):
+            yield from page['Items']
+
+    def _key(self, item):
+        return tuple(item.get(attribute) for attribute in self.key_attributes)
+
+    def _run(self):
+        batch = {}
+        taken = 0                 # queue entries taken since the last task_done() round
+        deadline = None
+        while True:
+            try:
+                timeout = None if not batch else max(0.0, deadline - time.monotonic())
+                entry = self.queue.get(timeout=timeout)
+                taken += 1
+            except queue.Empty:
+                entry = _FLUSH
+            if entry is not _FLUSH and entry is not _STOP:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                key = self._key(entry)
+                if key in batch:
+                    self.superseded.setdefault(key, []).append(batch[key])
+                    with self.lock:
+                        self.stats['superseded'] += 1
+                batch[key] = entry
+                if len(batch) < BATCH_SIZE:
+                    continue
+            if batch:
+                try:
+                    self._write_batch(list(batch.values()))
+                except Exception as e:  # never let the writer thread die with records queued
+                    self._fail(list(batch.values()), e)
+                batch = {}
+                self.superseded = {}
+            for _ in range(taken):
+                self.queue.task_done()
+            taken = 0
+            if entry is _STOP:
+                return
+
+    def _backoff(self, attempt):
+        """Exponential backoff with jitter"""
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        time.sleep(delay * random.uniform(0.5, 1.0))
+
+    def _write_batch(self, items):
+        requests = [{'PutRequest': {'Item': item}} for item in items]
+        attempt = 0
+        while True:
+            try:
+                response = self.client.batch_write_item(RequestItems={self.table_name: requests})
+            except ClientError as e:
+                code = e.response.get('Error', {}).get('Code')
+                if code not in RETRYABLE_ERRORS:
+                    # A bad record fails the whole batch; write one at a time so only it is lost
+                    self._write_individually([request['PutRequest']['Item'] for request in requests])
+                    return
+                with self.lock:
+                    self.stats['throttled'] += 1
+                if attempt >= self.max_retries:
+                    self._fail([request['PutRequest']['Item'] for request in requests], e)
+                    return
+            except Exception as e:
+                self._fail([request['PutRequest']['Item'] for request in requests], e)
+                return
+            else:
+                unprocessed = response.get('UnprocessedItems', {}).get(self.table_name, [])
+                pending = {self._key(request['PutRequest']['Item']) for request in unprocessed}
+                self._written([request['PutRequest']['Item'] for request in requests
+                               if self._key(request['PutRequest']['Item']) not in pending])
+                with self.lock:
+                    self.stats['batches'] += 1
+                if not unprocessed:
+                    return
+                requests = unprocessed
+                if attempt >= self.max_retries:
+                    self._fail([request['PutRequest']['Item'] for request in requests],
+                               f"unprocessed after {self.max_retries} retries")
+                    return
+                with self.lock:
+                    self.stats['retries'] += 1
+            self._backoff(attempt)
+            attempt += 1
+
+    def _write_individually(self, items):
+        for item in items:
+            try:
+                self.client.put_item(TableName=self.table_name, Item=item)
+            except Exception as e:
+                self._fail([item], e)
+            else:
+                self._written([item])
+
+    def _with_superseded(self, items):
+        """items plus the earlier records of the batch they replaced, which share their outcome"""
+        return items + [earlier for item in items for earlier in self.superseded.pop(self._key(item), [])]
+
+    def _written(self, items):
+        items = self._with_superseded(items)
+        with self.lock:
+            self.stats['written'] += len(items)
+        if self.on_written and items:
+            self.on_written(items)
+
+    def _fail(self, items, error):
+        items = self._with_superseded(items)
+        with self.lock:
+            self.stats['failed'] += len(items)
+            self.failed.extend((item, str(error)) for item in items)
+        for item in items:
+            print(f"  STORAGE FAILED: {item.get('strain_name', self._key(item))} - {error}")
+        if self.on_failed:
+            self.on_failed(items, error)
+
+    def print_stats(self):
+        """Print write statistics"""
+        print(f"\nDYNAMODB SINK ({self.table_name}):")
+        print(f"   Queued: {self.stats['queued']}")
+        print(f"   Written: {self.stats['written']} in {self.stats['batches']} batches")
+        if self.stats['superseded']:
+            print(f"   Superseded: {self.stats['superseded']} (same key queued again before its batch was sent; "
+                  f"counted with the record that replaced them)")
+        print(f"   Retries: {self.stats['retries']} unprocessed, {self.stats['throttled']} throttled")
+        print(f"   Failed: {self.stats['failed']}")
@@ -0,0 +1,90 @@
+"""
+Per-Page Extraction Context
+One parsed page shared by all four extraction methods
+Full text, lowercased text, title, meta tags, element text and repeated selector lookups are
+computed once on first use and memoized, instead of every method re-walking the whole tree
+"""
+
+
+class ExtractionContext:
+    def __init__(self, soup, url=None):
+        """
+        soup: parsed page from make_soup()
+        Any attribute not defined here is read from the soup, so methods written against a
+        BeautifulSoup object (soup.find, soup.select, ...) accept the context unchanged
+        """
+        self.soup = soup
+        self.url = url
+        self._text = None
+        self._text_lower = None
+        self._title = None
+        self._meta = None
+        self._element_text = {}
+        self._lookups = {}
+
+    def __getattr__(self, name):
+        return getattr(self.soup, name)
+
+    @property
+    def text(self):
+        """Full page text (soup.get_text()), extracted once"""
+        if self._text is None:
+            self._text = self.soup.get_text()
+        return self._text
+
+    @property
+    def text_lower(self):
+        """Lowercased full page text for keyword detection"""
+        if self._text_lower is None:
+            self._text_lower = self.text.lower()
+        return self._text_lower
+
+    @property
+    def title(self):
+        """Stripped <title> text, or '' when the page has none"""
+        if self._title is None:
+            title = self.find('title')
+            self._title = title.get_text().strip() if title else ''
+        return self._title
+
+    def meta(self, name):
+        """content of <meta name=...> or <meta property=...>, or None"""
+        if self._meta is None:
+            self._meta = {}
+            for tag in self.soup.find_all('meta'):
+                key = tag.get('name') or tag.get('property')
+                if key and key not in self._meta:
+                    self._meta[key] = tag.get('content', '')
+        return self._meta.get(name)
+
+    def get_text(self, *args, **kwargs):
+        if args or kwargs:
+            return self.soup.get_text(*args, **kwargs)
+        return self.text
+
+    def text_of(self, element):
+        """element.get_text(), memoized so description blocks read by several methods are walked once"""
+        key = id(element)
+        cached = self._element_text.get(key)
+        if cached is None:
+            # Keep a reference to the element so its id() cannot be reused while cached
+            cached = self._element_text[key] = (element, element.get_text())
+        return cached[1]
+
+    def _lookup(self, method, args, kwargs):
+        key = (method, repr(args), repr(sorted(kwargs.items())))
+        if key not in self._lookups:
+            self._lookups[key] = getattr(self.soup, method)(*args, **kwargs)
+        return self._lookups[key]
+
+    def find(self, *args, **kwargs):
+        return self._lookup('find', args, kwargs)
+
+    def find_all(self, *args, **kwargs):
+        return self._lookup('find_all', args, kwargs)
+
+    def select(self, selector, **kwargs):
+        return self._lookup('select', (selector,), kwargs)
+
+    def select_one(self, selector, **kwargs):
+        return self._lookup('select_one', (selector,), kwargs)
@@ -0,0 +1,498 @@
+"""
+Shared Concurrent Fetch Engine
+Bounded worker pool with per-host concurrency limits for every seed bank scraper
+Overlaps BrightData network waits instead of sleeping between serial requests
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+
+from .budget import RequestBudget
+from .dead_letter import DeadLetterStore
+from .metering import CostMeter
+from .rate_limiter import DomainRateLimiter
+from .response_cache import ResponseCache
+from .retry import UNANSWERED, FetchFailure, RetryPolicy, classify_error, classify_response, classify_status
+
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_PER_HOST_LIMIT = 4
+IO_WORKERS = 4                    # threads doing the event loop's blocking cache I/O and output
+IDLE = object()                   # yielded by a streaming URL source (common.pipeline) with no URL ready yet
+
+
+def host_of(url):
+    """Target host of a URL (lowercased, without credentials or port)"""
+    return (urlparse(url).hostname or '').lower()
+
+
+class FetchEngine:
+    def __init__(self, fetch, max_workers=DEFAULT_MAX_WORKERS, per_host_limit=DEFAULT_PER_HOST_LIMIT, host_limits=None,
+                 rate_limiter=None, cache=None, budget=None, meter=None, retry_policy=None, dead_letters=None):
+        """
+        fetch: blocking callable taking a URL and returning page HTML (or None on failure) or an HTTP response
+               (UnlockerResponse, requests.Response), or raising (requests raise_for_status errors keep their status),
+               or an async client exposing fetch(url) and close() such as UnlockerClient,
+               or None to serve cached pages only (cache misses fail without a request)
+        max_workers: total requests in flight across all hosts
+        per_host_limit: default cap on in-flight requests to any one target site
+        host_limits: optional {host: cap} overrides for specific sites
+        rate_limiter: per-domain token buckets, defaults to DomainRateLimiter() with DOMAIN_RATES
+        cache: optional ResponseCache checked before any request; fetched pages are written back
+        budget: RequestBudget; once it is spent, cache misses fail without a request
+                (defaults to RequestBudget.from_env(), uncapped unless SCRAPER_MAX_REQUESTS / SCRAPER_MAX_COST is set)
+        meter: CostMeter recording every page by seed bank, phase and outcome, defaults to CostMeter.from_env()
+        retry_policy: RetryPolicy for failed fetches, defaults to RetryPolicy.from_env()
+        dead_letters: DeadLetterStore receiving pages the engine gave up on, defaults to DeadLetterStore.from_env()
+        """
+        self.fetch = fetch
+        self.client = fetch if asyncio.iscoroutinefunction(getattr(fetch, 'fetch', None)) else None
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.host_limits = dict(host_limits or {})
+        self.rate_limiter = rate_limiter or DomainRateLimiter()
+        self.cache = cache
+        self.budget = budget or RequestBudget.from_env() or RequestBudget()
+        self.meter = meter or CostMeter.from_env()
+        self.retry_policy = retry_policy or RetryPolicy.from_env()
+        self.dead_letters = dead_letters if dead_letters is not None else DeadLetterStore.from_env()
+        self.phase = 'discovery'    # metering phase of fetches; scrapers switch to 'product' for Phase 2
+        self.parent = None          # shared engine this one was adopted by, see adopt()
+
+        self._host_slots = {}
+        self._slots_lock = threading.Lock()
+        self._in_flight = 0
+        self.stats = {'requested': 0, 'fetched': 0, 'failed': 0, 'errors': 0, 'cache_hits': 0, 'over_budget': 0,
+                      'billed': 0, 'retried': 0, 'dead_lettered': 0, 'peak_in_flight': 0}
+
+        # Async clients run on a private event loop thread shared by fetch_all and fetch_one
+        self._loop = None
+        self._loop_thread = None
+        self._io_pool = None
+        self._global_slots = None
+
+    @classmethod
+    def cache_only(cls, cache=None):
+        """Engine that never touches the network: pages come from the response cache regardless of age"""
+        cache = cache or ResponseCache.from_env(ttl=float('inf'))
+        if cache is None:
+            raise ValueError("Offline mode needs the response cache (unset SCRAPER_CACHE=off)")
+        return cls(None, cache=cache)
+
+    def adopt(self, engine):
+        """
+        Rebind a scraper's own engine onto this shared one (used by the orchestrator)
+        The returned engine keeps the scraper's client and its own stats, but shares this engine's event loop,
+        global and per-host slots, rate limiter, cache, budget, meter, retry policy and dead-letter store, so every
+        site competes for the same caps.
+        The scraper's engine is closed; it must not have fetched anything yet
+        """
+        if engine.client is None:
+            raise ValueError("Only engines with an async client such as UnlockerClient can be shared")
+        if engine.cache is not None:
+            engine.cache.close()
+        child = FetchEngine(engine.client, self.max_workers, self.per_host_limit, self.host_limits,
+                            self.rate_limiter, self.cache, meter=self.meter, retry_policy=self.retry_policy)
+        child.budget = self.budget
+        child.dead_letters = self.dead_letters
+        child.parent = self
+        child._host_slots = self._host_slots
+        child._slots_lock = self._slots_lock
+        return child
+
+    def _host_limit(self, host):
+        return max(1, self.host_limits.get(host, self.per_host_limit))
+
+    def _host_slot(self, host):
+        with self._slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                if self.client:
+                    slot = asyncio.Semaphore(self._host_limit(host))
+                else:
+                    slot = threading.BoundedSemaphore(self._host_limit(host))
+                self._host_slots[host] = slot
+            return slot
+
+    def _track_in_flight(self, delta):
+        with self._slots_lock:
+            for engine in (self, self.parent) if self.parent else (self,):
+                engine._in_flight += delta
+                engine.stats['peak_in_flight'] = max(engine.stats['peak_in_flight'], engine._in_flight)
+
+    def _meter(self, url, phase, outcome):
+        if self.meter.record(url, phase, outcome):
+            with self._slots_lock:
+                self.stats['billed'] += 1
+
+    def _record_error(self, url, error):
+        """FetchFailure for a transport error; any other exception is a bug, raised rather than retried"""
+        failure = classify_error(error)
+        if failure is None:
+            raise error
+        print(f"  Request error for {url}: {error}")
+        with self._slots_lock:
+            self.stats['errors'] += 1
+        return failure
+
+    def _cached(self, url, phase):
+        """Cached HTML for url, skipping the host slot, rate limiter and network entirely"""
+        if self.cache is None:
+            return None
+        html = self.cache.get(url)
+        if html is not None:
+            self._meter(url, phase, 'cache_hit')
+            with self._slots_lock:
+                self.stats['cache_hits'] += 1
+        return html
+
+    def _within_budget(self, url, phase):
+        if self.budget.take(url):
+            return True
+        self._meter(url, phase, 'over_budget')
+        with self._slots_lock:
+            self.stats['over_budget'] += 1
+        return False
+
+    def _fetched(self, url, phase, html, failure):
+        """Meter one attempt (timeouts and connection errors are not billed) and cache the page"""
+        if html:
+            self._meter(url, phase, 'ok')
+        else:
+            self._meter(url, phase, 'error' if failure.kind in UNANSWERED else 'failed')
+        return self._store(url, html)
+
+    def _store(self, url, html):
+        if self.cache is not None and html:
+            self.cache.put(url, html)
+        return html
+
+    def _fetch_one(self, url, phase):
+        """Worker body: serve from cache, or wait for a slot on the target host, then fetch"""
+        html = self._cached(url, phase)
+        if html is not None or self.fetch is None or not self._within_budget(url, phase):
+            return url, html, None
+        with self._host_slot(host_of(url)):
+            self.rate_limiter.acquire(url)
+            self._track_in_flight(1)
+            try:
+                html, failure = self._blocking_fetch(url)
+            except Exception as e:
+                html, failure = None, self._record_error(url, e)
+            finally:
+                self._track_in_flight(-1)
+        return url, self._fetched(url, phase, html, failure), failure
+
+    def _blocking_fetch(self, url):
+        """(html, None) or (None, FetchFailure) from the blocking fetch callable, classifying any HTTP status"""
+        result = self.fetch(url)
+        if result is None or isinstance(result, str):
+            return result or None, None if result else FetchFailure('empty')
+        status = getattr(result, 'status', None) or result.status_code
+        if status != 200:
+            return None, classify_status(status, result.headers)
+        return result.text or None, None if result.text else FetchFailure('empty')
+
+    async def _client_fetch(self, url):
+        """(html, None) or (None, FetchFailure); clients with request() report the status for classification"""
+        if hasattr(self.client, 'request'):
+            response = await self.client.request(url)
+            if not response.ok:
+                return None, classify_response(response)
+            html = response.text
+        else:
+            html = await self.client.fetch(url)
+        return html, None if html else FetchFailure('empty')
+
+    async def _fetch_one_async(self, url, phase, context):
+        """
+        Coroutine body: host slot first so one slow site never holds global slots
+        Cache reads and writes and messages run on the I/O threads, in context (the submitting thread's), so a
+        SQLite write never stalls other requests on the loop and output keeps the caller's routing
+        """
+        loop = asyncio.get_running_loop()
+        html = await loop.run_in_executor(None, context.run, self._cached, url, phase)
+        if html is not None or not await loop.run_in_executor(None, context.run, self._within_budget, url, phase):
+            return url, html, None
+        async with self._host_slot(host_of(url)):
+            await self.rate_limiter.acquire_async(url)
+            async with self._global_slots:
+                self._track_in_flight(1)
+                error = None
+                try:
+                    html, failure = await self._client_fetch(url)
+                except Exception as e:
+                    html, failure, error = None, None, e
+                finally:
+                    self._track_in_flight(-1)
+        if error is not None:
+            failure = await loop.run_in_executor(None, context.run, self._record_error, url, error)
+        html = await loop.run_in_executor(None, context.run, self._fetched, url, phase, html, failure)
+        return url, html, failure
+
+    async def _request_async(self, call, phase, context):
+        """One raw request attempt for request_all: budget, host slot, rate limiter and global slot as for a page"""
+        _, url, options = call
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(None, context.run, self._within_budget, url, phase):
+            return call, None, None
+        async with self._host_slot(host_of(url)):
+            await self.rate_limiter.acquire_async(url)
+            async with self._global_slots:
+                self._track_in_flight(1)
+                error = None
+                try:
+                    response = await self.client.request(url, **options)
+                    failure = None if response.ok else classify_response(response)
+                except Exception as e:
+                    response, failure, error = None, None, e
+                finally:
+                    self._track_in_flight(-1)
+        if error is not None:
+            failure = await loop.run_in_executor(None, context.run, self._record_error, url, error)
+        outcome = 'ok' if failure is None else 'error' if failure.kind in UNANSWERED else 'failed'
+        await loop.run_in_executor(None, context.run, self._meter, url, phase, outcome)
+        return call, response, failure
+
+    def _ensure_loop(self):
+        if self.parent is not None:
+            loop = self.parent._ensure_loop()
+            self._global_slots = self.parent._global_slots
+            return loop
+        with self._slots_lock:    # a streaming run fetches from its discovery and product stages at once
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._io_pool = ThreadPoolExecutor(IO_WORKERS, thread_name_prefix='fetch-io')
+                self._loop.set_default_executor(self._io_pool)
+                self._global_slots = asyncio.Semaphore(self.max_workers)
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name='fetch-loop', daemon=True)
+                self._loop_thread.start()
+        return self._loop
+
+    def _submit(self, pool, url, phase):
+        if self.client:
+            return asyncio.run_coroutine_threadsafe(self._fetch_one_async(url, phase, contextvars.copy_context()),
+                                                    self._ensure_loop())
+        return pool.submit(self._fetch_one, url, phase)
+
+    def _retry_delay(self, url, failure, attempt):
+        """Backoff before the next attempt; a 429 also pauses the whole domain for that long"""
+        delay = self.retry_policy.delay(failure, attempt)
+        if failure.kind == 'throttle':
+            self.rate_limiter.pause(url, delay)
+        with self._slots_lock:
+            self.stats['retried'] += 1
+        return delay
+
+    def _finish(self, url, phase, html, failure, attempts, missing_ok=False):
+        """Count the final result of a page and dead-letter it if the engine gave up"""
+        if failure is not None and not (missing_ok and failure.kind == 'not_found'):
+            print(f"  Gave up on {url} after {attempts} attempt(s): {failure}")
+            if self.dead_letters is not None:
+                self.dead_letters.add(url, 'fetch', failure.detail or failure.kind, attempts, failure.kind, phase)
+            with self._slots_lock:
+                self.stats['dead_lettered'] += 1
+        elif html and self.dead_letters is not None:
+            self.dead_letters.resolve(url, 'fetch')
+        with self._slots_lock:
+            self.stats['fetched' if html else 'failed'] += 1
+
+    def fetch_one(self, url, phase=None, missing_ok=False):
+        """
+        Fetch a single page through the engine (used by Phase 1 listing crawls), retrying in place
+        missing_ok: a 404 is an expected answer (a probe past the end of a listing), not a dead letter
+        """
+        phase = phase or self.phase
+        with self._slots_lock:
+            self.stats['requested'] += 1
+        attempt = 1
+        while True:
+            if self.client:
+                _, html, failure = self._submit(None, url, phase).result()
+            else:
+                _, html, failure = self._fetch_one(url, phase)
+            if failure is None or not self.retry_policy.should_retry(failure, attempt):
+                break
+            time.sleep(self._retry_delay(url, failure, attempt))
+            attempt += 1
+        self._finish(url, phase, html, failure, attempt, missing_ok)
+        return html
+
+    def run_coroutine(self, coro):
+        """Run a one-off client coroutine (e.g. a GraphQL request) on the engine loop"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    def request(self, url, phase=None, **options):
+        """
+        One raw unlocker request (e.g. a GraphQL POST) paced, budgeted, retried and metered like any page fetch
+        Returns the last UnlockerResponse, or None when the budget is spent or no response ever came back
+        """
+        for _, response in self.request_all([(url, url, options)], phase):
+            return response
+
+    def request_all(self, calls, phase=None, max_workers=None):
+        """
+        Send raw unlocker requests concurrently (e.g. every page of a GraphQL listing) and yield (key, response)
+        as each completes; calls are (key, url, options) triples, response is None as with request()
+        Requests take the same host and global slots as page fetches, and a retry waits in the retry queue
+        max_workers: requests in flight, defaults to the per-host cap since the calls usually share one endpoint
+        """
+        if not hasattr(self.client, 'request'):
+            raise ValueError("Raw requests need an async client with request(), such as UnlockerClient")
+        phase = phase or self.phase
+        loop = self._ensure_loop()
+
+        def submit(call, attempt):
+            return asyncio.run_coroutine_threadsafe(self._request_async(call, phase, contextvars.copy_context()), loop)
+
+        results = self._schedule(calls, submit, lambda call: call[1], max_workers or self.per_host_limit)
+        try:
+            for (key, _, _), response, _, _ in results:
+                yield key, response
+        finally:
+            results.close()
+
+    def fetch_all(self, urls, phase=None):
+        """
+        Fetch URLs concurrently and yield (url, html) pairs as they complete.
+        html is None when the fetch failed. Results come back in completion
+        order, so callers should not rely on input order.
+        A page that fails with a retryable error is queued again behind the
+        pages not yet started, so its backoff never ties up a worker.
+        urls may be a streaming source that yields IDLE while it has no URL
+        ready; finished pages keep being yielded until it produces more.
+        phase: metering phase, defaults to self.phase
+        """
+        phase = phase or self.phase
+        pool = None if self.client else ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fetch')
+
+        def submit(url, attempt):
+            if attempt == 1:
+                with self._slots_lock:
+                    self.stats['requested'] += 1
+            return self._submit(pool, url, phase)
+
+        # Keep a small backlog queued beyond the worker count so no worker idles,
+        # without materializing thousands of futures up front
+        results = self._schedule(urls, submit, lambda url: url, self.max_workers * 2)
+        try:
+            for url, html, failure, attempts in results:
+                self._finish(url, phase, html, failure, attempts)
+                yield url, html
+        finally:
+            results.close()
+            if pool:
+                pool.shutdown(wait=True)
+
+    def _schedule(self, jobs, submit, url_of, window):
+        """
+        Run jobs (URLs, or request_all calls) with at most window attempts in flight and yield
+        (job, result, failure, attempts) once each is final
+        submit(job, attempt) starts one attempt, returning a future of (job, result, failure); url_of(job) is its URL
+        A retryable failure is queued again behind the jobs not yet started instead of sleeping in a worker
+        """
+        jobs = iter(jobs)
+        pending = {}            # future -> attempt number
+        retries = []            # heap of (ready_at, sequence, job, attempt)
+        sequence = itertools.count()
+        exhausted = False
+        try:
+            while True:
+                # Fresh jobs first; a retry is only started once no fresh job is waiting
+                idle = False
+                while len(pending) < window:
+                    job = None
+                    if not (exhausted or idle):
+                        job = next(jobs, None)
+                        exhausted, idle = job is None, job is IDLE
+                    if job is not None and job is not IDLE:
+                        pending[submit(job, 1)] = 1
+                    elif retries and retries[0][0] <= time.monotonic():
+                        _, _, job, attempt = heapq.heappop(retries)
+                        pending[submit(job, attempt)] = attempt
+                    else:
+                        break
+
+                if not pending:
+                    if not exhausted:
+                        continue          # the streaming source already waited for its next URL
+                    if not retries:
+                        break
+                    time.sleep(max(0, retries[0][0] - time.monotonic()))
+                    continue
+
+                # With room in the window, wake up when the next retry is due, or right away to poll an idle source
+                timeout = max(0, retries[0][0] - time.monotonic()) if retries and len(pending) < window else None
+                if idle:
+                    timeout = 0
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    attempt = pending.pop(future)
+                    job, result, failure = future.result()
+                    if failure is not None and self.retry_policy.should_retry(failure, attempt):
+                        ready_at = time.monotonic() + self._retry_delay(url_of(job), failure, attempt)
+                        heapq.heappush(retries, (ready_at, next(sequence), job, attempt + 1))
+                        continue
+                    yield job, result, failure, attempt
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        """
+        Close the cache, the async client's connection pool and the engine's event loop
+        An adopted engine only closes its client; the shared engine owns the rest
+        """
+        if self.parent is not None:
+            if self.parent._loop is not None:
+                asyncio.run_coroutine_threadsafe(self.client.close(), self.parent._loop).result()
+            return
+        if self._loop is not None:
+            if self.client:
+                asyncio.run_coroutine_threadsafe(self.client.close(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+            self._io_pool.shutdown(wait=True)     # cache writes still running finish before the cache closes
+            self._loop = None
+        self.meter.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def print_stats(self):
+        """Print fetch engine statistics"""
+        print(f"\nFETCH ENGINE:")
+        print(f"   Requested: {self.stats['requested']}")
+        print(f"   Fetched: {self.stats['fetched']}")
+        print(f"   Failed: {self.stats['failed']} ({self.stats['errors']} request errors)")
+        print(f"   Retried: {self.stats['retried']}, Dead-lettered: {self.stats['dead_lettered']}")
+        print(f"   Cache Hits: {self.stats['cache_hits']} (no BrightData cost)")
+        if self.budget.capped:
+            print(f"   Over Budget: {self.stats['over_budget']} (not requested)")
+        print(f"   Billable: {self.stats['billed']} (${self.cost:.2f})")
+        print(f"   Peak In-Flight: {self.stats['peak_in_flight']}")
+        if self.parent is not None:
+            return    # rate limiter, cache, budget and meter are reported once by the orchestrator
+        self.rate_limiter.print_stats()
+        if self.cache is not None:
+            self.cache.print_stats()
+        self.meter.print_stats()
+        if self.dead_letters is not None:
+            self.dead_letters.print_stats()
+        if self.budget.capped:
+            self.budget.print_stats()
+
+    @property
+    def cost(self):
+        """Metered BrightData cost of this engine's own requests"""
+        return self.stats['billed'] * self.meter.cost_per_request
+
+    def print_cost(self, strains):
+        """Metered cost line for a scraper's final report, with the cost per stored strain"""
+        print(f"\nCost: ${self.cost:.2f} BrightData ({self.stats['billed']} billable requests, "
+              f"${self.cost / max(strains, 1):.4f} per strain)")
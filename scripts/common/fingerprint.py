@@ -0,0 +1,33 @@
+"""
+Strain Record Fingerprints
+A refetched page usually extracts to the same record apart from its timestamps, and writing it again costs
+DynamoDB write capacity for nothing. Every stored record carries a content_hash over its normalized content
+(keys sorted, timestamps left out, Decimal and float scores unified) so the storage layer can tell a changed
+record from a no-op rewrite without comparing fields
+"""
+
+import hashlib
+import json
+from decimal import Decimal
+
+FINGERPRINT_FIELD = 'content_hash'
+VOLATILE_FIELDS = ('created_at', 'updated_at', 'scraped_at', FINGERPRINT_FIELD)
+
+
+def _normalize(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def fingerprint(item):
+    """Hash of a strain record ignoring its timestamps and its own content_hash"""
+    stable = {key: value for key, value in item.items() if key not in VOLATILE_FIELDS}
+    encoded = json.dumps(stable, sort_keys=True, default=_normalize, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def stamp(item):
+    """Store the record's fingerprint in item['content_hash'] and return it"""
+    item[FINGERPRINT_FIELD] = fingerprint(item)
+    return item[FINGERPRINT_FIELD]
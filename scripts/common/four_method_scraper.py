@@ -0,0 +1,396 @@
+"""
+Enhanced 4-Method Scraper Engine
+The per-site enhanced scrapers only differ in their four extraction methods and a handful of settings, so
+everything else - credentials, fetching, Phase 1 URL discovery, scoring, strain IDs, storage, journaling and
+statistics - lives here once. A seed bank subclasses FourMethodScraper, declares its spec as class attributes
+and implements method1..method4:
+
+    class MephistoEnhanced4MethodScraper(FourMethodScraper):
+        SEED_BANK = 'Mephisto Genetics'
+        KEY = 'mephisto'
+        STRAIN_ID_SUFFIX = 'mephisto'
+        CATALOG_URLS = ['https://mephistogenetics.com/collections/all']
+        PRODUCT_URL_MARKERS = ('/products/',)
+        FIELD_WEIGHTS = {'strain_name': 10, ...}
+
+        def method1_structured_extraction(self, soup, url): ...
+
+run() streams Phase 1 into Phase 2 through a Pipeline (discover -> fetch -> parse -> store), so products are
+fetched while later listing pages are still loading; SCRAPER_PIPELINE=batch collects every URL first
+The parse stage extracts pages in a ParsePool of worker processes (SCRAPER_PARSE_WORKERS), off the fetch threads
+"""
+
+import json
+import re
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal
+from urllib.parse import urljoin
+
+
+from .extraction_context import ExtractionContext
+from .fetch_engine import IDLE, FetchEngine
+from .frontier import URLFrontier
+from .html_parser import make_soup
+from .pagination import ListingCrawler
+from .parse_pool import ParsePool
+from .pipeline import Pipeline, use_streaming
+from .progress_journal import ProgressJournal
+from .recrawl import RecrawlIndex
+from .response_cache import ResponseCache
+from .sitemap import SitemapReader, use_sitemaps
+from .storage import open_storage
+from .unlocker_client import UnlockerClient
+
+METHODS = ('structured', 'description', 'patterns', 'fallback')
+QUALITY_TIERS = ((80, 'Premium'), (60, 'High'), (40, 'Medium'), (20, 'Basic'))
+
+
+class FourMethodScraper:
+    # Record identity
+    SEED_BANK = None              # record seed_bank, also used in reports
+    KEY = None                    # journal / recrawl index key, as in SEED_BANKS
+    STRAIN_ID_SUFFIX = None       # strain_id = "<strain>-<breeder>-<suffix>"
+    STRAIN_ID_BREEDER = None      # fixed breeder for strain IDs; otherwise the record's breeder_name...
+    DEFAULT_BREEDER = 'Unknown'   # ...or this when the page names none
+    BASE_FIELDS = {}              # fields every record starts with, before the 4 methods
+
+    # Phase 1
+    SITEMAP_URL = None            # sitemap or sitemap index read with SCRAPER_URL_SOURCE=sitemap
+    SITEMAP_FILTER = None         # substring a child sitemap URL must contain (e.g. 'product-sitemap')
+    LISTINGS = ()                 # paginated catalog listings
+    LISTING_FIRST_PAGE = '{listing}'
+    LISTING_PAGE = '{listing}page/{page}/'
+    LISTING_MAX_PAGES = None      # per-listing page cap, ListingCrawler's default when None
+    CATALOG_URLS = ()             # single catalog pages, fetched concurrently
+    PRODUCT_URL_MARKERS = ()      # substrings identifying product URLs in sitemaps and catalog links
+
+    # Phase 2
+    FIELD_WEIGHTS = {}            # field -> weight for data_completeness_score
+    MIN_QUALITY = 20              # records scoring below this are skipped
+    HIGHLIGHT_FIELDS = ()         # (field, label) pairs printed for each stored strain
+    UNIQUE_FEATURES = None        # closing line of the final report
+
+    def __init__(self, offline=False):
+        """offline: replay pages from the response cache only, without AWS or BrightData (re-extraction)"""
+        if offline:
+            self.fetch_engine = FetchEngine.cache_only()
+            self.frontier = URLFrontier(self.KEY)
+            self.parse_pool = None
+        else:
+            self.frontier = URLFrontier.open(self.KEY)
+            self.recrawl = RecrawlIndex.open(self.KEY)
+            self.sink = self.recrawl.wrap(open_storage())
+            self.journal = ProgressJournal.open(self.KEY)
+            self.journal.attach(self.sink)
+            import boto3          # Secrets Manager holds the BrightData credentials; offline runs never need it
+            self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
+            self.brightdata_config = self._get_brightdata_credentials()
+            self.unlocker = UnlockerClient(self.brightdata_config['api_key'], self.brightdata_config['zone'])
+            self.fetch_engine = FetchEngine(self.unlocker, cache=ResponseCache.from_env())
+            self.parse_pool = ParsePool.from_env()
+
+        # Success tracking
+        self.total_processed = 0
+        self.successful_extractions = 0
+        self.method_stats = {method: 0 for method in METHODS}
+        self.quality_tiers = Counter()
+        self.sitemap_lastmod = {}   # product URL -> sitemap lastmod, for incremental recrawls
+        self.pipeline = None
+
+    @classmethod
+    def parser(cls):
+        """Extraction-only instance for parse pool workers: no fetch engine, storage, journal or credentials"""
+        scraper = cls.__new__(cls)
+        scraper.method_stats = {method: 0 for method in METHODS}
+        return scraper
+
+    def _get_brightdata_credentials(self):
+        response = self.secrets_client.get_secret_value(SecretId='cannabis-brightdata-api')
+        return json.loads(response['SecretString'])
+
+    def _brightdata_request(self, url):
+        return self.fetch_engine.fetch_one(url)
+
+    # Extraction
+
+    def method1_structured_extraction(self, soup, url):
+        return {}
+
+    def method2_description_mining(self, soup, url):
+        return {}
+
+    def method3_advanced_patterns(self, soup, url):
+        return {}
+
+    def method4_fallback_extraction(self, soup, url):
+        return {}
+
+    def post_process(self, strain_data):
+        """Site-specific fix-ups after the 4 methods, before scoring"""
+
+    def apply_4_methods(self, html_content, url):
+        """Apply all 4 extraction methods, then score, identify and timestamp the record"""
+        soup = ExtractionContext(make_soup(html_content), url)
+
+        strain_data = {'seed_bank': self.SEED_BANK}
+        strain_data.update(self.BASE_FIELDS)
+        strain_data['source_url'] = url
+        strain_data['extraction_methods_used'] = []
+
+        methods = (self.method1_structured_extraction, self.method2_description_mining,
+                   self.method3_advanced_patterns, self.method4_fallback_extraction)
+        for method_name, method in zip(METHODS, methods):
+            try:
+                method_data = method(soup, url)
+            except Exception as e:
+                print(f"  Method {method_name} failed: {e}")
+                continue
+            if method_data:
+                strain_data.update(method_data)
+                strain_data['extraction_methods_used'].append(method_name)
+                self.method_stats[method_name] += 1
+
+        self.post_process(strain_data)
+
+        # Calculate quality score
+        strain_data['data_completeness_score'] = self.calculate_quality_score(strain_data)
+        strain_data['quality_tier'] = self.determine_quality_tier(strain_data['data_completeness_score'])
+        strain_data['field_count'] = len([v for v in strain_data.values() if v])
+
+        # Create strain ID
+        strain_name = strain_data.get('strain_name', 'Unknown')
+        breeder_name = self.STRAIN_ID_BREEDER or strain_data.get('breeder_name', self.DEFAULT_BREEDER)
+        strain_data['strain_id'] = self.create_strain_id(strain_name, breeder_name)
+
+        # Add timestamps
+        now = datetime.utcnow().isoformat() + 'Z'
+        strain_data['created_at'] = now
+        strain_data['updated_at'] = now
+
+        return strain_data
+
+    def calculate_quality_score(self, strain_data):
+        """Weighted share of FIELD_WEIGHTS filled with more than 2 characters"""
+        total_possible = sum(self.FIELD_WEIGHTS.values())
+        actual_score = 0
+
+        for field, weight in self.FIELD_WEIGHTS.items():
+            if strain_data.get(field) and len(str(strain_data[field]).strip()) > 2:
+                actual_score += weight
+
+        return round((actual_score / total_possible) * 100, 1)
+
+    def determine_quality_tier(self, score):
+        for threshold, tier in QUALITY_TIERS:
+            if score >= threshold:
+                return tier
+        return "Minimal"
+
+    def create_strain_id(self, strain_name, breeder_name):
+        combined = f"{strain_name}-{breeder_name}-{self.STRAIN_ID_SUFFIX}".lower()
+        combined = re.sub(r'[^a-z0-9-]', '', combined.replace(' ', '-'))
+        return combined[:50]
+
+    # Phase 1
+
+    def is_product_url(self, url):
+        return any(marker in url for marker in self.PRODUCT_URL_MARKERS)
+
+    def listing_product_urls(self, soup):
+        """Product links on one listing or catalog page (relative links are resolved by the caller)"""
+        return [link.get('href') for link in soup.find_all('a', href=True) if self.is_product_url(link.get('href'))]
+
+    def _queue(self, urls):
+        """Add urls to the frontier, yielding the ones new to this run as the frontier knows them"""
+        for url in urls:
+            if self.frontier.add(url):
+                yield self.frontier.get(url)
+
+    def discover_sitemap_urls(self):
+        """Phase 1 from the product sitemap: a few requests instead of every catalog page"""
+        print(f"Reading {self.SEED_BANK} product sitemap...")
+        reader = SitemapReader(self.fetch_engine)
+        for url in reader.stream_product_urls(self.SITEMAP_URL, self.is_product_url, sitemaps=self.SITEMAP_FILTER):
+            for queued in self._queue([url]):
+                if url in reader.lastmod:
+                    self.sitemap_lastmod[queued] = reader.lastmod[url]
+                yield queued
+
+    def discover_catalog_urls(self):
+        """Product URLs from every paginated listing and single catalog page, as each page is read"""
+        if self.LISTINGS:
+            crawler = ListingCrawler(self.fetch_engine)
+            for listing in self.LISTINGS:
+                print(f"\nScraping listing: {listing}")
+                yield from self._queue(crawler.stream(
+                    self.LISTING_FIRST_PAGE.format(listing=listing),
+                    lambda page: self.LISTING_PAGE.format(listing=listing, page=page),
+                    self.listing_product_urls, max_pages=self.LISTING_MAX_PAGES))
+
+        for catalog_url, html in self.fetch_engine.fetch_all(list(self.CATALOG_URLS)):
+            print(f"Scraping catalog: {catalog_url}")
+            if not html:
+                print(f"Failed to fetch catalog: {catalog_url}")
+                continue
+            yield from self._queue(urljoin(catalog_url, href) for href in self.listing_product_urls(make_soup(html)))
+
+    def discover_strain_urls(self):
+        """Phase 1: product URLs from the sitemap (SCRAPER_URL_SOURCE=sitemap) or the catalog pages, as found"""
+        print(f"PHASE 1: Collecting {self.SEED_BANK} strain URLs...")
+        if self.SITEMAP_URL and use_sitemaps():
+            found = len(self.frontier)
+            yield from self.discover_sitemap_urls()
+            if len(self.frontier) > found:
+                return
+            print("Sitemap yielded no strains, falling back to catalog pages")
+
+        yield from self.discover_catalog_urls()
+        print(f"Total unique strains found: {len(self.frontier)}")
+
+    def collect_strain_urls(self):
+        """Phase 1 in one go: every product URL, new ones first, then in discovery order"""
+        for _ in self.discover_strain_urls():
+            pass
+        return self.frontier.ordered()
+
+    # Phase 2
+
+    def scrape_strain_details(self, strain_urls):
+        """Phase 2: Extract detailed strain data using 4-method approach"""
+        strain_urls = self.journal.plan(self.recrawl.plan(strain_urls, self.sitemap_lastmod))
+        self.fetch_engine.phase = 'product'
+        print(f"\nPHASE 2: Scraping {len(strain_urls)} strains with 4-method extraction...")
+        self.store_records(self.parse_pages(self.fetch_engine.fetch_all(strain_urls)), len(strain_urls))
+
+    def stream_strain_details(self):
+        """Phase 1 and Phase 2 overlapped: each strain is fetched as soon as discovery finds its URL"""
+        print(f"Streaming {self.SEED_BANK} strains from discovery to storage...")
+        self.pipeline = Pipeline()
+        self.pipeline.add('discover', lambda _: self.journal.stream(
+            self.recrawl.stream(self.discover_strain_urls(), self.sitemap_lastmod)))
+        self.pipeline.add('fetch', lambda urls: self.fetch_engine.fetch_all(urls, phase='product'), idle=True)
+        self.pipeline.add('parse', self.parse_pages, idle=self.parse_pool is not None)
+        self.pipeline.add('store', self.store_records)
+        self.pipeline.run()
+
+    def parse_pages(self, pages):
+        """
+        (url, record, error) for each fetched (url, html) pair; record is None when the fetch failed, or when
+        extraction did (error says why)
+        With a parse pool, records come back from the worker processes in completion order
+        """
+        if self.parse_pool is None:
+            records = (self._extract(url, html) for url, html in self._fetched(pages))
+        else:
+            records = self.parse_pool.extract(self.KEY, self._fetched(pages))
+        for url, strain_data, error in records:
+            if strain_data is not None:
+                self.journal.mark(url, 'extracted')
+                if self.parse_pool is not None:
+                    for method in strain_data['extraction_methods_used']:
+                        self.method_stats[method] += 1
+            yield url, strain_data, error
+
+    def _extract(self, url, html):
+        if not html:
+            return url, None, None
+        try:
+            return url, self.apply_4_methods(html, url), None
+        except Exception as e:
+            return url, None, f"extraction failed: {e}"
+
+    def _fetched(self, pages):
+        """Journal each page that arrived as fetched on its way to extraction"""
+        for page in pages:
+            if page is not IDLE and page[1]:
+                self.journal.mark(page[0], 'fetched')
+            yield page
+
+    def store_records(self, records, total=None):
+        """Quality gate, then storage, for each (url, record, error) from parse_pages()"""
+        for i, (url, strain_data, error) in enumerate(records, 1):
+            self.total_processed += 1
+            print(f"\n[{i}/{total}] {url}" if total else f"\n[{i}] {url}")
+
+            if strain_data is None:
+                # From 'fetched', an extraction failure is dead-lettered under the extract stage
+                print(f"  FAILED: {error}" if error else "  FETCH FAILED")
+                self.journal.mark(url, 'failed', error or 'fetch failed')
+                continue
+
+            self.quality_tiers[strain_data['quality_tier']] += 1
+
+            # Quality validation
+            if strain_data['data_completeness_score'] < self.MIN_QUALITY:
+                print(f"  LOW QUALITY: {strain_data['data_completeness_score']:.1f}% - skipped")
+                self.journal.mark(url, 'skipped', f"quality {strain_data['data_completeness_score']:.1f}%")
+                continue
+
+            try:
+                # Convert Decimal for DynamoDB
+                strain_data['data_completeness_score'] = Decimal(str(strain_data['data_completeness_score']))
+
+                self.sink.put(strain_data)
+                self.successful_extractions += 1
+
+                print(f"  SUCCESS: {strain_data.get('strain_name', 'Unknown')} - "
+                      f"{strain_data.get('breeder_name', 'Unknown')}")
+                print(f"     Quality: {strain_data['quality_tier']} ({float(strain_data['data_completeness_score']):.1f}%)")
+                print(f"     Methods: {', '.join(strain_data['extraction_methods_used'])}")
+                for field, label in self.HIGHLIGHT_FIELDS:
+                    if strain_data.get(field):
+                        print(f"     {label}: {strain_data[field]}")
+
+            except Exception as e:
+                print(f"  STORAGE FAILED: {e}")
+                self.journal.mark(url, 'failed', e)
+
+    def print_final_stats(self):
+        """Print comprehensive scraping statistics"""
+        success_rate = (self.successful_extractions / self.total_processed * 100) if self.total_processed > 0 else 0
+
+        print(f"\n{self.SEED_BANK.upper()} ENHANCED SCRAPING COMPLETE!")
+        print(f"FINAL STATISTICS:")
+        print(f"   Total Processed: {self.total_processed}")
+        print(f"   Successful: {self.successful_extractions}")
+        print(f"   Success Rate: {success_rate:.1f}%")
+        print(f"\nMETHOD USAGE:")
+        for method, count in self.method_stats.items():
+            print(f"   {method.title()}: {count} strains")
+        print(f"\nQUALITY TIERS:")
+        for tier in [tier for _, tier in QUALITY_TIERS] + ['Minimal']:
+            print(f"   {tier}: {self.quality_tiers[tier]} strains")
+        self.fetch_engine.print_cost(self.successful_extractions)
+        self.fetch_engine.print_stats()
+        if self.pipeline is not None:
+            self.pipeline.print_stats()
+        if self.parse_pool is not None:
+            self.parse_pool.print_stats()
+        self.frontier.print_stats()
+        self.sink.print_stats()
+        self.journal.print_stats()
+        self.recrawl.print_stats()
+        if self.UNIQUE_FEATURES:
+            print(f"Unique Features: {self.UNIQUE_FEATURES}")
+
+    def run(self):
+        """Phase 1 and Phase 2 (streamed, or back to back with SCRAPER_PIPELINE=batch), final statistics, cleanup"""
+        if use_streaming():
+            self.stream_strain_details()
+        else:
+            strain_urls = self.collect_strain_urls()
+            if strain_urls:
+                self.scrape_strain_details(strain_urls)
+        if not self.total_processed and not len(self.frontier):
+            print("No strain URLs found.")
+
+        self.sink.close()
+        self.journal.finish(self.fetch_engine.budget)
+        self.print_final_stats()
+        self.fetch_engine.close()
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+        self.frontier.close()
+        self.journal.close()
+        self.recrawl.close()
@@ -0,0 +1,143 @@
+"""
+URL Frontier
+Phase 1 hands its product URLs to Phase 2 through a frontier instead of a list: a dict keyed by normalized URL
+makes every "seen it?" check O(1), where `url not in all_urls` over a growing list was quadratic, and variants of one
+page - scheme or host case, trailing slash, tracking parameters, Magento's ?store= switcher - collapse onto the
+first URL seen for it, so they are fetched and stored once
+
+The frontier remembers every URL it has seen per seed bank between runs: a variant found in a later run maps back to
+the URL used before, keeping journal, recrawl and dead-letter keys stable, and URLs never seen before are put at
+the front of Phase 2, so a capped or interrupted refresh reaches new strains first
+"""
+
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_FRONTIER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                     '.cache', 'frontier.sqlite')
+# Query parameters that never change the page served
+IGNORED_PARAMS = ('store', 'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', '_ga', '_gl', 'srsltid', 'ref')
+IGNORED_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+NEW_PRIORITY = 1                  # never seen in an earlier run
+KNOWN_PRIORITY = 0
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    seed_bank TEXT NOT NULL,
+    url_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (seed_bank, url_key)
+);
+"""
+
+
+def normalize_url(url):
+    """Dedup key for url: lowercase scheme and host, no default port, fragment, trailing slash or tracking params"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or '/'
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if name.lower() not in IGNORED_PARAMS and not name.lower().startswith(IGNORED_PREFIXES))
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+class URLFrontier:
+    def __init__(self, seed_bank, path=None):
+        """
+        seed_bank: key separating this scraper's URLs in the shared frontier file
+        path: SQLite file remembering URLs between runs, None for an in-memory frontier (offline re-extraction)
+        """
+        self.seed_bank = seed_bank
+        self.path = path
+        self.conn = None
+        self.known = {}           # url_key -> URL used in earlier runs
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.executescript(SCHEMA)
+            self.known = dict(self.conn.execute(
+                "SELECT url_key, url FROM frontier WHERE seed_bank = ?", (seed_bank,)))
+        self.urls = {}            # url_key -> URL, this run
+        self.queue = []           # heap of (-priority, sequence, url_key)
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+        self.stats = {'added': 0, 'duplicates': 0, 'new': 0}
+
+    @classmethod
+    def open(cls, seed_bank):
+        """Frontier persisted at SCRAPER_FRONTIER_PATH, or in memory only with SCRAPER_FRONTIER=off"""
+        if os.environ.get('SCRAPER_FRONTIER', 'on').lower() in ('off', '0', 'false', 'no'):
+            return cls(seed_bank)
+        return cls(seed_bank, os.environ.get('SCRAPER_FRONTIER_PATH', DEFAULT_FRONTIER_PATH))
+
+    def __len__(self):
+        return len(self.urls)
+
+    def __contains__(self, url):
+        return normalize_url(url) in self.urls
+
+    def get(self, url):
+        """URL this run uses for url's page (the first variant seen), or None"""
+        return self.urls.get(normalize_url(url))
+
+    def add(self, url, priority=None):
+        """
+        Queue url unless a variant is already queued; returns whether it was new to this run
+        priority: higher is fetched first; defaults to NEW_PRIORITY for URLs no earlier run has seen
+        """
+        key = normalize_url(url)
+        with self.lock:
+            if key in self.urls:
+                self.stats['duplicates'] += 1
+                return False
+            if key in self.known:
+                url = self.known[key]
+            else:
+                self.stats['new'] += 1
+            if priority is None:
+                priority = KNOWN_PRIORITY if key in self.known else NEW_PRIORITY
+            self.urls[key] = url
+            heapq.heappush(self.queue, (-priority, next(self.sequence), key))
+            self.stats['added'] += 1
+            return True
+
+    def extend(self, urls, priority=None):
+        """Queue several URLs; returns how many were new to this run"""
+        return sum(self.add(url, priority) for url in urls)
+
+    def ordered(self):
+        """Every queued URL by priority, in discovery order within a priority"""
+        with self.lock:
+            return [self.urls[key] for _, _, key in sorted(self.queue)]
+
+    def close(self):
+        """Remember this run's URLs for the next run"""
+        if self.conn is None:
+            return
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT INTO frontier (seed_bank, url_key, url, first_seen, last_seen) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(seed_bank, url_key) DO UPDATE SET last_seen = excluded.last_seen",
+                [(self.seed_bank, key, url, now, now) for key, url in self.urls.items()])
+            self.conn.commit()
+            self.conn.close()
+            self.conn = None
+        self.known.update(self.urls)
+
+    def print_stats(self):
+        """Print frontier statistics"""
+        print(f"\nURL FRONTIER ({self.path or 'in memory'}):")
+        print(f"   Queued: {self.stats['added']} ({self.stats['new']} never seen before, "
+              f"{len(self.known)} known from earlier runs)")
+        print(f"   Duplicates dropped: {self.stats['duplicates']}")
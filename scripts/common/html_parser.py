@@ -0,0 +1,33 @@
+"""
+Pluggable HTML Parser Backend
+Single place every scraper builds its BeautifulSoup tree
+Defaults to the C-based lxml builder and falls back to Python's html.parser only when lxml fails
+"""
+
+import os
+
+from bs4 import BeautifulSoup
+
+FALLBACK_PARSER = 'html.parser'
+DEFAULT_PARSER = os.environ.get('SCRAPER_HTML_PARSER', 'lxml')
+
+stats = {'parsed': 0, 'fallbacks': 0}
+
+
+def make_soup(html, parser=None):
+    """
+    Parse page HTML with the configured backend (SCRAPER_HTML_PARSER, default lxml).
+    Falls back to html.parser if the backend is not installed, raises, or drops the whole document.
+    """
+    parser = parser or DEFAULT_PARSER
+    stats['parsed'] += 1
+    if parser != FALLBACK_PARSER:
+        try:
+            soup = BeautifulSoup(html, parser)
+            # lxml silently returns an empty tree for some badly broken documents
+            if soup.find() is not None or not html or not html.strip():
+                return soup
+        except Exception:  # FeatureNotFound when lxml is missing, or an lxml parse error
+            pass
+        stats['fallbacks'] += 1
+    return BeautifulSoup(html, FALLBACK_PARSER)
@@ -0,0 +1,87 @@
+"""
+Request Metering
+The fetch engine records every page it serves by seed bank, phase and outcome, so BrightData cost is counted where
+it is spent instead of estimated from strain counts afterwards: sitemap and listing pages, repeated requests for the
+same product and failed fetches all show up. Cache hits and requests refused by the budget are recorded but free
+
+    discovery   Phase 1 - sitemaps, listing and catalog pages, GraphQL searches
+    product     Phase 2 - one product page per strain
+"""
+
+import csv
+import os
+import threading
+from collections import Counter
+
+from .budget import COST_PER_REQUEST
+from .rate_limiter import domain_of
+
+OUTCOMES = ('ok', 'failed', 'error', 'cache_hit', 'over_budget')
+# The unlocker answered (page or non-200); connection errors, cache hits and refused requests cost nothing
+BILLABLE_OUTCOMES = ('ok', 'failed')
+
+
+class CostMeter:
+    def __init__(self, cost_per_request=COST_PER_REQUEST, report_path=None):
+        """
+        cost_per_request: dollars per billable request
+        report_path: optional CSV written on close() with the billable requests and cost of every product URL
+        """
+        self.cost_per_request = cost_per_request
+        self.report_path = report_path
+        self.counts = Counter()           # (site, phase, outcome) -> requests
+        self.product_requests = Counter()   # product URL -> billable requests
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Meter writing its per-strain report to SCRAPER_COST_REPORT, if set"""
+        return cls(report_path=os.environ.get('SCRAPER_COST_REPORT') or None)
+
+    def record(self, url, phase, outcome):
+        """Count one page served for url; returns True when it was billable"""
+        billable = outcome in BILLABLE_OUTCOMES
+        with self.lock:
+            self.counts[(domain_of(url), phase, outcome)] += 1
+            if billable and phase == 'product':
+                self.product_requests[url] += 1
+        return billable
+
+    @property
+    def billed(self):
+        return sum(count for (_, _, outcome), count in self.counts.items() if outcome in BILLABLE_OUTCOMES)
+
+    @property
+    def cost(self):
+        return self.billed * self.cost_per_request
+
+    def write_report(self, path=None):
+        """Per-strain cost report: one CSV row per product URL, most expensive first"""
+        path = path or self.report_path
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['url', 'seed_bank_domain', 'requests', 'cost'])
+            for url, requests in self.product_requests.most_common():
+                writer.writerow([url, domain_of(url), requests, f"{requests * self.cost_per_request:.4f}"])
+        print(f"Cost report: {len(self.product_requests)} product URLs -> {path}")
+
+    def close(self):
+        if self.report_path and self.product_requests:
+            self.write_report()
+
+    def print_stats(self):
+        """Print requests and cost by seed bank and phase"""
+        with self.lock:
+            rows = Counter(self.counts)
+        print(f"\nCOST METER (${self.cost_per_request} per billable request):")
+        print(f"   {'Site':<28} {'Phase':<10} {'OK':>7} {'Failed':>7} {'Errors':>7} {'Cached':>7} {'Refused':>8} {'Cost':>9}")
+        for site, phase in sorted({(site, phase) for site, phase, _ in rows}):
+            ok, failed, errors, cached, refused = (rows[(site, phase, outcome)] for outcome in OUTCOMES)
+            print(f"   {site:<28} {phase:<10} {ok:>7} {failed:>7} {errors:>7} {cached:>7} {refused:>8} "
+                  f"{(ok + failed) * self.cost_per_request:>9.2f}")
+        print(f"   Total: {self.billed} billable requests, ${self.cost:.2f}")
+        if self.product_requests:
+            repeated = sum(1 for requests in self.product_requests.values() if requests > 1)
+            average = sum(self.product_requests.values()) / len(self.product_requests)
+            print(f"   Product pages: {len(self.product_requests)}, {average:.2f} requests each, "
+                  f"{repeated} needed more than one")
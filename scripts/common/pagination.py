@@ -0,0 +1,202 @@
+"""
+Paginated Listing Discovery
+Phase 1 catalog crawls used to walk page/1, page/2, ... one request at a time until a page came back empty
+ListingCrawler finds the last page first - from the pagination widget on page 1, or by galloping /
+binary-search probes when there is no widget - then fetches every listing page concurrently through
+the FetchEngine. A widget's last page is trusted: nothing past it is requested, so a refresh of an
+unchanged listing costs no probe
+
+A page counts as past the end when it is missing, has no products beyond those already on page 1
+(sidebar / featured links), or repeats another page exactly - sites that clamp ?p=999 to the last page
+serve identical copies from the real last page onwards, so the first copy is kept as the last page
+
+stream() hands product URLs on as each page arrives, for the streaming pipeline: a page found past the end later
+only ever repeats URLs already handed on, so nothing has to be taken back
+"""
+
+import re
+import time
+from urllib.parse import urljoin, urlparse
+
+from .html_parser import make_soup
+
+DEFAULT_MAX_PAGES = 500
+_PAGE_MARKER = 987654321
+
+
+def _path_and_query(url):
+    parsed = urlparse(url)
+    path = parsed.path.rstrip('/') or '/'
+    return f"{path}?{parsed.query}" if parsed.query else path
+
+
+class ListingCrawler:
+    def __init__(self, fetch_engine, max_pages=DEFAULT_MAX_PAGES):
+        """
+        fetch_engine: FetchEngine serving listing pages (cache hits cost nothing)
+        max_pages: safety cap on pages per listing
+        """
+        self.fetch_engine = fetch_engine
+        self.max_pages = max_pages
+        self.stats = {'listings': 0, 'pages': 0, 'probes': 0, 'failed': 0}
+
+    def crawl(self, first_url, page_url, extract_urls, max_pages=None):
+        """
+        Product URLs of one paginated listing, in page order without duplicates
+        first_url: page 1
+        page_url: callable page number -> listing URL for pages 2 onwards
+        extract_urls: callable soup -> product URLs on one listing page
+        """
+        listing = _Listing(self, first_url, page_url, extract_urls, max_pages or self.max_pages)
+        for _ in self._walk(listing):
+            pass
+        urls = list(dict.fromkeys(url for n in sorted(listing.pages) if listing.has_products(n)
+                                  for url in listing.pages[n]))
+        if urls:
+            print(f"    Found {len(urls)} product URLs")
+        return urls
+
+    def stream(self, first_url, page_url, extract_urls, max_pages=None):
+        """crawl() as a generator: each product URL once, as soon as the page listing it has been fetched"""
+        listing = _Listing(self, first_url, page_url, extract_urls, max_pages or self.max_pages)
+        seen, read = set(), set()
+        for _ in self._walk(listing):
+            for n in [n for n in listing.pages if n not in read]:
+                read.add(n)
+                for url in listing.pages[n]:
+                    if url not in seen:
+                        seen.add(url)
+                        yield url
+        if seen:
+            print(f"    Found {len(seen)} product URLs")
+
+    def _walk(self, listing):
+        """Fetch a listing's pages, pausing (yielding) whenever new pages have loaded"""
+        start = time.time()
+        self.stats['listings'] += 1
+
+        if not listing.load(1, self.fetch_engine.fetch_one(listing.first_url)):
+            print(f"  {listing.first_url}: no products on page 1")
+            return
+        yield
+
+        last, source = 1, 'probing'
+        while True:
+            hint = min(max(listing.hints, default=0), listing.max_pages)
+            if hint > last:
+                source = 'pagination widget'
+            elif source == 'probing':
+                hint = listing.gallop(last)
+                yield
+                if hint <= last:
+                    break
+            else:
+                break     # no widget on the pages fetched links further
+            for _ in listing.fetch_range(2, hint):
+                yield
+            last = hint
+            if not listing.has_products(last):
+                break     # widget overstated the page count, or its last page failed
+        last = listing.last_page()
+        print(f"  Last page {last} (from {source}): {len(listing.pages)} pages fetched, "
+              f"{listing.probes} probes, {listing.failed} failed in {time.time() - start:.1f}s")
+
+
+class _Listing:
+    """Pages fetched so far for one crawl"""
+
+    def __init__(self, crawler, first_url, page_url, extract_urls, max_pages):
+        self.crawler = crawler
+        self.first_url = first_url
+        self.page_url = lambda n: first_url if n == 1 else page_url(n)
+        self.extract_urls = extract_urls
+        self.max_pages = max_pages
+        self.pages = {}           # page number -> product URLs
+        self.past_end = set()     # fetched pages with nothing new
+        self.copies = {}          # frozenset of product URLs -> pages serving exactly that set
+        self.hints = []           # last page numbers advertised by pagination widgets
+        self.probes = 0
+        self.failed = 0
+        template = _path_and_query(urljoin(first_url, page_url(_PAGE_MARKER)))
+        self.page_pattern = re.compile(re.escape(template).replace(str(_PAGE_MARKER), r'(\d+)'))
+
+    def widget_last_page(self, soup):
+        """Highest page number linked from the page's pagination widget"""
+        numbers = []
+        for link in soup.find_all('a', href=True):
+            match = self.page_pattern.fullmatch(_path_and_query(urljoin(self.first_url, link['href'])))
+            if match:
+                numbers.append(int(match.group(1)))
+        return max(numbers, default=0)
+
+    def load(self, n, html):
+        """Record page n's products; returns whether the page has any"""
+        self.crawler.stats['pages'] += 1
+        if not html:
+            self.failed += 1
+            self.crawler.stats['failed'] += 1
+            self.pages[n] = []
+            self.past_end.add(n)
+            return False
+        soup = make_soup(html)
+        self.hints.append(self.widget_last_page(soup))
+        self.pages[n] = urls = [urljoin(self.first_url, url) for url in self.extract_urls(soup)]
+        key = frozenset(urls)
+        if not urls or (n > 1 and key <= frozenset(self.pages[1])):
+            self.past_end.add(n)
+            return False
+        copies = self.copies.setdefault(key, [])
+        copies.append(n)
+        if len(copies) > 1:
+            self.past_end.update(copies)
+        return len(copies) == 1
+
+    def has_products(self, n):
+        return n in self.pages and n not in self.past_end
+
+    def last_page(self):
+        """Highest page with products, restoring the first copy of a clamped last page"""
+        clamped = [min(copies) for copies in self.copies.values() if len(copies) > 1]
+        if clamped:
+            self.past_end.discard(min(clamped))
+        return max((n for n in self.pages if self.has_products(n)), default=1)
+
+    def probe(self, n):
+        """
+        Fetch one page to locate the end of the listing (cached pages are not re-fetched)
+        A missing page is the answer being looked for, so it is not dead-lettered
+        """
+        if n not in self.pages:
+            self.probes += 1
+            self.crawler.stats['probes'] += 1
+            self.load(n, self.crawler.fetch_engine.fetch_one(self.page_url(n), missing_ok=True))
+        return self.has_products(n)
+
+    def gallop(self, last):
+        """Last page with products at or after `last`: probe last+1, +2, +4 ... then binary search the gap"""
+        lo, step, hi = last, 1, self.max_pages + 1
+        while lo + step < hi:
+            if not self.probe(lo + step):
+                hi = lo + step
+                break
+            lo += step
+            step *= 2
+        while True:
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if self.probe(mid):
+                    lo = mid
+                else:
+                    hi = mid
+            if lo <= last or self.has_products(lo):
+                return lo
+            # lo turned out to be a clamped copy of a later page; search again below it
+            hi = lo
+            lo = max(n for n in self.pages if n < hi and self.has_products(n))
+
+    def fetch_range(self, first, last):
+        """Fetch every page in first..last not fetched yet, concurrently, yielding each page number as it loads"""
+        numbers = {self.page_url(n): n for n in range(first, last + 1) if n not in self.pages}
+        for url, html in self.crawler.fetch_engine.fetch_all(list(numbers)):
+            self.load(numbers[url], html)
+            yield numbers[url]
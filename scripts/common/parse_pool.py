@@ -0,0 +1,131 @@
+"""
+Parse Pool
+BeautifulSoup parsing and the regex-heavy description mining hold the GIL, so however many pages the fetch engine
+brings in, threads extract them on one core. The parse pool runs apply_4_methods in worker processes instead: a
+worker receives a page's HTML as UTF-8 bytes and sends back the finished record dict, while every fetch stays on
+the engine's event loop in the scraper process
+
+Workers build each seed bank's scraper once, extraction-only, from the SEED_BANKS registry, so one pool can serve
+every site of an orchestrated run
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from .fetch_engine import IDLE
+from .seed_banks import SEED_BANKS
+
+PAGES_PER_WORKER = 2              # pages queued per worker process before the parse stage stops taking more
+
+_parsers = {}                     # worker process: seed bank key -> extraction-only scraper
+
+
+def _extract(key, url, html):
+    """Worker body: one page through its seed bank's 4 methods; an extraction error comes back as its message"""
+    try:
+        scraper = _parsers.get(key)
+        if scraper is None:
+            scraper = _parsers[key] = SEED_BANKS[key].load_class().parser()
+        return url, scraper.apply_4_methods(html.decode('utf-8'), url), None
+    except Exception as e:
+        return url, None, f"extraction failed: {e}"
+
+
+class ParsePool:
+    def __init__(self, workers, parent=None):
+        """
+        workers: extraction processes, started on first use
+        parent: shared pool whose processes this one uses (see adopt())
+        """
+        self.workers = workers
+        self.parent = parent
+        self.executor = None
+        self.lock = threading.Lock()
+        self.stats = {'pages': 0, 'bytes': 0, 'crashed': 0, 'restarts': 0}
+
+    @classmethod
+    def from_env(cls):
+        """Pool of SCRAPER_PARSE_WORKERS processes (one per core by default), or None to parse in a thread (0 or 1)"""
+        workers = int(os.environ.get('SCRAPER_PARSE_WORKERS', os.cpu_count() or 1))
+        return cls(workers) if workers > 1 else None
+
+    def adopt(self):
+        """Pool for one scraper of an orchestrated run: its own stats on this pool's processes, which it never closes"""
+        return ParsePool(self.workers, parent=self)
+
+    def _executor(self):
+        if self.parent is not None:
+            return self.parent._executor()
+        with self.lock:
+            if self.executor is None:
+                # spawn, not fork: the scraper process runs the fetch loop and storage threads, which fork would
+                # copy mid-lock
+                self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+            return self.executor
+
+    def _restart(self, broken):
+        """Replace an executor whose worker died, unless another scraper already did"""
+        if self.parent is not None:
+            return self.parent._restart(broken)
+        with self.lock:
+            if self.executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+                self.stats['restarts'] += 1
+
+    def _submit(self, key, url, data):
+        executor = self._executor()
+        try:
+            return executor.submit(_extract, key, url, data)
+        except BrokenProcessPool:
+            self._restart(executor)
+            return self._executor().submit(_extract, key, url, data)
+
+    def _result(self, future, pending_urls):
+        url = pending_urls.pop(future)
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            self.stats['crashed'] += 1
+            return url, None, f"extraction worker crashed: {e}"
+
+    def extract(self, key, pages):
+        """
+        (url, record, error) for each (url, html) page as its worker finishes
+        record is None when html is (error None) or when extraction failed or its worker died (error says which)
+        key: SEED_BANKS key of the scraper whose apply_4_methods extracts the pages
+        pages may yield IDLE (a streaming pipeline queue): finished records are handed on while it waits
+        """
+        window = self.workers * PAGES_PER_WORKER
+        pending = {}              # future -> url
+        for page in pages:
+            if page is not IDLE:
+                url, html = page
+                if not html:
+                    yield url, None, None
+                    continue
+                data = html.encode('utf-8')
+                pending[self._submit(key, url, data)] = url
+                self.stats['pages'] += 1
+                self.stats['bytes'] += len(data)
+            done, _ = wait(pending, timeout=None if len(pending) >= window else 0, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield self._result(future, pending)
+        for future in wait(pending).done:
+            yield self._result(future, pending)
+
+    def close(self):
+        """Stop the worker processes (an adopted pool leaves them to the shared one)"""
+        if self.parent is None and self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def print_stats(self):
+        """Print pages sent to the worker processes"""
+        print(f"\nPARSE POOL ({self.workers} processes):")
+        print(f"   Pages extracted: {self.stats['pages']} ({self.stats['bytes'] / 1e6:.1f} MB of HTML)")
+        if self.stats['crashed']:
+            print(f"   Lost to crashed workers: {self.stats['crashed']} ({self.stats['restarts']} pool restarts)")
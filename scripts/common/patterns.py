@@ -0,0 +1,200 @@
+"""
+Compiled Pattern Registry
+Description-mining regexes for every scraper, compiled once at import
+Each PatternSet only runs a field's regex when one of the literal keywords it starts with is present
+(case-insensitive sets lowercase the text once to look), so most patterns never touch most descriptions
+"""
+
+import re
+
+# A leading "(?:a|b|c)" / "(a|b|c)" group of plain words, or a leading run of plain characters
+_LEADING_GROUP = re.compile(r'\((?:\?:)?([A-Za-z0-9 &/-]+(?:\|[A-Za-z0-9 &/-]+)*)\)')
+_LEADING_LITERAL = re.compile(r'(?:[A-Za-z0-9 :<>/&-]|\\[.%$])+')
+_QUANTIFIERS = '?*+{'
+
+
+def _has_top_level_alternation(pattern):
+    depth = 0
+    in_class = escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+    return False
+
+
+def required_literals(pattern, ignore_case=True):
+    """
+    Keywords (lowercased when ignore_case) one of which must appear in any text the pattern matches,
+    or None when the pattern has no usable literal prefix (it then always runs)
+    """
+    if _has_top_level_alternation(pattern):
+        return None
+    group = _LEADING_GROUP.match(pattern)
+    if group:
+        if pattern[group.end():group.end() + 1] in tuple(_QUANTIFIERS):
+            return None
+        words = group.group(1).split('|')
+    else:
+        literal = _LEADING_LITERAL.match(pattern)
+        if not literal:
+            return None
+        text = literal.group(0)
+        # A quantifier after the run makes its last character optional
+        if pattern[literal.end():literal.end() + 1] in tuple(_QUANTIFIERS):
+            text = text[:-1]
+        words = [text.replace('\\', '')]
+    words = [word.lower() if ignore_case else word for word in words if word.strip()]
+    return words if words and all(len(word) >= 2 for word in words) else None
+
+
+class PatternSet:
+    def __init__(self, patterns, flags=re.IGNORECASE):
+        """
+        patterns: {field: pattern} or {field: [patterns in priority order]}
+        flags: applied to every pattern in the set
+        """
+        # Case-sensitive sets look for their keywords in the text as given
+        self.ignore_case = bool(flags & re.IGNORECASE)
+        self.fields = []
+        for field, field_patterns in patterns.items():
+            if isinstance(field_patterns, str):
+                field_patterns = [field_patterns]
+            compiled = [(re.compile(p, flags), required_literals(p, self.ignore_case)) for p in field_patterns]
+            self.fields.append((field, compiled))
+
+    def _candidates(self, text, text_lower):
+        if not self.ignore_case:
+            haystack = text
+        else:
+            haystack = text.lower() if text_lower is None else text_lower
+        for field, compiled in self.fields:
+            yield field, [regex for regex, keywords in compiled
+                          if keywords is None or any(keyword in haystack for keyword in keywords)]
+
+    def search(self, text, text_lower=None):
+        """{field: first re.Match} for each field, trying its patterns in priority order"""
+        results = {}
+        for field, regexes in self._candidates(text, text_lower):
+            for regex in regexes:
+                match = regex.search(text)
+                if match:
+                    results[field] = match
+                    break
+        return results
+
+    def extract(self, text, text_lower=None, group=1):
+        """{field: stripped capture group} for each field that matched"""
+        return {field: match.group(group).strip() for field, match in self.search(text, text_lower).items()}
+
+    def findall(self, text, text_lower=None):
+        """{field: all matches} using the field's first pattern that matches at all"""
+        results = {}
+        for field, regexes in self._candidates(text, text_lower):
+            for regex in regexes:
+                matches = regex.findall(text)
+                if matches:
+                    results[field] = matches
+                    break
+        return results
+
+
+# The Attitude Seed Bank - tabDesc description block (case-sensitive labels)
+ATTITUDE_DESCRIPTION = PatternSet({
+    'breeder_name': r'Cannabis Seeds by ([^\n]+?)(?:\s|$)',
+    'thc_content': r'THC:\s*(\d+%)',
+    'yield_indoor': r'Yield:\s*([\d\s-]+gr/m2)',
+    'height_indoor': r'Height:\s*([\d\s-]+cm)',
+    'cultivation_time': r'Total Cultivation:\s*([\d\s-]+days)',
+    'harvest_period': r'Harvest:\s*(From [^\n]+)',
+}, flags=0)
+ATTITUDE_HEIGHT_RANGE = re.compile(r'Height:\s*(\d+\s*-\s*\d+\s*cm)')
+
+GREAT_LAKES_NOTES = PatternSet({
+    'effects_pattern': r'(?:euphoric|creative|stoned|relaxing|uplifting|energetic|calming)[^.]*',
+    'aroma_pattern': r'(?:nose|aroma|smell)[^.]*?(?:spicy|hash|lemon|fuel|sweet|earthy|pine)[^.]*',
+    'structure_pattern': r'(?:structure|tree|bush|plant)[^.]*?(?:christmas|uniform|branching)[^.]*',
+    'resin_pattern': r'(?:resin|sticky|trichome)[^.]*?(?:production|impressive|coverage)[^.]*',
+})
+
+MEPHISTO_DESCRIPTION = PatternSet({
+    'genetics': r'(?:genetics|lineage|cross)[:\s]*([^.]+?)(?:\.|$)',
+    'indica_sativa': r'([0-9]+)%?\s*(?:indica|sativa)',
+    'breeding_notes': r'(?:bred|breeding|selection)[:\s]*([^.]+?)(?:\.|$)',
+    'awards': r'(?:award|cup|winner|champion)[:\s]*([^.]+?)(?:\.|$)',
+})
+
+MULTIVERSE_DESCRIPTION = PatternSet({
+    'thc_content': r'THC[:\s]*([0-9.-]+%?(?:\s*-\s*[0-9.-]+%?)?)',
+    'cbd_content': r'CBD[:\s]*([0-9.-]+%?(?:\s*-\s*[0-9.-]+%?)?)',
+    'flowering_time': r'(?:flowering|flower|harvest|ready)[:\s]*([0-9-]+\s*(?:days?|weeks?))',
+    'genetics': r'(?:genetics|cross|lineage)[:\s]*([^.]+?)(?:\.|$)',
+    'effects': r'effects?[:\s]*([^.]+?)(?:\.|$)',
+    'yield': r'yield[:\s]*([^.]+?)(?:\.|$)',
+    'height': r'(?:height|size)[:\s]*([^.]+?)(?:\.|$)',
+    'autoflower': r'(auto|autoflower|automatic)',
+    'mephisto': r'(mephisto|night owl|illuminauto)',
+    'limited': r'(limited|exclusive|drop|artisanal)',
+})
+
+NEPTUNE_DESCRIPTION = PatternSet({
+    'thc_content': r'THC[:\s]*([0-9.-]+%?(?:\s*-\s*[0-9.-]+%?)?)',
+    'cbd_content': r'CBD[:\s]*([0-9.-]+%?(?:\s*-\s*[0-9.-]+%?)?)',
+    'flowering_time': r'(?:flowering|flower|harvest)[:\s]*([0-9-]+\s*(?:days?|weeks?))',
+    'genetics': r'(?:genetics|cross|lineage)[:\s]*([^.]+?)(?:\.|$)',
+    'effects': r'effects?[:\s]*([^.]+?)(?:\.|$)',
+    'breeder_name': r'by\s+([A-Za-z\s&]+?)(?:\s|$|\.)',
+})
+
+NORTH_ATLANTIC_DESCRIPTION = PatternSet({
+    'thc_content': r'THC[:\s]*([0-9.-]+%?(?:\s*-\s*[0-9.-]+%?)?)',
+    'cbd_content': r'CBD[:\s]*([0-9.-]+%?(?:\s*-\s*[0-9.-]+%?)?)',
+    'flowering_time': r'(?:flowering|flower|harvest)[:\s]*([0-9-]+\s*(?:days?|weeks?))',
+    'genetics': r'(?:genetics|cross|lineage)[:\s]*([^.]+?)(?:\.|$)',
+    'effects': r'effects?[:\s]*([^.]+?)(?:\.|$)',
+    'yield': r'yield[:\s]*([^.]+?)(?:\.|$)',
+    'height': r'height[:\s]*([^.]+?)(?:\.|$)',
+})
+
+ROYAL_QUEEN_DESCRIPTION = PatternSet({
+    'genetics': r'(?:genetics|lineage|cross|bred from)[:\s]*([^.]+?)(?:\.|$)',
+    'indica_sativa': r'([0-9]+)%?\s*(?:indica|sativa)',
+    'flowering_pattern': r'(?:flower|bloom)[s]?\s+(?:in|for|after)\s+([^.]+?)(?:\.|$)',
+    'yield_pattern': r'(?:yield|produce)[s]?\s+(?:up to|around|about)?\s*([^.]+?)(?:\.|$)',
+})
+
+SEED_SUPREME_DESCRIPTION = PatternSet({
+    'thc_range_detailed': r'THC[:\s]*([0-9.-]+%?\s*-\s*[0-9.-]+%?)',
+    'cbd_range_detailed': r'CBD[:\s]*([0-9.-]+%?\s*-\s*[0-9.-]+%?)',
+    'flowering_weeks': r'(?:flowering|flower)[:\s]*([0-9-]+\s*weeks?)',
+    'strain_effects_detailed': r'effects?[:\s]*([^.]+)',
+    'terpene_profile_detailed': r'terpenes?[:\s]*([^.]+)',
+    'flavor_notes_detailed': r'flavou?rs?[:\s]*([^.]+)',
+    'genetics_lineage': r'(?:genetics|cross|lineage)[:\s]*([^.]+)',
+    'breeder_attribution': r'(?:by|from|bred by)[:\s]*([A-Za-z\s&]+?)(?:\s|$|\.)',
+})
+
+SEEDSMAN_DESCRIPTION = PatternSet({
+    'genetics_pattern': r'(?:genetics|lineage|cross|bred from)[:\s]*([^.]+?)(?:\.|$)',
+    'effects_pattern': r'(?:effect|high|buzz)[s]?[:\s]*([^.]+?)(?:\.|$)',
+    'flavor_pattern': r'(?:flavor|taste|aroma)[s]?[:\s]*([^.]+?)(?:\.|$)',
+    'cultivation_pattern': r'(?:grow|cultivat|flower)[^.]*?(?:indoor|outdoor|climate)[^.]*',
+})
+
+SEEDS_HERE_NOW_DESCRIPTION = PatternSet({
+    'genetics_pattern': r'(?:genetics|lineage|cross|bred from)[:\s]*([^.]+?)(?:\.|$)',
+    'breeder_pattern': r'(?:breeder|bred by|genetics by)[:\s]*([^.]+?)(?:\.|$)',
+    'flowering_pattern': r'(?:flower|bloom)[s]?\s+(?:in|for|after)\s+([^.]+?)(?:\.|$)',
+    'yield_pattern': r'(?:yield|produce)[s]?\s+(?:up to|around|about)?\s*([^.]+?)(?:\.|$)',
+})
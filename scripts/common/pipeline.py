@@ -0,0 +1,149 @@
+"""
+Streaming Pipeline
+Phase 2 used to wait for Phase 1 to read every listing page before fetching its first product. The pipeline runs
+discovery, fetching, parsing and storage as generator stages on their own threads, joined by bounded queues:
+products are fetched as soon as the first listing page yields URLs, and a full queue blocks the stage feeding it,
+so a fast stage waits for a slow one instead of piling URLs, pages or records up in memory
+
+    pipeline = Pipeline()
+    pipeline.add('discover', lambda _: self.discover_strain_urls())
+    pipeline.add('fetch', lambda urls: self.fetch_engine.fetch_all(urls, phase='product'), idle=True)
+    pipeline.add('parse', self.parse_pages)
+    pipeline.add('store', self.store_records)
+    pipeline.run()
+
+Every stage but the last is a generator taking the previous stage's items (None for the first) and yielding its
+own; the last one consumes its items on the calling thread. Stage threads run in a copy of the caller's context,
+so the orchestrator's per-site output routing follows them
+"""
+
+import contextvars
+import os
+import queue
+import threading
+import time
+
+from .fetch_engine import IDLE
+
+DEFAULT_QUEUE_SIZE = 64           # items waiting between two stages
+POLL_INTERVAL = 0.1               # seconds between checks for a stopped pipeline or an idle source
+_END = object()
+
+
+def use_streaming():
+    """False with SCRAPER_PIPELINE=batch: Phase 1 collects every URL (new ones first) before Phase 2 starts"""
+    return os.environ.get('SCRAPER_PIPELINE', 'stream').strip().lower() != 'batch'
+
+
+class StageQueue:
+    """Bounded hand-off between two stages, timing how long each side waited for the other"""
+
+    def __init__(self, maxsize, stopped):
+        self.queue = queue.Queue(maxsize)
+        self.stopped = stopped
+        self.stats = {'items': 0, 'peak': 0, 'blocked': 0.0, 'starved': 0.0}
+
+    def put(self, item):
+        """Queue item, blocking while the queue is full; False once the pipeline has stopped"""
+        start = time.monotonic()
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=POLL_INTERVAL)
+            except queue.Full:
+                continue
+            if item is not _END:
+                self.stats['blocked'] += time.monotonic() - start
+                self.stats['peak'] = max(self.stats['peak'], self.queue.qsize())
+            return True
+        return False
+
+    def close(self):
+        self.put(_END)
+
+    def items(self, idle=False):
+        """
+        Queued items until the producer closes the queue
+        idle: yield IDLE whenever POLL_INTERVAL passes without an item, for consumers that must keep working
+        """
+        start = time.monotonic()
+        while not self.stopped.is_set():
+            try:
+                item = self.queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                if idle:
+                    self.stats['starved'] += time.monotonic() - start
+                    yield IDLE
+                    start = time.monotonic()
+                continue
+            self.stats['starved'] += time.monotonic() - start
+            if item is _END:
+                return
+            self.stats['items'] += 1
+            yield item
+            start = time.monotonic()
+
+
+class Pipeline:
+    def __init__(self, queue_size=None):
+        """queue_size: items allowed between two stages, SCRAPER_PIPELINE_QUEUE or DEFAULT_QUEUE_SIZE by default"""
+        self.queue_size = queue_size or int(os.environ.get('SCRAPER_PIPELINE_QUEUE', DEFAULT_QUEUE_SIZE))
+        self.stages = []          # (name, function, idle)
+        self.queues = []          # StageQueue after each stage but the last
+        self.stopped = threading.Event()
+        self.errors = []
+
+    def add(self, name, function, idle=False):
+        """
+        Append a stage
+        function: previous stage's items (None for the first stage) -> this stage's items
+        idle: the stage's input yields IDLE while nothing is queued (FetchEngine.fetch_all keeps yielding pages)
+        """
+        self.stages.append((name, function, idle))
+
+    def _run_stage(self, function, items, outbound):
+        results = None
+        try:
+            results = function(items)
+            for item in results:
+                if not outbound.put(item):
+                    break
+        except BaseException as e:
+            self.errors.append(e)
+            self.stopped.set()
+        finally:
+            if hasattr(results, 'close'):
+                results.close()   # a stopped generator releases its resources (fetch_all cancels its futures)
+            outbound.close()
+
+    def run(self):
+        """Run every stage to completion; returns the last stage's result, or re-raises the first stage error"""
+        threads = []
+        items = None
+        for name, function, idle in self.stages[:-1]:
+            outbound = StageQueue(self.queue_size, self.stopped)
+            thread = threading.Thread(target=contextvars.copy_context().run,
+                                      args=(self._run_stage, function, items, outbound),
+                                      name=f'pipeline-{name}', daemon=True)
+            thread.start()
+            threads.append(thread)
+            self.queues.append(outbound)
+            items = outbound.items(self.stages[len(threads)][2])
+        try:
+            result = self.stages[-1][1](items)
+        except BaseException:
+            self.stopped.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+        if self.errors:
+            raise self.errors[0]
+        return result
+
+    def print_stats(self):
+        """Print items passed between stages and how long producers were held back or consumers kept waiting"""
+        print(f"\nPIPELINE ({' -> '.join(name for name, _, _ in self.stages)}, queues of {self.queue_size}):")
+        for (name, _, _), (consumer, _, _), stage_queue in zip(self.stages, self.stages[1:], self.queues):
+            stats = stage_queue.stats
+            print(f"   {name} -> {consumer}: {stats['items']} items, peak {stats['peak']} queued, "
+                  f"{name} blocked {stats['blocked']:.1f}s, {consumer} waited {stats['starved']:.1f}s")
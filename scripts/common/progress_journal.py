@@ -0,0 +1,206 @@
+"""
+Phase 2 Progress Journal
+Append-only JSONL log of every product URL's state for one seed bank run, so a scraper that
+dies at item 7,000 restarts at item 7,001 instead of re-fetching and re-extracting the first 7,000
+
+States: pending -> fetched -> extracted -> stored, or skipped (below the quality bar) / failed
+A restarted run skips URLs that reached stored or skipped and retries everything else
+Skips and failures after the fetch go to the dead-letter store too; a stored URL leaves it
+"""
+
+import json
+import os
+import threading
+import time
+
+from .dead_letter import DeadLetterStore
+
+DEFAULT_JOURNAL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                   '.cache', 'journal')
+STATES = ('pending', 'fetched', 'extracted', 'stored', 'skipped', 'failed')
+DONE_STATES = ('stored', 'skipped')
+UNFINISHED_STATES = ('pending', 'fetched', 'extracted')
+FSYNC_EVERY = 100                 # journal lines between fsyncs
+FAILED_STAGES = {'fetched': 'extract', 'extracted': 'storage'}   # state before 'failed' -> dead-letter stage
+
+
+def record_url(item):
+    """Product URL a strain record came from"""
+    return item.get('source_url') or item.get('url')
+
+
+class ProgressJournal:
+    def __init__(self, path, dead_letters=None):
+        """
+        path: JSONL journal file; existing lines are replayed so the run continues where it stopped
+        dead_letters: DeadLetterStore mirroring skips and post-fetch failures (fetch failures come from the engine)
+        """
+        self.path = path
+        self.dead_letters = dead_letters
+        self.states = {}
+        self.errors = {}
+        self.completed = False
+        self.lock = threading.Lock()
+        self._unsynced = 0
+        if os.path.exists(path):
+            self._replay()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file = open(path, 'a', encoding='utf-8')
+        if self.file.tell() and not self._ends_with_newline():
+            self.file.write('\n')            # terminate a torn line so the next entry starts clean
+        self.resumed = bool(self.states)
+
+    @classmethod
+    def open(cls, seed_bank, directory=None, resume=None):
+        """
+        Journal for a seed bank's latest unfinished run, or a new run
+        SCRAPER_JOURNAL_DIR overrides the directory; SCRAPER_RESUME=0 always starts a new run
+        """
+        directory = os.path.join(directory or os.environ.get('SCRAPER_JOURNAL_DIR', DEFAULT_JOURNAL_DIR), seed_bank)
+        if resume is None:
+            resume = os.environ.get('SCRAPER_RESUME', '1').lower() not in ('0', 'false', 'no', 'off')
+        if resume and os.path.isdir(directory):
+            runs = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.jsonl')]
+            if runs:
+                journal = cls(max(runs, key=os.path.getmtime), DeadLetterStore.from_env())
+                if not journal.completed:
+                    return journal
+                journal.close()
+        run_id = time.strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(directory, f'{run_id}.jsonl')
+        suffix = 1
+        while os.path.exists(path):
+            suffix += 1
+            path = os.path.join(directory, f'{run_id}-{suffix}.jsonl')
+        return cls(path, DeadLetterStore.from_env())
+
+    def _replay(self):
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue      # torn final line from a crash mid-write
+                if entry.get('run') == 'complete':
+                    self.completed = True
+                elif entry.get('url'):
+                    self.states[entry['url']] = entry['state']
+                    if entry.get('error'):
+                        self.errors[entry['url']] = entry['error']
+
+    def _ends_with_newline(self):
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def _write(self, entries):
+        with self.lock:
+            for entry in entries:
+                self.file.write(json.dumps(entry) + '\n')
+            self.file.flush()
+            self._unsynced += len(entries)
+            if self._unsynced >= FSYNC_EVERY:
+                os.fsync(self.file.fileno())
+                self._unsynced = 0
+
+    def plan(self, urls):
+        """Record new URLs as pending and return the ones this run still has to process, in order"""
+        new = [url for url in dict.fromkeys(urls) if url not in self.states]
+        now = time.time()
+        self._write([{'url': url, 'state': 'pending', 't': now} for url in new])
+        for url in new:
+            self.states[url] = 'pending'
+        remaining = [url for url in dict.fromkeys(urls) if self.states[url] not in DONE_STATES]
+        if self.resumed:
+            print(f"Resuming {self.path}: {len(urls) - len(remaining)} of {len(urls)} URLs already done")
+        return remaining
+
+    def stream(self, urls):
+        """plan() as a generator for the streaming pipeline: each URL recorded and handed on as it arrives"""
+        total = done = 0
+        for url in urls:
+            total += 1
+            if url not in self.states:
+                self._write([{'url': url, 'state': 'pending', 't': time.time()}])
+                self.states[url] = 'pending'
+            if self.states[url] in DONE_STATES:
+                done += 1
+                continue
+            yield url
+        if self.resumed:
+            print(f"Resuming {self.path}: {done} of {total} URLs already done")
+
+    def mark(self, url, state, error=None):
+        if state not in STATES:
+            raise ValueError(f"Unknown journal state: {state}")
+        entry = {'url': url, 'state': state, 't': time.time()}
+        if error:
+            entry['error'] = str(error)[:500]
+            self.errors[url] = entry['error']
+        previous = self.states.get(url)
+        self._write([entry])
+        self.states[url] = state
+        if self.dead_letters is not None:
+            self._dead_letter(url, previous, state, error)
+
+    def _dead_letter(self, url, previous, state, error):
+        if state == 'stored':
+            self.dead_letters.resolve(url)
+        elif state == 'skipped':
+            self.dead_letters.add(url, 'low_quality', error or 'below the quality bar')
+        elif state == 'failed' and previous in FAILED_STAGES:
+            self.dead_letters.add(url, FAILED_STAGES[previous], error or 'failed')
+
+    def attach(self, sink):
+        """Mark records stored / failed when the storage sink confirms them, not when they are queued"""
+        sink.on_written = lambda items: self._mark_items(items, 'stored')
+        sink.on_failed = lambda items, error: self._mark_items(items, 'failed', error)
+
+    def _mark_items(self, items, state, error=None):
+        for item in items:
+            url = record_url(item)
+            if url:
+                self.mark(url, state, error)
+
+    def complete(self):
+        """Mark the run finished so the next start begins a new run"""
+        self._write([{'run': 'complete', 't': time.time()}])
+        self.completed = True
+
+    def finish(self, budget=None):
+        """
+        complete() the run unless it stopped short, so the next start resumes it instead; returns whether it did
+        A run stops short while URLs are still pending, fetched or extracted, or when budget (RequestBudget) ran out
+        """
+        counts = self.counts()
+        unfinished = sum(counts[state] for state in UNFINISHED_STATES)
+        exhausted = budget is not None and budget.exhausted
+        if unfinished or exhausted:
+            reasons = [f"{unfinished} URLs unfinished"] if unfinished else []
+            if exhausted:
+                reasons.append("request budget spent")
+            print(f"Run left open for the next start to resume ({', '.join(reasons)}): {self.path}")
+            return False
+        self.complete()
+        return True
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.file.close()
+
+    def counts(self):
+        counts = dict.fromkeys(STATES, 0)
+        with self.lock:
+            states = list(self.states.values())
+        for state in states:
+            counts[state] += 1
+        return counts
+
+    def print_stats(self):
+        """Print per-state URL counts"""
+        counts = self.counts()
+        print(f"\nPROGRESS JOURNAL ({self.path}):")
+        print("   " + ', '.join(f"{state.title()}: {counts[state]}" for state in STATES))
@@ -0,0 +1,130 @@
+"""
+Per-Domain Token Bucket Rate Limiter
+Replaces the fixed time.sleep() calls between requests: a request only waits
+when its seed bank has actually used up its budget, so time spent inside a slow
+20-second fetch already counts towards the politeness delay
+"""
+
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+# (requests per second, burst) per seed bank, matching the old fixed sleeps
+DOMAIN_RATES = {
+    'cannabis-seeds-bank.co.uk': (0.5, 1),   # The Attitude Seed Bank (2-3s sleeps)
+    'seedsupreme.com': (0.5, 2),             # Seed Supreme (2s sleeps)
+    'seedsman.com': (0.5, 2),                # Seedsman (2s sleeps)
+    'dutch-passion.us': (0.5, 2),            # Dutch Passion (2s sleeps)
+    'neptuneseedbank.com': (1.0, 2),         # Neptune Seed Bank (1s sleeps)
+    'northatlanticseed.com': (1.0, 2),       # North Atlantic Seed Company (1s sleeps)
+    'multiversebeans.com': (1.0, 2),         # Multiverse Beans (1s sleeps)
+    'mephistogenetics.com': (1.0, 2),        # Mephisto Genetics (1s sleeps)
+    'royalqueenseeds.com': (1.0, 2),         # Royal Queen Seeds (1s sleeps)
+    'seedsherenow.com': (1.0, 2),            # Seeds Here Now (1s sleeps)
+    'greatlakesgenetics.com': (1.0, 2),      # Great Lakes Genetics (1s sleeps)
+}
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 2
+
+
+def domain_of(url, known_domains=DOMAIN_RATES):
+    """Seed bank domain for a URL (www. and other subdomains folded onto known domains)"""
+    host = (urlparse(url).hostname or '').lower()
+    for domain in known_domains:
+        if host == domain or host.endswith('.' + domain):
+            return domain
+    return host[4:] if host.startswith('www.') else host
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take one token and return how long the caller must wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            # Negative balance reserves a future slot for this caller
+            return -self.tokens / self.rate
+
+    def pause(self, seconds):
+        """Push every future reservation back by at least seconds"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+class DomainRateLimiter:
+    def __init__(self, rates=None, default_rate=DEFAULT_RATE, default_burst=DEFAULT_BURST):
+        """
+        rates: {domain: (requests_per_second, burst)}, defaults to DOMAIN_RATES
+        default_rate / default_burst: used for domains without an entry
+        """
+        self.rates = dict(DOMAIN_RATES if rates is None else rates)
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.buckets = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def _bucket(self, domain):
+        with self.lock:
+            bucket = self.buckets.get(domain)
+            if bucket is None:
+                rate, burst = self.rates.get(domain, (self.default_rate, self.default_burst))
+                bucket = self.buckets[domain] = TokenBucket(rate, burst)
+                self.stats[domain] = {'requests': 0, 'throttled': 0, 'throttled_seconds': 0.0, 'paused': 0}
+            return bucket
+
+    def _reserve(self, url):
+        domain = domain_of(url, self.rates)
+        delay = self._bucket(domain).reserve()
+        with self.lock:
+            domain_stats = self.stats[domain]
+            domain_stats['requests'] += 1
+            if delay > 0:
+                domain_stats['throttled'] += 1
+                domain_stats['throttled_seconds'] += delay
+        return delay
+
+    def acquire(self, url):
+        """Block until a request to url's domain is allowed"""
+        delay = self._reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, url):
+        """Await until a request to url's domain is allowed"""
+        delay = self._reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, url, seconds):
+        """Hold back every request to url's domain for seconds (a 429 applies to the whole site, not one page)"""
+        domain = domain_of(url, self.rates)
+        self._bucket(domain).pause(seconds)
+        with self.lock:
+            self.stats[domain]['paused'] += 1
+
+    def total_throttled_seconds(self):
+        return sum(s['throttled_seconds'] for s in self.stats.values())
+
+    def print_stats(self):
+        """Print per-domain throttling statistics"""
+        print(f"\nRATE LIMITER:")
+        for domain, s in sorted(self.stats.items()):
+            paused = f", paused {s['paused']}x after 429s" if s['paused'] else ''
+            print(f"   {domain}: {s['requests']} requests, {s['throttled']} throttled ({s['throttled_seconds']:.1f}s waiting)"
+                  f"{paused}")
@@ -0,0 +1,200 @@
+"""
+Incremental Recrawl Index
+Per-URL validators kept between runs so a routine refresh only refetches and rewrites strains that changed:
+
+    sitemap lastmod   same as when the record was last stored -> the page is not fetched at all
+    record hash       extracted record identical to the stored one -> the write is skipped
+
+The created_at first stored for a URL is carried over to rewritten records instead of being reset every run
+Validators are always recorded; pages are only skipped with SCRAPER_INCREMENTAL=1, unchanged records are
+never rewritten unless SCRAPER_SKIP_UNCHANGED=0
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from .fingerprint import fingerprint, stamp
+from .progress_journal import record_url
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                  '.cache', 'recrawl.sqlite')
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS validators (
+    seed_bank TEXT NOT NULL,
+    url TEXT NOT NULL,
+    lastmod TEXT,
+    record_hash TEXT,
+    created_at TEXT,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (seed_bank, url)
+);
+"""
+
+
+class RecrawlIndex:
+    def __init__(self, seed_bank, path=DEFAULT_INDEX_PATH, incremental=False, skip_unchanged=True):
+        """
+        seed_bank: key separating this scraper's URLs in the shared index
+        path: SQLite file holding validators for every seed bank
+        incremental: skip pages whose sitemap lastmod is unchanged (validators are recorded either way)
+        skip_unchanged: skip writing records identical to the stored version
+        """
+        self.seed_bank = seed_bank
+        self.path = path
+        self.incremental = incremental
+        self.skip_unchanged = skip_unchanged
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.rows = {
+            url: {'lastmod': lastmod, 'record_hash': digest, 'created_at': created_at}
+            for url, lastmod, digest, created_at in self.conn.execute(
+                "SELECT url, lastmod, record_hash, created_at FROM validators WHERE seed_bank = ?", (seed_bank,))
+        }
+        self.lastmod = {}         # this run's sitemap lastmod per URL
+        self.stats = {'known': len(self.rows), 'unchanged_pages': 0, 'unchanged_records': 0, 'recorded': 0}
+
+    @classmethod
+    def open(cls, seed_bank, path=None, incremental=None):
+        """
+        Index configured from the environment
+        SCRAPER_INCREMENTAL=1 skips unchanged pages, SCRAPER_SKIP_UNCHANGED=0 rewrites every record
+        (e.g. after restoring the table), SCRAPER_RECRAWL_PATH moves the index file
+        """
+        if incremental is None:
+            incremental = os.environ.get('SCRAPER_INCREMENTAL', '0').lower() in ('1', 'true', 'yes', 'on')
+        skip_unchanged = os.environ.get('SCRAPER_SKIP_UNCHANGED', '1').lower() not in ('0', 'false', 'no', 'off')
+        return cls(seed_bank, path or os.environ.get('SCRAPER_RECRAWL_PATH', DEFAULT_INDEX_PATH),
+                   incremental, skip_unchanged)
+
+    def plan(self, urls, lastmod=None):
+        """
+        URLs still worth fetching, in order
+        lastmod: {url: sitemap lastmod} from Phase 1; a URL whose lastmod matches its stored record is dropped
+        """
+        if lastmod:
+            self.lastmod.update(lastmod)
+        if not self.incremental:
+            return list(urls)
+        remaining = [url for url in urls if not self._unchanged_page(url)]
+        print(f"Incremental: {self.stats['unchanged_pages']} strains unchanged since their last sitemap lastmod, "
+              f"{len(remaining)} to fetch")
+        return remaining
+
+    def stream(self, urls, lastmod=None):
+        """
+        plan() as a generator for the streaming pipeline
+        lastmod: {url: sitemap lastmod} that Phase 1 is still filling; each URL's entry is read as the URL arrives
+        """
+        fetched = 0
+        for url in urls:
+            if lastmod and url in lastmod:
+                self.lastmod[url] = lastmod[url]
+            if self.incremental and self._unchanged_page(url):
+                continue
+            fetched += 1
+            yield url
+        if self.incremental:
+            print(f"Incremental: {self.stats['unchanged_pages']} strains unchanged since their last sitemap lastmod, "
+                  f"{fetched} to fetch")
+
+    def _unchanged_page(self, url):
+        """True (and counted) when url's sitemap lastmod matches the one its stored record was fetched at"""
+        row = self.rows.get(url)
+        if row and row['record_hash'] and row['lastmod'] and row['lastmod'] == self.lastmod.get(url):
+            self.stats['unchanged_pages'] += 1
+            return True
+        return False
+
+    def unchanged(self, item):
+        """
+        True when item's fingerprint matches the record last stored for its URL (unless skip_unchanged is off)
+        Also carries the first stored created_at over to the item
+        """
+        row = self.rows.get(record_url(item))
+        if row is None:
+            return False
+        if row['created_at'] and 'created_at' in item:
+            item['created_at'] = row['created_at']
+        return self.skip_unchanged and row['record_hash'] == item.get('content_hash')
+
+    def record(self, items):
+        """Remember validators of records the sink confirmed (or that were already stored unchanged)"""
+        rows = []
+        now = time.time()
+        for item in items:
+            url = record_url(item)
+            if not url:
+                continue
+            previous = self.rows.get(url) or {}
+            row = {
+                'lastmod': self.lastmod.get(url) or previous.get('lastmod'),
+                'record_hash': item.get('content_hash') or fingerprint(item),
+                'created_at': previous.get('created_at') or item.get('created_at'),
+            }
+            rows.append((self.seed_bank, url, row['lastmod'], row['record_hash'], row['created_at'], now))
+            self.rows[url] = row
+        if not rows:
+            return
+        with self.lock:
+            with self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO validators VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.stats['recorded'] += len(rows)
+
+    def wrap(self, sink):
+        """Storage sink that skips unchanged records and records validators of written ones"""
+        return IncrementalSink(sink, self)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def print_stats(self):
+        """Print recrawl statistics"""
+        mode = 'incremental' if self.incremental else 'full (SCRAPER_INCREMENTAL=1 to skip unchanged pages)'
+        print(f"\nRECRAWL INDEX ({mode}):")
+        print(f"   Known URLs: {self.stats['known']}")
+        print(f"   Unchanged pages not fetched: {self.stats['unchanged_pages']}")
+        if self.skip_unchanged:
+            print(f"   Unchanged records not rewritten: {self.stats['unchanged_records']}")
+        else:
+            print("   Unchanged records: rewritten (SCRAPER_SKIP_UNCHANGED=0)")
+        print(f"   Validators recorded: {self.stats['recorded']}")
+
+
+class IncrementalSink:
+    """
+    Wraps a storage sink; everything but put() and the write callbacks passes straight through
+    Every record is stamped with its content_hash before the comparison, so the fingerprint is stored with it
+    """
+
+    def __init__(self, sink, index):
+        self.sink = sink
+        self.index = index
+        self.on_written = None
+        self.on_failed = None
+        sink.on_written = self._written
+        sink.on_failed = self._failed
+
+    def __getattr__(self, name):
+        return getattr(self.sink, name)
+
+    def put(self, item):
+        stamp(item)
+        if self.index.unchanged(item):
+            self.index.stats['unchanged_records'] += 1
+            self._written([item])
+            return
+        self.sink.put(item)
+
+    def _written(self, items):
+        self.index.record(items)
+        if self.on_written:
+            self.on_written(items)
+
+    def _failed(self, items, error):
+        if self.on_failed:
+            self.on_failed(items, error)
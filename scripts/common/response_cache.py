@@ -0,0 +1,188 @@
+"""
+Persistent HTML Response Cache
+Content-addressed local cache consulted before any BrightData request
+zlib-compressed page blobs keyed by content hash, plus a SQLite index of URL -> blob
+Re-running a scraper after a parser fix re-extracts from disk instead of re-downloading
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                  '.cache', 'responses.sqlite')
+DEFAULT_TTL = 7 * 24 * 3600           # pages older than a week are re-fetched
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3     # compressed blob budget before LRU eviction
+EVICT_EVERY = 200                     # puts between size checks
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access);
+CREATE INDEX IF NOT EXISTS pages_content_hash ON pages (content_hash);
+"""
+
+
+def content_hash(html):
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        path: SQLite file holding the URL index and compressed blobs
+        ttl: max age in seconds before a cached page counts as stale (float('inf') = never)
+        max_bytes: compressed size budget; least recently used pages are evicted beyond it
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        # One connection shared by fetch threads and the engine's event loop thread
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self._puts_since_evict = 0
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'stored': 0, 'evicted': 0}
+
+    @classmethod
+    def from_env(cls, ttl=None):
+        """
+        Cache configured from the environment, or None when SCRAPER_CACHE=off
+        SCRAPER_CACHE_PATH, SCRAPER_CACHE_TTL_HOURS ('inf' to never expire), SCRAPER_CACHE_MAX_MB
+        ttl: overrides the environment TTL (offline re-extraction accepts pages of any age)
+        """
+        if os.environ.get('SCRAPER_CACHE', 'on').lower() in ('off', '0', 'false', 'no'):
+            return None
+        ttl_hours = os.environ.get('SCRAPER_CACHE_TTL_HOURS')
+        max_mb = os.environ.get('SCRAPER_CACHE_MAX_MB')
+        return cls(
+            path=os.environ.get('SCRAPER_CACHE_PATH', DEFAULT_CACHE_PATH),
+            ttl=ttl if ttl is not None else float(ttl_hours) * 3600 if ttl_hours else DEFAULT_TTL,
+            max_bytes=int(float(max_mb) * 1024 ** 2) if max_mb else DEFAULT_MAX_BYTES,
+        )
+
+    def get(self, url, max_age=None, touch=True):
+        """
+        Cached HTML for url, or None when missing or older than max_age (defaults to ttl)
+        touch: refresh the page's LRU timestamp (read-only workers pass False to avoid write contention)
+        """
+        max_age = self.ttl if max_age is None else max_age
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT p.fetched_at, b.data FROM pages p JOIN blobs b ON b.content_hash = p.content_hash "
+                "WHERE p.url = ?", (url,)).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            fetched_at, data = row
+            if time.time() - fetched_at > max_age:
+                self.stats['stale'] += 1
+                return None
+            if touch:
+                self.conn.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), url))
+            self.stats['hits'] += 1
+        return zlib.decompress(data).decode('utf-8')
+
+    def put(self, url, html):
+        """Store a fetched page; identical bodies under different URLs share one blob"""
+        digest = content_hash(html)
+        now = time.time()
+        with self.lock:
+            exists = self.conn.execute("SELECT 1 FROM blobs WHERE content_hash = ?", (digest,)).fetchone()
+            previous = self.conn.execute("SELECT content_hash FROM pages WHERE url = ?", (url,)).fetchone()
+            self.conn.execute("BEGIN")
+            try:
+                if not exists:
+                    data = zlib.compress(html.encode('utf-8'), 6)
+                    self.conn.execute("INSERT INTO blobs (content_hash, data, size) VALUES (?, ?, ?)",
+                                      (digest, data, len(data)))
+                self.conn.execute(
+                    "INSERT INTO pages (url, content_hash, fetched_at, last_access) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(url) DO UPDATE SET content_hash = excluded.content_hash, "
+                    "fetched_at = excluded.fetched_at, last_access = excluded.last_access",
+                    (url, digest, now, now))
+                if previous and previous[0] != digest:
+                    # Page content changed: drop the old blob unless another URL still shares it
+                    self.conn.execute(
+                        "DELETE FROM blobs WHERE content_hash = ? AND NOT EXISTS "
+                        "(SELECT 1 FROM pages WHERE content_hash = ?)", (previous[0], previous[0]))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.stats['stored'] += 1
+            self._puts_since_evict += 1
+            if self._puts_since_evict >= EVICT_EVERY:
+                self._evict()
+        return digest
+
+    def _delete_orphan_blobs(self):
+        self.conn.execute("DELETE FROM blobs WHERE content_hash NOT IN (SELECT content_hash FROM pages)")
+
+    def _total_bytes(self):
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def _evict(self):
+        """Drop least recently used pages until the blob store fits max_bytes (caller holds lock)"""
+        self._puts_since_evict = 0
+        excess = self._total_bytes() - self.max_bytes
+        if excess <= 0:
+            return
+        freed = 0
+        victims = []
+        for url, size in self.conn.execute(
+                "SELECT p.url, b.size FROM pages p JOIN blobs b ON b.content_hash = p.content_hash "
+                "ORDER BY p.last_access"):
+            victims.append((url,))
+            freed += size
+            if freed >= excess:
+                break
+        self.conn.execute("BEGIN")
+        self.conn.executemany("DELETE FROM pages WHERE url = ?", victims)
+        self._delete_orphan_blobs()
+        self.conn.execute("COMMIT")
+        self.stats['evicted'] += len(victims)
+
+    def purge_expired(self, max_age=None):
+        """Delete every page older than max_age (defaults to ttl); returns the number removed"""
+        cutoff = time.time() - (self.ttl if max_age is None else max_age)
+        with self.lock:
+            self.conn.execute("BEGIN")
+            removed = self.conn.execute("DELETE FROM pages WHERE fetched_at < ?", (cutoff,)).rowcount
+            self._delete_orphan_blobs()
+            self.conn.execute("COMMIT")
+        return removed
+
+    def urls(self, prefix=''):
+        """Cached URLs, optionally limited to one site prefix (used for offline re-extraction)"""
+        with self.lock:
+            rows = self.conn.execute("SELECT url FROM pages WHERE url LIKE ? ESCAPE '\\' ORDER BY url",
+                                     (prefix.replace('%', r'\%').replace('_', r'\_') + '%',)).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def print_stats(self):
+        """Print cache hit/miss statistics"""
+        print(f"\nRESPONSE CACHE ({self.path}):")
+        print(f"   Hits: {self.stats['hits']}")
+        print(f"   Misses: {self.stats['misses']} (+{self.stats['stale']} stale)")
+        print(f"   Stored: {self.stats['stored']}, Evicted: {self.stats['evicted']}")
@@ -0,0 +1,123 @@
+"""
+Retry Policy
+Classifies failed fetches and decides whether and when to try again. The fetch engine puts a retryable page back
+behind the pages still queued instead of sleeping in a worker, and a 429 pauses the whole domain; pages that fail
+for good go to the dead-letter store for a later targeted replay
+
+    throttle    429                                  retried, domain paused for Retry-After or the backoff
+    block       401 / 403 / 407, unlocker errors     retried (the unlocker rotates the exit IP)
+    timeout     request timed out                    retried
+    server      5xx                                  retried
+    network     connection errors                    retried
+    not_found   404 / 410                            never retried
+    client      other 4xx                            never retried
+    empty       fetch returned no page, no reason    never retried
+
+Any other exception raised by a fetch is a bug rather than a transport failure: it is raised, not retried
+"""
+
+import os
+import random
+
+import requests
+
+try:
+    import aiohttp
+except ImportError:  # only the requests-based transport is in use
+    aiohttp = None
+
+RETRYABLE = ('throttle', 'block', 'timeout', 'server', 'network')
+UNANSWERED = ('timeout', 'network')     # no response from the unlocker, so not billed
+TRANSPORT_ERRORS = (OSError, requests.RequestException) + ((aiohttp.ClientError,) if aiohttp else ())
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 2.0
+DEFAULT_MAX_DELAY = 120.0
+
+
+class FetchFailure:
+    def __init__(self, kind, detail='', retry_after=None):
+        self.kind = kind
+        self.detail = detail
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self):
+        return self.kind in RETRYABLE
+
+    def __str__(self):
+        return f"{self.kind} ({self.detail})" if self.detail else self.kind
+
+
+def _retry_after(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_status(status, headers=None):
+    """FetchFailure for a non-200 HTTP status and its response headers"""
+    headers = {name.lower(): value for name, value in (headers or {}).items()}
+    unlocker_error = headers.get('x-brd-error') or headers.get('x-luminati-error')
+    detail = f"HTTP {status}" + (f", {unlocker_error}" if unlocker_error else '')
+    if status == 429:
+        return FetchFailure('throttle', detail, _retry_after(headers.get('retry-after')))
+    if status in (404, 410):
+        return FetchFailure('not_found', detail)
+    if status in (401, 403, 407) or unlocker_error:
+        return FetchFailure('block', detail)
+    if status >= 500:
+        return FetchFailure('server', detail)
+    return FetchFailure('client', detail)
+
+
+def classify_response(response):
+    """FetchFailure for a non-200 UnlockerResponse"""
+    return classify_status(response.status, response.headers)
+
+
+def classify_error(error):
+    """
+    FetchFailure for an exception raised by the fetch itself, or None when it is not a transport error
+    A requests HTTPError (raise_for_status) is classified by its status code
+    """
+    response = getattr(error, 'response', None)
+    if isinstance(error, requests.HTTPError) and response is not None:
+        return classify_status(response.status_code, response.headers)
+    detail = str(error) or type(error).__name__
+    if isinstance(error, (TimeoutError, requests.Timeout)):
+        return FetchFailure('timeout', detail)
+    if isinstance(error, TRANSPORT_ERRORS):
+        return FetchFailure('network', detail)
+    return None
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY):
+        """
+        max_attempts: attempts per page, including the first
+        base_delay: backoff before the second attempt, doubling for each further one (twice as long on a 429)
+        max_delay: backoff ceiling in seconds
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_env(cls):
+        """Policy from SCRAPER_MAX_ATTEMPTS and SCRAPER_RETRY_DELAY (base delay in seconds)"""
+        return cls(int(os.environ.get('SCRAPER_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)),
+                   float(os.environ.get('SCRAPER_RETRY_DELAY', DEFAULT_BASE_DELAY)))
+
+    def should_retry(self, failure, attempt):
+        return failure.retryable and attempt < self.max_attempts
+
+    def delay(self, failure, attempt):
+        """Seconds to wait after a failed attempt: exponential backoff with jitter, never less than Retry-After"""
+        backoff = self.base_delay * 2 ** (attempt - 1)
+        if failure.kind == 'throttle':
+            backoff *= 2
+        backoff = min(self.max_delay, backoff)
+        # Equal jitter: keeps at least half the backoff while spreading retries that failed together
+        return max(backoff / 2 + random.uniform(0, backoff / 2), failure.retry_after or 0)
@@ -0,0 +1,67 @@
+"""
+Batch Quality Scoring
+calculate_quality_score scores one record at a time as it is scraped, so changing a seed bank's FIELD_WEIGHTS used
+to mean re-running its scraper before the stored scores followed. BatchScorer re-scores a whole strain table at
+once: the records become a pandas frame with one column per weighted field, the "filled" test (a value with more
+than 2 characters once stripped, as calculate_quality_score checks it) becomes one boolean mask over that frame,
+every seed bank's weights become a row of a (seed banks x fields) matrix, and the points of every record come out
+of a single matrix product. Tiers are binned with np.digitize over the QUALITY_TIERS thresholds
+
+Records of seed banks without registered weights (Attitude, Dutch Passion) keep their stored score
+"""
+
+import numpy as np
+import pandas as pd
+
+from .four_method_scraper import QUALITY_TIERS
+from .seed_banks import SEED_BANKS
+
+THRESHOLDS = np.array(sorted(threshold for threshold, _ in QUALITY_TIERS), dtype=float)
+TIERS = np.array(['Minimal'] + [tier for _, tier in sorted(QUALITY_TIERS)])   # np.digitize bin -> tier
+
+
+class BatchScorer:
+    def __init__(self, weights):
+        """weights: {seed_bank as stored in records: {field: weight}}"""
+        self.seed_banks = list(weights)
+        self.fields = sorted({field for bank_weights in weights.values() for field in bank_weights})
+        self.matrix = np.array([[bank_weights.get(field, 0) for field in self.fields]
+                                for bank_weights in weights.values()], dtype=float)
+        self.totals = self.matrix.sum(axis=1)
+
+    @classmethod
+    def from_registry(cls):
+        """Scorer with the FIELD_WEIGHTS of every registered 4-method scraper, keyed by its SEED_BANK"""
+        weights = {}
+        for bank in SEED_BANKS.values():
+            scraper_class = bank.load_class()
+            if getattr(scraper_class, 'FIELD_WEIGHTS', None):
+                weights[scraper_class.SEED_BANK] = dict(scraper_class.FIELD_WEIGHTS)
+        return cls(weights)
+
+    def table(self, records):
+        """
+        Columnar strain table: seed_bank plus one column per weighted field, NaN where a record has no value
+        Columns stay object dtype: a float column would turn a stored 63 into '63.0' and change its length
+        """
+        return pd.DataFrame(list(records), columns=list(dict.fromkeys(['seed_bank'] + self.fields)), dtype=object)
+
+    def filled(self, table):
+        """(records x fields) boolean mask of the weighted fields each record fills with more than 2 characters"""
+        values = table[self.fields].to_numpy()
+        filled = pd.notna(values) & (values != False)     # falsy values (None, '', 0, False) never count
+        filled[filled] = [len(str(value).strip()) > 2 for value in values[filled]]
+        return filled
+
+    def score(self, table):
+        """
+        (scores, tiers, scored) arrays for a table()
+        scored is False for records whose seed bank has no weights; their score and tier are NaN and None
+        """
+        banks = pd.Index(self.seed_banks).get_indexer(table['seed_bank'])   # -1 for unregistered seed banks
+        scored = banks >= 0
+        points = self.filled(table).astype(float) @ self.matrix.T     # (records x seed banks)
+        rows = np.arange(len(table))
+        scores = np.where(scored, points[rows, banks] / self.totals[banks] * 100, np.nan).round(1)
+        tiers = np.where(scored, TIERS[np.digitize(np.nan_to_num(scores), THRESHOLDS)], None)
+        return scores, tiers, scored
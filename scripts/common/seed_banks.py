@@ -0,0 +1,97 @@
+"""
+Seed Bank Registry
+Where each seed bank's scraper lives and how to call its Phase 1 collection and 4-method extraction
+Scraper folders contain spaces, so modules are loaded from their file path rather than imported
+Every scraper class exposes run() for a complete scrape (used by the orchestrator)
+"""
+
+import importlib.util
+import os
+
+from .extraction_context import ExtractionContext
+from .html_parser import make_soup
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SeedBank:
+    def __init__(self, key, name, domain, script, class_name, collect, extract, extract_args='html_url'):
+        """
+        domain: site domain as reported by rate_limiter.domain_of()
+        script: path relative to scripts/
+        collect: Phase 1 method returning the product URL list
+        extract: method turning one product page into a strain record
+        extract_args: argument order of the extract method - 'html_url', 'url_html' or 'soup_url'
+        """
+        self.key = key
+        self.name = name
+        self.domain = domain
+        self.script = script
+        self.class_name = class_name
+        self.collect = collect
+        self.extract = extract
+        self.extract_args = extract_args
+
+    @property
+    def path(self):
+        return os.path.join(SCRIPTS_DIR, self.script)
+
+    def load_class(self):
+        """Import the scraper module from its file and return the scraper class"""
+        module_name = f"seed_bank_{self.key.replace('-', '_')}"
+        spec = importlib.util.spec_from_file_location(module_name, self.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return getattr(module, self.class_name)
+
+    def create_scraper(self, offline=False):
+        return self.load_class()(offline=offline)
+
+    def collect_urls(self, scraper):
+        return getattr(scraper, self.collect)()
+
+    def extract_record(self, scraper, url, html):
+        """Run the scraper's own extraction on one page, whatever its signature"""
+        extract = getattr(scraper, self.extract)
+        if self.extract_args == 'url_html':
+            return extract(url, html)
+        if self.extract_args == 'soup_url':
+            return extract(ExtractionContext(make_soup(html), url), url)
+        return extract(html, url)
+
+
+SEED_BANKS = {bank.key: bank for bank in [
+    SeedBank('attitude', 'The Attitude Seed Bank', 'cannabis-seeds-bank.co.uk',
+             'Attitude Seedbank/attitude_scraper.py',
+             'AttitudeScraper', 'collect_product_urls', 'extract_strain_data', 'soup_url'),
+    SeedBank('dutch-passion', 'Dutch Passion', 'dutch-passion.us',
+             'Dutch Passion/dutch_passion_enhanced_4method_scraper.py',
+             'DutchPassionScraper', 'collect_strain_urls', 'extract_strain_data', 'url_html'),
+    SeedBank('great-lakes', 'Great Lakes Genetics', 'greatlakesgenetics.com',
+             'Great Lakes Genetics/great_lakes_genetics_enhanced_4method_scraper.py',
+             'GreatLakesGeneticsEnhanced4MethodScraper', 'collect_strain_urls', 'apply_4_methods'),
+    SeedBank('mephisto', 'Mephisto Genetics', 'mephistogenetics.com',
+             'Mephisto Genetics/mephisto_enhanced_4method_scraper.py',
+             'MephistoEnhanced4MethodScraper', 'collect_strain_urls', 'apply_4_methods'),
+    SeedBank('multiverse', 'Multiverse Beans', 'multiversebeans.com',
+             'Multiverse Beans/multiverse_enhanced_4method_scraper.py',
+             'MultiverseEnhanced4MethodScraper', 'collect_strain_urls', 'apply_4_methods'),
+    SeedBank('neptune', 'Neptune Seed Bank', 'neptuneseedbank.com',
+             'Neptune Seed Bank/neptune_enhanced_4method_scraper.py',
+             'NeptuneEnhanced4MethodScraper', 'collect_strain_urls', 'apply_4_methods'),
+    SeedBank('north-atlantic', 'North Atlantic Seed Company', 'northatlanticseed.com',
+             'North Atlantic Seed Company/north_atlantic_enhanced_4method_scraper.py',
+             'NorthAtlanticEnhanced4MethodScraper', 'collect_strain_urls', 'apply_4_methods'),
+    SeedBank('royal-queen', 'Royal Queen Seeds', 'royalqueenseeds.com',
+             'Royal Queen Seeds/royal_queen_enhanced_4method_scraper.py',
+             'RoyalQueenEnhanced4MethodScraper', 'collect_strain_urls', 'apply_4_methods'),
+    SeedBank('seed-supreme', 'Seed Supreme', 'seedsupreme.com',
+             'Seed Supreme/seed_supreme_enhanced_scraper.py',
+             'SeedSupremeEnhancedScraper', 'collect_strain_urls', 'apply_4_methods'),
+    SeedBank('seeds-here-now', 'Seeds Here Now', 'seedsherenow.com',
+             'Seeds Here Now/seeds_here_now_enhanced_4method_scraper.py',
+             'SeedsHereNowEnhanced4MethodScraper', 'collect_strain_urls', 'apply_4_methods'),
+    SeedBank('seedsman', 'Seedsman', 'seedsman.com',
+             'Seedsman/seedsman_enhanced_4method_scraper.py',
+             'SeedsmanEnhanced4MethodScraper', 'collect_strain_urls', 'apply_4_methods'),
+]}
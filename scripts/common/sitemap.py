@@ -0,0 +1,104 @@
+"""
+Sitemap URL Discovery
+Alternative Phase 1 source: WooCommerce (Yoast), Shopify and Magento shops publish XML sitemaps listing every
+product with its lastmod, so a handful of sitemap requests replace hundreds of catalog page fetches
+
+Sitemaps are parsed with ElementTree.iterparse and every element is cleared once read, so no element tree
+is built next to the document; the document itself is in memory, as the fetch engine returns and caches
+whole pages. Sitemap indexes are followed (children fetched concurrently) and only matching product URLs
+are kept
+
+Enable with SCRAPER_URL_SOURCE=sitemap; scrapers fall back to listing pages when the sitemap yields nothing
+"""
+
+import io
+import os
+import xml.etree.ElementTree as ET
+from urllib.parse import urljoin
+
+URL_SOURCE_ENV = 'SCRAPER_URL_SOURCE'
+
+
+def use_sitemaps():
+    """True when SCRAPER_URL_SOURCE=sitemap selects sitemaps over listing pages for Phase 1"""
+    return os.environ.get(URL_SOURCE_ENV, 'listing').strip().lower() == 'sitemap'
+
+
+def iter_sitemap(xml):
+    """
+    Stream ('url' | 'sitemap', loc, lastmod) entries out of one sitemap or sitemap index document
+    Stops quietly at the first malformed element, keeping everything read before it
+    """
+    if isinstance(xml, str):
+        xml = xml.encode('utf-8')
+    root = None
+    try:
+        for event, element in ET.iterparse(io.BytesIO(xml), events=('start', 'end')):
+            if root is None:
+                root = element
+                namespace = element.tag[:element.tag.find('}') + 1]
+                entry_tags = {namespace + 'url': 'url', namespace + 'sitemap': 'sitemap'}
+            if event == 'end' and element.tag in entry_tags:
+                # Direct children only: <image:loc> nested inside <url> is not the page URL
+                loc = (element.findtext(namespace + 'loc') or '').strip()
+                lastmod = (element.findtext(namespace + 'lastmod') or '').strip() or None
+                if loc:
+                    yield entry_tags[element.tag], loc, lastmod
+                root.clear()      # drop finished entries instead of building the whole tree
+    except ET.ParseError as e:
+        print(f"    Sitemap parse stopped early: {e}")
+
+
+class SitemapReader:
+    def __init__(self, fetch_engine):
+        """fetch_engine: FetchEngine serving sitemap documents (cached like any other page)"""
+        self.fetch_engine = fetch_engine
+        self.lastmod = {}         # product URL -> sitemap lastmod, for incremental recrawls
+        self.stats = {'sitemaps': 0, 'failed': 0, 'entries': 0, 'matched': 0}
+
+    def entries(self, sitemap_urls, sitemaps=None):
+        """
+        Yield (url, lastmod) for every page listed under the given sitemaps, following sitemap indexes
+        sitemaps: substring a child sitemap URL must contain to be read (e.g. 'product-sitemap')
+        """
+        if isinstance(sitemap_urls, str):
+            sitemap_urls = [sitemap_urls]
+        seen = set()
+        queue = list(sitemap_urls)
+        while queue:
+            batch = [url for url in dict.fromkeys(queue) if url not in seen]
+            seen.update(batch)
+            queue = []
+            for sitemap_url, xml in self.fetch_engine.fetch_all(batch):
+                if not xml:
+                    self.stats['failed'] += 1
+                    continue
+                self.stats['sitemaps'] += 1
+                for kind, loc, lastmod in iter_sitemap(xml):
+                    if kind == 'sitemap':
+                        if not sitemaps or sitemaps in loc:
+                            queue.append(urljoin(sitemap_url, loc))
+                    else:
+                        self.stats['entries'] += 1
+                        yield urljoin(sitemap_url, loc), lastmod
+
+    def product_urls(self, sitemap_urls, include, sitemaps=None):
+        """
+        Product URLs (in sitemap order, without duplicates) whose URL passes include(url)
+        Their lastmod values are kept in self.lastmod
+        """
+        return list(self.stream_product_urls(sitemap_urls, include, sitemaps))
+
+    def stream_product_urls(self, sitemap_urls, include, sitemaps=None):
+        """product_urls() as a generator, handing each URL on while later sitemaps are still being read"""
+        seen = set()
+        for url, lastmod in self.entries(sitemap_urls, sitemaps):
+            if include(url):
+                if lastmod:
+                    self.lastmod[url] = lastmod
+                if url not in seen:
+                    seen.add(url)
+                    yield url
+        self.stats['matched'] = len(seen)
+        print(f"  Sitemaps: {self.stats['sitemaps']} read ({self.stats['failed']} failed), "
+              f"{self.stats['entries']} entries, {len(seen)} product URLs")
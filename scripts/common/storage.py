@@ -0,0 +1,240 @@
+"""
+Pluggable Strain Storage
+Every scraper writes records through open_storage(), which picks the backend from STRAIN_STORAGE_URL:
+
+    dynamodb://                              DynamoDB, the scraper's own table (default)
+    dynamodb://<table>?endpoint_url=<url>    another table / DynamoDB Local
+    sqlite:///strains.sqlite                 local SQLite file (sqlite:////abs/path for absolute paths)
+    duckdb:///strains.duckdb                 local DuckDB file (needs the duckdb package)
+    parquet:///strains.parquet               Parquet file written through an in-memory DuckDB on close
+
+All backends share the DynamoDBSink interface: put(item), flush(), close(), print_stats(), failed,
+the on_written / on_failed callbacks, and records() to read the whole table back for batch jobs (re-scoring)
+Local backends buffer records and insert them in bulk, one transaction per batch, leaving out records whose
+content_hash matches the one already stored
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from decimal import Decimal
+from urllib.parse import parse_qs, urlparse
+
+from .dynamodb_sink import DEFAULT_TABLE, DynamoDBSink
+from .fingerprint import FINGERPRINT_FIELD, stamp
+
+LOCAL_BATCH_SIZE = 500
+COLUMNS = ('strain_id', 'seed_bank', 'strain_name', 'record', 'stored_at')
+DUCKDB_ROW_TYPE = json.dumps([{'strain_id': 'VARCHAR', 'seed_bank': 'VARCHAR', 'strain_name': 'VARCHAR',
+                               'record': 'VARCHAR', 'stored_at': 'DOUBLE'}])
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _local_path(parsed):
+    """sqlite:///relative.db -> relative.db, sqlite:////abs/path.db -> /abs/path.db"""
+    path = parsed.netloc + parsed.path
+    return path[1:] if not parsed.netloc and path.startswith('/') else path
+
+
+def _sql_table(table_name):
+    return re.sub(r'\W', '_', table_name)
+
+
+class LocalSink:
+    """Buffered bulk writer shared by the SQLite and DuckDB backends"""
+
+    def __init__(self, table_name=DEFAULT_TABLE, key_attribute='strain_id', batch_size=LOCAL_BATCH_SIZE):
+        self.table_name = _sql_table(table_name)
+        self.key_attribute = key_attribute
+        self.batch_size = batch_size
+        self.buffer = []
+        self.failed = []
+        self.stats = {'queued': 0, 'written': 0, 'unchanged': 0, 'batches': 0, 'failed': 0, 'seconds': 0.0}
+        self.fingerprints = None  # strain_id -> stored content_hash, read from the table on first flush
+        self.on_written = None
+        self.on_failed = None
+
+    def _row(self, item):
+        return (
+            str(item.get(self.key_attribute)),
+            item.get('seed_bank') or item.get('bank_name'),
+            item.get('strain_name'),
+            json.dumps(item, default=_json_default),
+            time.time(),
+        )
+
+    def _stored_fingerprints(self):
+        if self.fingerprints is None:
+            self.fingerprints = dict(self._fetchall(
+                f'SELECT strain_id, {self.json_text}(record, \'$.{FINGERPRINT_FIELD}\') FROM "{self.table_name}"'))
+        return self.fingerprints
+
+    def _fetchall(self, sql):
+        return self.conn.execute(sql).fetchall()
+
+    def put(self, item):
+        if not item.get(FINGERPRINT_FIELD):
+            stamp(item)
+        self.buffer.append(item)
+        self.stats['queued'] += 1
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        items, self.buffer = self.buffer, []
+        start = time.perf_counter()
+        try:
+            # Latest record per key, as sequential put_item calls would leave it
+            latest = {str(item.get(self.key_attribute)): item for item in items}
+            stored = self._stored_fingerprints()
+            changed = {key: item for key, item in latest.items() if stored.get(key) != item[FINGERPRINT_FIELD]}
+            if changed:
+                self._insert([self._row(item) for item in changed.values()])
+                self.stats['batches'] += 1
+            stored.update((key, item[FINGERPRINT_FIELD]) for key, item in changed.items())
+            unchanged = len(latest) - len(changed)
+            self.stats['unchanged'] += unchanged
+            self.stats['written'] += len(items) - unchanged
+        except Exception as e:
+            self.stats['failed'] += len(items)
+            self.failed.extend((item, str(e)) for item in items)
+            print(f"  STORAGE FAILED: {len(items)} records - {e}")
+            if self.on_failed:
+                self.on_failed(items, e)
+        else:
+            if self.on_written:
+                self.on_written(items)
+        self.stats['seconds'] += time.perf_counter() - start
+
+    def close(self):
+        self.flush()
+
+    def records(self):
+        """Every stored record, after writing out the queued ones"""
+        self.flush()
+        for (record,) in self._fetchall(f'SELECT record FROM "{self.table_name}"'):
+            yield json.loads(record)
+
+    def print_stats(self):
+        """Print write statistics"""
+        print(f"\n{self.backend.upper()} STORAGE ({self.location}, table {self.table_name}):")
+        print(f"   Queued: {self.stats['queued']}")
+        print(f"   Written: {self.stats['written']} in {self.stats['batches']} batches ({self.stats['seconds']:.2f}s)")
+        print(f"   Unchanged (same content_hash already stored): {self.stats['unchanged']}")
+        print(f"   Failed: {self.stats['failed']}")
+
+
+class SQLiteSink(LocalSink):
+    backend = 'sqlite'
+    json_text = 'json_extract'
+
+    def __init__(self, path, table_name=DEFAULT_TABLE, **kwargs):
+        """path: SQLite file, created with its table on first use"""
+        super().__init__(table_name, **kwargs)
+        self.location = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Shared across threads: whichever thread flushes (the scraper's, a pipeline stage's) writes
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS "{self.table_name}" (
+                strain_id TEXT PRIMARY KEY,
+                seed_bank TEXT,
+                strain_name TEXT,
+                record TEXT NOT NULL,
+                stored_at REAL NOT NULL
+            )""")
+        self.conn.commit()
+
+    def _fetchall(self, sql):
+        with self.lock:
+            return self.conn.execute(sql).fetchall()
+
+    def _insert(self, rows):
+        with self.lock, self.conn:
+            self.conn.executemany(f'INSERT OR REPLACE INTO "{self.table_name}" VALUES (?, ?, ?, ?, ?)', rows)
+
+    def close(self):
+        super().close()
+        with self.lock:
+            self.conn.close()
+
+
+class DuckDBSink(LocalSink):
+    backend = 'duckdb'
+    json_text = 'json_extract_string'
+
+    def __init__(self, path=':memory:', table_name=DEFAULT_TABLE, parquet_path=None, **kwargs):
+        """
+        path: DuckDB database file (':memory:' when only exporting Parquet)
+        parquet_path: write the table to this Parquet file on close()
+        """
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("DuckDB storage needs the duckdb package: pip install duckdb")
+        super().__init__(table_name, **kwargs)
+        self.location = parquet_path or path
+        self.parquet_path = parquet_path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = duckdb.connect(path)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS "{self.table_name}" (
+                strain_id VARCHAR PRIMARY KEY,
+                seed_bank VARCHAR,
+                strain_name VARCHAR,
+                record VARCHAR NOT NULL,
+                stored_at DOUBLE NOT NULL
+            )""")
+
+    def _insert(self, rows):
+        # Bind the batch as one JSON array and unnest it in SQL; binding thousands of
+        # individual parameters (executemany or a multi-row VALUES) is ~10x slower in DuckDB
+        payload = json.dumps([dict(zip(COLUMNS, row)) for row in rows])
+        self.conn.execute(f'INSERT OR REPLACE INTO "{self.table_name}" '
+                          f'SELECT unnest(from_json(?, \'{DUCKDB_ROW_TYPE}\'), recursive := true)', [payload])
+
+    def close(self):
+        super().close()
+        if self.parquet_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.parquet_path)), exist_ok=True)
+            self.conn.execute(f"COPY \"{self.table_name}\" TO '{self.parquet_path}' (FORMAT PARQUET)")
+        self.conn.close()
+
+
+def open_storage(table_name=DEFAULT_TABLE, url=None):
+    """
+    Storage backend for a scraper
+    table_name: the scraper's DynamoDB table (also names the table in local backends)
+    url: backend URL, defaults to STRAIN_STORAGE_URL, then DynamoDB
+    """
+    url = url or os.environ.get('STRAIN_STORAGE_URL') or 'dynamodb://'
+    parsed = urlparse(url)
+    options = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+
+    if parsed.scheme == 'dynamodb':
+        if not parsed.netloc and not options:
+            return DynamoDBSink.from_env(table_name)
+        return DynamoDBSink(table_name=parsed.netloc or table_name,
+                            endpoint_url=options.get('endpoint_url') or os.environ.get('DYNAMODB_ENDPOINT_URL'))
+    if parsed.scheme == 'sqlite':
+        return SQLiteSink(_local_path(parsed), table_name)
+    if parsed.scheme == 'duckdb':
+        return DuckDBSink(_local_path(parsed), table_name)
+    if parsed.scheme == 'parquet':
+        return DuckDBSink(':memory:', table_name, parquet_path=_local_path(parsed))
+    raise ValueError(f"Unknown STRAIN_STORAGE_URL scheme: {url}")
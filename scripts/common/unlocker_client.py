@@ -0,0 +1,124 @@
+"""
+BrightData Web Unlocker Client
+asyncio-native client with a persistent keep-alive connection pool, shared by every scraper
+Transports are pluggable so a local stub server can stand in for api.brightdata.com
+"""
+
+import asyncio
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+except ImportError:  # requests-based transport is used instead
+    aiohttp = None
+
+BRIGHTDATA_API_URL = "https://api.brightdata.com/request"
+DEFAULT_POOL_SIZE = 32
+
+
+class UnlockerResponse:
+    def __init__(self, status, text, headers=None):
+        self.status = status
+        self.text = text
+        self.headers = dict(headers or {})
+
+    @property
+    def ok(self):
+        return self.status == 200
+
+
+class AiohttpTransport:
+    """Native asyncio transport on a single aiohttp session (keep-alive connection pool)"""
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, keepalive_timeout=60):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for AiohttpTransport")
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self._session = None
+
+    def _get_session(self):
+        # Created lazily so the session binds to the loop that actually uses it
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def post(self, url, headers, payload, timeout):
+        session = self._get_session()
+        async with session.post(url, headers=headers, json=payload, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            text = await response.text(errors='replace')
+            return UnlockerResponse(response.status, text, response.headers)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class RequestsTransport:
+    """Pooled requests.Session run in worker threads, for environments without aiohttp"""
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _post(self, url, headers, payload, timeout):
+        response = self.session.post(url, headers=headers, json=payload, timeout=timeout)
+        return UnlockerResponse(response.status_code, response.text, response.headers)
+
+    async def post(self, url, headers, payload, timeout):
+        return await asyncio.to_thread(self._post, url, headers, payload, timeout)
+
+    async def close(self):
+        self.session.close()
+
+
+def default_transport(pool_size=DEFAULT_POOL_SIZE):
+    """Prefer the native aiohttp transport, fall back to a pooled requests session"""
+    if aiohttp is not None:
+        return AiohttpTransport(pool_size=pool_size)
+    return RequestsTransport(pool_size=pool_size)
+
+
+class UnlockerClient:
+    def __init__(self, api_key, zone, timeout=30, transport=None, api_url=BRIGHTDATA_API_URL):
+        """
+        api_key / zone: BrightData credentials (from the cannabis-brightdata-api secret)
+        timeout: per-request timeout in seconds (Attitude needs 300 for slow pages)
+        transport: object with async post(url, headers, payload, timeout) and close()
+        api_url: unlocker endpoint, override to point at a local stub server
+        """
+        self.api_key = api_key
+        self.zone = zone
+        self.timeout = timeout
+        self.transport = transport or default_transport()
+        self.api_url = api_url
+
+    @property
+    def headers(self):
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    async def request(self, url, **options):
+        """Send one unlocker request and return the raw UnlockerResponse"""
+        payload = {"zone": self.zone, "url": url, "format": "raw"}
+        payload.update(options)
+        return await self.transport.post(self.api_url, self.headers, payload, self.timeout)
+
+    async def fetch(self, url):
+        """Fetch a page through the unlocker, returning its HTML or None on a non-200"""
+        response = await self.request(url)
+        return response.text if response.ok else None
+
+    async def close(self):
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
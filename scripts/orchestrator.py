@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Multi-Site Orchestrator
+Runs every seed bank scraper, plus the legacy CannabisStrainScraper breeder list, concurrently in one process.
+All sites fetch through one shared engine: a global cap on requests in flight, per-host caps, the per-domain
+token buckets, the response cache and one request budget. A site waits for its own host slots before it takes a
+global slot, so Attitude's 300-second pages never hold up the fast Shopify sites, and a full refresh takes about
+as long as the slowest site instead of the sum of all of them. The 4-method scrapers also share one pool of
+extraction processes (SCRAPER_PARSE_WORKERS), so parsing uses every core rather than the orchestrator's one.
+
+Usage:
+    python scripts/orchestrator.py
+    python scripts/orchestrator.py mephisto seedsman --max-workers 48 --per-host 6
+    python scripts/orchestrator.py --skip legacy attitude --max-cost 20 --log-dir logs/refresh
+    python scripts/orchestrator.py --soft-max-cost 15 --max-cost 25 --cost-report refresh_cost.csv
+
+Each site's output goes to <log-dir>/<site>.log, or to the console prefixed with [site] without --log-dir.
+To spread a refresh over several hosts, give each one a share of the sites; caps and budget apply per process.
+"""
+
+import argparse
+import contextvars
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common.budget import RequestBudget
+from common.fetch_engine import DEFAULT_PER_HOST_LIMIT, FetchEngine
+from common.metering import CostMeter
+from common.parse_pool import ParsePool
+from common.response_cache import ResponseCache
+from common.seed_banks import SEED_BANKS
+from common.unlocker_client import UnlockerClient
+
+DEFAULT_GLOBAL_WORKERS = 48       # requests in flight across every site
+
+LEGACY_KEY = 'legacy'
+LEGACY_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             '[TRASH] data scripts', 'scripts', 'cannabis_scraper.py')
+LEGACY_BREEDERS = [
+    ("North Atlantic Seed Company", "https://www.northatlanticseed.com/seeds/"),
+    ("Shantibaba", "https://shantibabaseeds.com/collections/feminized-seeds"),
+    ("Pacific Seed Bank", "https://www.pacificseedbank.com/shop-all-marijuana-seeds/"),
+]
+
+
+class SiteLog:
+    """Where one site's output goes: its log file, or console lines prefixed with the site"""
+
+    def __init__(self, site, file=None):
+        self.site = site
+        self.file = file
+        self.partial = ''
+
+
+class SiteOutput:
+    """
+    sys.stdout stand-in sending each site's prints to that site's log file or prefixed console lines
+    The site is kept in a context variable, so threads a scraper starts in a copy of its context (the streaming
+    pipeline's stages) write to the same place
+    """
+
+    def __init__(self, stream, log_dir=None):
+        self.stream = stream
+        self.log_dir = log_dir
+        self.current = contextvars.ContextVar('site_log', default=None)
+        self.lock = threading.Lock()
+
+    def bind(self, site):
+        """Route the calling thread's output to site"""
+        file = None
+        if self.log_dir:
+            file = open(os.path.join(self.log_dir, f"{site}.log"), 'w', encoding='utf-8', buffering=1)
+        self.current.set(SiteLog(site, file))
+
+    def release(self):
+        log = self.current.get()
+        if log.file:
+            log.file.close()
+        elif log.partial:
+            self.write('\n')
+        self.current.set(None)
+
+    def write(self, text):
+        log = self.current.get()
+        if log is None:
+            with self.lock:
+                return self.stream.write(text)
+        if log.file:
+            return log.file.write(text)
+        with self.lock:
+            *lines, log.partial = (log.partial + text).split('\n')
+            if lines:
+                self.stream.write(''.join(f"[{log.site}] {line}\n" for line in lines))
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class EngineResponse:
+    """The parts of requests.Response the legacy scraper reads"""
+
+    def __init__(self, html):
+        self.text = html or ''
+        self.content = self.text.encode('utf-8')
+        self.status_code = 200 if html else 502
+
+
+class EngineSession:
+    """requests.Session stand-in sending the legacy scraper's GETs through the shared engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def get(self, url, **kwargs):
+        return EngineResponse(self.engine.fetch_one(url))
+
+
+def brightdata_client():
+    import boto3
+    secrets = boto3.client('secretsmanager', region_name='us-east-1')
+    config = json.loads(secrets.get_secret_value(SecretId='cannabis-brightdata-api')['SecretString'])
+    return UnlockerClient(config['api_key'], config['zone'])
+
+
+def run_seed_bank(bank, shared, urls=None, parse_pool=None):
+    """
+    Run one registered scraper end to end on the shared engine; returns its engine stats
+    urls: product URLs to process instead of the scraper's Phase 1 discovery (dead-letter replays)
+    parse_pool: shared ParsePool for scrapers that extract in worker processes
+    """
+    scraper = bank.create_scraper()
+    scraper.fetch_engine = shared.adopt(scraper.fetch_engine)
+    if parse_pool is not None and getattr(scraper, 'parse_pool', None) is not None:
+        scraper.parse_pool = parse_pool.adopt()
+    if urls is None:
+        print(f"{bank.name.upper()} - orchestrated run")
+    else:
+        print(f"{bank.name.upper()} - replaying {len(urls)} dead-lettered URLs")
+        setattr(scraper, bank.collect, lambda: list(urls))
+        if hasattr(scraper, 'discover_strain_urls'):
+            scraper.discover_strain_urls = lambda: iter(urls)    # streaming scrapers discover as they go
+    scraper.run()
+    return scraper.fetch_engine.stats
+
+
+def run_legacy(shared):
+    """Run the legacy breeder list through CannabisStrainScraper, paced by the shared engine instead of sleeps"""
+    spec = importlib.util.spec_from_file_location('legacy_cannabis_scraper', LEGACY_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    engine = shared.adopt(FetchEngine(brightdata_client()))
+    scraper = module.CannabisStrainScraper()
+    scraper.session = EngineSession(engine)
+    scraper.request_delay = 0    # the shared rate limiter paces requests
+    try:
+        results = []
+        for breeder_name, url in LEGACY_BREEDERS:
+            result = scraper.scrape_breeder(breeder_name, url)
+            results.append(result)
+            if result.success:
+                print(f"{breeder_name}: {len(result.strains)} strains ({result.site_pattern.value})")
+            else:
+                print(f"{breeder_name}: Failed - {result.error_message}")
+        print(f"Exported to: {scraper.export_results(results, 'json')}")
+        engine.print_stats()
+    finally:
+        engine.close()
+    return engine.stats
+
+
+def run_site(site, shared, output, urls=None, parse_pool=None):
+    """Thread body: one site with its output routed, never raising"""
+    output.bind(site)
+    start = time.time()
+    stats, status = {}, 'ok'
+    try:
+        if site == LEGACY_KEY:
+            stats = run_legacy(shared)
+        else:
+            stats = run_seed_bank(SEED_BANKS[site], shared, urls, parse_pool)
+    except Exception as e:
+        status = f"error: {e}"
+        traceback.print_exc(file=sys.stdout)
+    finally:
+        output.release()
+    return {'site': site, 'status': status, 'seconds': time.time() - start, 'stats': stats}
+
+
+def print_summary(results, shared, wall_time, title="ORCHESTRATED REFRESH COMPLETE!"):
+    """Per-site table, then the shared caps, rate limiter, cache, meter, dead letters and budget"""
+    print(f"\n{title}")
+    print(f"{'Site':<16} {'Status':<10} {'Seconds':>9} {'Fetched':>8} {'Failed':>7} {'Retried':>8} {'Cached':>7} "
+          f"{'Over budget':>12} {'Cost':>9}")
+    for result in sorted(results, key=lambda r: -r['seconds']):
+        stats = result['stats']
+        print(f"{result['site']:<16} {result['status'][:10]:<10} {result['seconds']:>9.1f} "
+              f"{stats.get('fetched', 0):>8} {stats.get('failed', 0):>7} {stats.get('retried', 0):>8} "
+              f"{stats.get('cache_hits', 0):>7} "
+              f"{stats.get('over_budget', 0):>12} {stats.get('billed', 0) * shared.meter.cost_per_request:>9.2f}")
+    slowest = max((r['seconds'] for r in results), default=0)
+    print(f"\nWall time: {wall_time:.1f}s (slowest site {slowest:.1f}s, "
+          f"sites back to back {sum(r['seconds'] for r in results):.1f}s)")
+    print(f"Peak requests in flight: {shared.stats['peak_in_flight']} of {shared.max_workers}")
+    for result in results:
+        if result['status'] != 'ok':
+            print(f"   {result['site']}: {result['status']}")
+    shared.rate_limiter.print_stats()
+    if shared.cache is not None:
+        shared.cache.print_stats()
+    shared.meter.print_stats()
+    if shared.dead_letters is not None:
+        shared.dead_letters.print_stats()
+    shared.budget.print_stats()
+
+
+def parse_host_limits(values):
+    limits = {}
+    for value in values or []:
+        host, _, cap = value.partition('=')
+        limits[host.lower()] = int(cap)
+    return limits
+
+
+def main():
+    sites = sorted(SEED_BANKS) + [LEGACY_KEY]
+    parser = argparse.ArgumentParser(description="Run all seed bank scrapers concurrently under shared caps")
+    parser.add_argument('sites', nargs='*', help=f"sites to run (default: all): {', '.join(sites)}")
+    parser.add_argument('--skip', nargs='+', choices=sites, default=[], help="sites to leave out")
+    parser.add_argument('--max-workers', type=int, default=DEFAULT_GLOBAL_WORKERS,
+                        help="requests in flight across all sites")
+    parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST_LIMIT,
+                        help="requests in flight to any one host")
+    parser.add_argument('--host-limit', action='append', metavar='HOST=N', help="per-host cap override")
+    parser.add_argument('--max-requests', type=int, help="unlocker request budget (or SCRAPER_MAX_REQUESTS)")
+    parser.add_argument('--max-cost', type=float, help="budget in dollars (or SCRAPER_MAX_COST)")
+    parser.add_argument('--soft-max-requests', type=int, help="warn past this many requests (or SCRAPER_SOFT_MAX_REQUESTS)")
+    parser.add_argument('--soft-max-cost', type=float, help="warn past this many dollars (or SCRAPER_SOFT_MAX_COST)")
+    parser.add_argument('--cost-report', help="per-strain cost CSV (or SCRAPER_COST_REPORT)")
+    parser.add_argument('--log-dir', help="write each site's output to <log-dir>/<site>.log")
+    args = parser.parse_args()
+    unknown = sorted(set(args.sites) - set(sites))
+    if unknown:
+        parser.error(f"unknown sites: {', '.join(unknown)}")
+
+    selected = [site for site in (args.sites or sites) if site not in args.skip]
+    caps = (args.max_requests, args.max_cost, args.soft_max_requests, args.soft_max_cost)
+    if any(cap is not None for cap in caps):
+        budget = RequestBudget(args.max_requests, args.max_cost,
+                               soft_requests=args.soft_max_requests, soft_cost=args.soft_max_cost)
+    else:
+        budget = RequestBudget.from_env() or RequestBudget()
+    meter = CostMeter(report_path=args.cost_report) if args.cost_report else CostMeter.from_env()
+    shared = FetchEngine(None, max_workers=args.max_workers, per_host_limit=args.per_host,
+                         host_limits=parse_host_limits(args.host_limit), cache=ResponseCache.from_env(),
+                         budget=budget, meter=meter)
+    parse_pool = ParsePool.from_env()
+
+    if args.log_dir:
+        os.makedirs(args.log_dir, exist_ok=True)
+    output = SiteOutput(sys.stdout, args.log_dir)
+    sys.stdout = output
+    print(f"Orchestrating {len(selected)} sites: {', '.join(selected)}")
+    print(f"Caps: {args.max_workers} requests in flight, {args.per_host} per host, "
+          f"budget {'none' if budget.limit is None else budget.limit} requests"
+          f"{'' if budget.soft_limit is None else f' (warning at {budget.soft_limit})'}")
+
+    start = time.time()
+    try:
+        with ThreadPoolExecutor(max_workers=len(selected) or 1, thread_name_prefix='site') as pool:
+            results = list(pool.map(lambda site: run_site(site, shared, output, parse_pool=parse_pool), selected))
+        print_summary(results, shared, time.time() - start)
+    finally:
+        shared.close()
+        if parse_pool is not None:
+            parse_pool.close()
+        sys.stdout = output.stream
+
+
+if __name__ == "__main__":
+    main()
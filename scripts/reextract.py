@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Offline Re-Extraction
+Replays cached HTML for a seed bank through that scraper's own 4-method extraction
+across a process pool, writing the records to JSONL without touching the network.
+
+Usage:
+    python scripts/reextract.py mephisto
+    python scripts/reextract.py attitude --workers 8 --output attitude_records.jsonl
+    python scripts/reextract.py all
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from decimal import Decimal
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common.seed_banks import SEED_BANKS
+
+# Per-process state, set once by the pool initializer
+_bank = None
+_scraper = None
+
+
+def _init_worker(key):
+    global _bank, _scraper
+    _bank = SEED_BANKS[key]
+    _scraper = _bank.create_scraper(offline=True)
+
+
+def _extract(url):
+    """Worker body: read one cached page and run the scraper's extraction on it"""
+    html = _scraper.fetch_engine.cache.get(url, touch=False)
+    if html is None:
+        return url, None, 'not cached'
+    try:
+        return url, _bank.extract_record(_scraper, url, html), None
+    except Exception as e:
+        return url, None, str(e)
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def collect_urls(bank, urls_file=None):
+    """Product URLs from a file, or by replaying the scraper's Phase 1 against cached listing pages"""
+    if urls_file:
+        with open(urls_file) as f:
+            return [line.strip() for line in f if line.strip()]
+    scraper = bank.create_scraper(offline=True)
+    try:
+        return list(dict.fromkeys(bank.collect_urls(scraper)))
+    finally:
+        scraper.fetch_engine.close()
+
+
+def reextract(bank, output, workers=None, urls_file=None):
+    """Re-extract every cached product page for one seed bank; returns the number of records written"""
+    print(f"\nRE-EXTRACTING: {bank.name}")
+    urls = collect_urls(bank, urls_file)
+    if not urls:
+        print("No cached strain URLs found. Run the scraper once to populate the cache.")
+        return 0
+
+    workers = workers or os.cpu_count()
+    print(f"Extracting {len(urls)} cached pages on {workers} processes -> {output}")
+
+    start = time.time()
+    written = 0
+    errors = Counter()
+    methods = Counter()
+    chunksize = max(1, min(32, len(urls) // (workers * 4)))
+
+    with open(output, 'w', encoding='utf-8') as out, \
+            Pool(workers, initializer=_init_worker, initargs=(bank.key,)) as pool:
+        for i, (url, record, error) in enumerate(pool.imap_unordered(_extract, urls, chunksize), 1):
+            if record:
+                out.write(json.dumps(record, default=_json_default) + '\n')
+                written += 1
+                methods.update(record.get('extraction_methods_used', []))
+            else:
+                errors[error or 'no record'] += 1
+            if i % 500 == 0:
+                print(f"  [{i}/{len(urls)}] {written} records")
+
+    elapsed = time.time() - start
+    print(f"\n{bank.name.upper()} RE-EXTRACTION COMPLETE!")
+    print(f"   Pages: {len(urls)}")
+    print(f"   Records: {written}")
+    print(f"   Time: {elapsed:.1f}s ({len(urls) / elapsed if elapsed else 0:.0f} pages/s)")
+    for method, count in methods.most_common():
+        print(f"   {method.title()}: {count} strains")
+    for error, count in errors.most_common(5):
+        print(f"   Skipped ({error}): {count}")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run 4-method extraction over cached HTML (no network)")
+    parser.add_argument('seed_bank', choices=sorted(SEED_BANKS) + ['all'])
+    parser.add_argument('--workers', type=int, default=None, help="extraction processes (default: all cores)")
+    parser.add_argument('--output', help="JSONL output file (default: <seed_bank>_reextracted.jsonl)")
+    parser.add_argument('--urls', help="file with one product URL per line instead of replaying Phase 1")
+    args = parser.parse_args()
+
+    keys = sorted(SEED_BANKS) if args.seed_bank == 'all' else [args.seed_bank]
+    total = 0
+    for key in keys:
+        output = args.output if args.output and len(keys) == 1 else f"{key}_reextracted.jsonl"
+        total += reextract(SEED_BANKS[key], output, args.workers, args.urls)
+    print(f"\nTotal records written: {total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Dead-Letter Replay
+Re-runs only the product URLs in the dead-letter store - pages the fetch engine gave up on, records that failed
+extraction or storage, and records skipped as low quality - through each seed bank's own Phase 2, with every
+site replaying concurrently on one shared engine like the orchestrator. Phase 1 discovery is skipped entirely, so
+recovering the last few percent of a site costs a request per missing strain instead of a full re-crawl.
+
+Usage:
+    python scripts/replay.py --list
+    python scripts/replay.py
+    python scripts/replay.py mephisto seedsman --stage fetch storage
+    python scripts/replay.py attitude --include-permanent --limit 500 --max-cost 2
+
+URLs leave the store as their records are stored; whatever fails again stays, with its failure count raised.
+Low-quality replays are served from the response cache when the page is still cached, so re-running them after
+an extraction fix costs nothing.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common.budget import RequestBudget
+from common.dead_letter import STAGES, DeadLetterStore
+from common.fetch_engine import DEFAULT_PER_HOST_LIMIT, FetchEngine
+from common.parse_pool import ParsePool
+from common.progress_journal import DEFAULT_JOURNAL_DIR
+from common.response_cache import ResponseCache
+from common.seed_banks import SEED_BANKS
+from orchestrator import DEFAULT_GLOBAL_WORKERS, SiteOutput, print_summary, run_site
+
+
+def replay_plan(store, sites=None, stages=None, include_permanent=False, limit=None):
+    """{seed bank key: URLs} to replay, oldest failures first; unregistered sites are reported and left alone"""
+    plan = defaultdict(list)
+    for entry in store.entries(sites, stages, include_permanent):
+        plan[entry['seed_bank']].append(entry['url'])
+    for site in sorted(set(plan) - set(SEED_BANKS)):
+        print(f"Not replayable (no registered scraper): {site}, {len(plan.pop(site))} URLs")
+    return {site: urls[:limit] if limit else urls for site, urls in plan.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run only the dead-lettered product URLs, concurrently")
+    parser.add_argument('sites', nargs='*', help=f"seed banks to replay (default: all): {', '.join(sorted(SEED_BANKS))}")
+    parser.add_argument('--list', action='store_true', help="print the open dead letters and exit")
+    parser.add_argument('--stage', nargs='+', choices=STAGES, help="only replay these failure stages")
+    parser.add_argument('--include-permanent', action='store_true',
+                        help="also replay permanent fetch failures (404 / 410 and other 4xx)")
+    parser.add_argument('--limit', type=int, help="at most this many URLs per seed bank, oldest first")
+    parser.add_argument('--max-workers', type=int, default=DEFAULT_GLOBAL_WORKERS,
+                        help="requests in flight across all sites")
+    parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST_LIMIT,
+                        help="requests in flight to any one host")
+    parser.add_argument('--max-requests', type=int, help="unlocker request budget (or SCRAPER_MAX_REQUESTS)")
+    parser.add_argument('--max-cost', type=float, help="budget in dollars (or SCRAPER_MAX_COST)")
+    parser.add_argument('--log-dir', help="write each site's output to <log-dir>/<site>.log")
+    args = parser.parse_args()
+    unknown = sorted(set(args.sites) - set(SEED_BANKS))
+    if unknown:
+        parser.error(f"unknown sites: {', '.join(unknown)}")
+
+    store = DeadLetterStore.from_env()
+    if store is None:
+        parser.error("the dead-letter store is disabled (SCRAPER_DEAD_LETTER=off)")
+    if args.list:
+        store.print_summary()
+        return
+
+    plan = replay_plan(store, args.sites, args.stage, args.include_permanent, args.limit)
+    if not plan:
+        print("Nothing to replay.")
+        return
+
+    # Replays keep their own journals, so an interrupted full run still resumes where it stopped
+    os.environ['SCRAPER_JOURNAL_DIR'] = os.path.join(os.environ.get('SCRAPER_JOURNAL_DIR', DEFAULT_JOURNAL_DIR),
+                                                     'replay')
+    os.environ['SCRAPER_RESUME'] = '0'
+    if args.max_requests is not None or args.max_cost is not None:
+        budget = RequestBudget(args.max_requests, args.max_cost)
+    else:
+        budget = RequestBudget.from_env() or RequestBudget()
+    shared = FetchEngine(None, max_workers=args.max_workers, per_host_limit=args.per_host,
+                         cache=ResponseCache.from_env(), budget=budget, dead_letters=store)
+    parse_pool = ParsePool.from_env()
+
+    if args.log_dir:
+        os.makedirs(args.log_dir, exist_ok=True)
+    output = SiteOutput(sys.stdout, args.log_dir)
+    sys.stdout = output
+    print(f"Replaying {sum(len(urls) for urls in plan.values())} dead-lettered URLs: "
+          f"{', '.join(f'{site} ({len(urls)})' for site, urls in sorted(plan.items()))}")
+
+    start = time.time()
+    try:
+        with ThreadPoolExecutor(max_workers=len(plan), thread_name_prefix='replay') as pool:
+            results = list(pool.map(lambda site: run_site(site, shared, output, plan[site], parse_pool),
+                                    sorted(plan)))
+        print_summary(results, shared, time.time() - start, "DEAD-LETTER REPLAY COMPLETE!")
+        store.print_summary()
+    finally:
+        shared.close()
+        if parse_pool is not None:
+            parse_pool.close()
+        sys.stdout = output.stream
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Batch Re-Scoring
+Recomputes data_completeness_score and quality_tier for every stored strain from the current FIELD_WEIGHTS of its
+seed bank's scraper, in one vectorized pass over the whole table, and writes back only the records that changed.
+A weight change no longer needs a re-scrape.
+
+Usage:
+    python scripts/rescore.py --dry-run
+    python scripts/rescore.py
+    python scripts/rescore.py --seed-bank mephisto neptune
+    STRAIN_STORAGE_URL=sqlite:///strains.sqlite python scripts/rescore.py
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common.fingerprint import stamp
+from common.scoring import BatchScorer
+from common.seed_banks import SEED_BANKS
+from common.storage import open_storage
+
+
+def _stored_score(record):
+    try:
+        return float(record.get('data_completeness_score'))
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def rescore(storage, scorer, seed_banks=None, dry_run=False):
+    """Re-score stored records (only those of seed_banks, record seed_bank names, if given); returns records changed"""
+    start = time.time()
+    records = [record for record in storage.records() if not seed_banks or record.get('seed_bank') in seed_banks]
+    loaded = time.time() - start
+    if not records:
+        print("No stored records to re-score.")
+        return 0
+
+    start = time.perf_counter()
+    table = scorer.table(records)
+    table_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    scores, tiers, scored = scorer.score(table)
+    scoring_ms = (time.perf_counter() - start) * 1000
+
+    old_scores = np.array([_stored_score(record) for record in records])
+    old_tiers = np.array([record.get('quality_tier') for record in records], dtype=object)
+    changed = scored & ((old_scores != scores) | (old_tiers != tiers))
+    before = Counter(old_tiers[scored])
+    after = Counter(tiers[scored])
+
+    print(f"\nRE-SCORING ({len(records)} records, weights for {len(scorer.seed_banks)} seed banks):")
+    print(f"   Loaded in {loaded:.1f}s, columns built in {table_ms:.1f} ms, scored in {scoring_ms:.1f} ms")
+    print(f"   Not scored (no registered weights): {len(records) - int(scored.sum())}")
+    print(f"   Changed: {int(changed.sum())} ({int((changed & (old_tiers != tiers)).sum())} changed tier)")
+    for tier in ['Premium', 'High', 'Medium', 'Basic', 'Minimal']:
+        print(f"   {tier}: {before[tier]} -> {after[tier]}")
+    if dry_run:
+        print("   Dry run: nothing written")
+        return int(changed.sum())
+
+    now = datetime.utcnow().isoformat() + 'Z'
+    for i in np.flatnonzero(changed):
+        record = records[i]
+        record['data_completeness_score'] = Decimal(str(scores[i]))
+        record['quality_tier'] = str(tiers[i])
+        record['updated_at'] = now
+        stamp(record)
+        storage.put(record)
+    storage.flush()
+    return int(changed.sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score stored strains with the current FIELD_WEIGHTS")
+    parser.add_argument('--seed-bank', nargs='+', choices=sorted(SEED_BANKS),
+                        help="only re-score records of these seed banks (default: all)")
+    parser.add_argument('--dry-run', action='store_true', help="report score and tier changes without writing")
+    args = parser.parse_args()
+
+    scorer = BatchScorer.from_registry()
+    seed_banks = {SEED_BANKS[key].name for key in args.seed_bank} if args.seed_bank else None
+    storage = open_storage()
+    try:
+        rescore(storage, scorer, seed_banks, args.dry_run)
+    finally:
+        storage.close()
+    if not args.dry_run:
+        storage.print_stats()
+
+
+if __name__ == "__main__":
+    main()
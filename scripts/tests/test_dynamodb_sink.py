@@ -0,0 +1,99 @@
+"""DynamoDBSink batching against an in-process client stand-in, and against moto when it is installed"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.dynamodb_sink import DynamoDBSink
+
+
+class FakeClient:
+    """batch_write_item stand-in; unprocessed[key] is how many calls hand that key back as UnprocessedItems"""
+
+    def __init__(self, unprocessed=None):
+        self.unprocessed = dict(unprocessed or {})
+        self.batches = []
+
+    def batch_write_item(self, RequestItems):
+        (table, requests), = RequestItems.items()
+        self.batches.append([request['PutRequest']['Item']['url'] for request in requests])
+        handed_back = []
+        for request in requests:
+            key = request['PutRequest']['Item']['strain_id']
+            if self.unprocessed.get(key, 0) > 0:
+                self.unprocessed[key] -= 1
+                handed_back.append(request)
+        return {'UnprocessedItems': {table: handed_back} if handed_back else {}}
+
+
+def make_sink(client, max_retries=3):
+    sink = DynamoDBSink(client=client, flush_interval=60, max_retries=max_retries, base_delay=0.0)
+    sink.acked, sink.given_up = [], []
+    sink.on_written = lambda items: sink.acked.extend(item['url'] for item in items)
+    sink.on_failed = lambda items, error: sink.given_up.extend(item['url'] for item in items)
+    return sink
+
+
+def record(strain_id, url):
+    return {'strain_id': strain_id, 'url': url, 'strain_name': strain_id}
+
+
+def write(sink, items):
+    for item in items:
+        sink.put(item)
+    sink.close()
+
+
+def test_unprocessed_items_are_retried_until_written():
+    client = FakeClient(unprocessed={'b': 2})
+    sink = make_sink(client)
+    write(sink, [record('a', 'a1'), record('b', 'b1'), record('c', 'c1')])
+    assert client.batches == [['a1', 'b1', 'c1'], ['b1'], ['b1']]
+    assert sink.acked == ['a1', 'c1', 'b1']
+    assert sink.stats['written'] == 3 and sink.stats['retries'] == 2 and sink.stats['failed'] == 0
+
+
+def test_unprocessed_items_fail_after_max_retries():
+    sink = make_sink(FakeClient(unprocessed={'b': 10}), max_retries=2)
+    write(sink, [record('a', 'a1'), record('b', 'b1')])
+    assert sink.acked == ['a1'] and sink.given_up == ['b1']
+    assert sink.stats['failed'] == 1 and sink.failed[0][1] == "unprocessed after 2 retries"
+
+
+def test_superseded_records_are_acknowledged_with_the_latest():
+    client = FakeClient()
+    sink = make_sink(client)
+    write(sink, [record('a', 'a1'), record('b', 'b1'), record('a', 'a2'), record('a', 'a3')])
+    assert client.batches == [['a3', 'b1']]
+    assert sorted(sink.acked) == ['a1', 'a2', 'a3', 'b1']
+    assert sink.stats['written'] == 4 and sink.stats['superseded'] == 2
+
+
+def test_superseded_records_fail_with_the_latest():
+    sink = make_sink(FakeClient(unprocessed={'a': 10}), max_retries=0)
+    write(sink, [record('a', 'a1'), record('b', 'b1'), record('a', 'a2')])
+    assert sink.acked == ['b1']
+    assert sorted(sink.given_up) == ['a1', 'a2']
+    assert sink.stats['written'] == 1 and sink.stats['failed'] == 2
+
+
+def test_writes_to_a_moto_table(monkeypatch):
+    moto = pytest.importorskip('moto')
+    import boto3
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    with moto.mock_aws():
+        client = boto3.resource('dynamodb', region_name='us-east-1').meta.client
+        client.create_table(TableName='strains', KeySchema=[{'AttributeName': 'strain_id', 'KeyType': 'HASH'}],
+                            AttributeDefinitions=[{'AttributeName': 'strain_id', 'AttributeType': 'S'}],
+                            BillingMode='PAY_PER_REQUEST')
+        sink = DynamoDBSink(table_name='strains', client=client, flush_interval=60)
+        sink.acked = []
+        sink.on_written = lambda items: sink.acked.extend(item['url'] for item in items)
+        write(sink, [record(f'strain-{i}', f'u{i}') for i in range(30)] + [record('strain-0', 'u0-again')])
+        stored = {item['strain_id']: item['url'] for item in sink.records()}
+    assert len(stored) == 30 and stored['strain-0'] == 'u0-again'
+    assert sorted(sink.acked) == sorted([f'u{i}' for i in range(30)] + ['u0-again'])
+    assert sink.stats['batches'] == 2 and sink.stats['failed'] == 0
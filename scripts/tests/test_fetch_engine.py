@@ -0,0 +1,221 @@
+"""FetchEngine.request_all against an in-process unlocker stand-in"""
+
+import asyncio
+import contextvars
+import json
+import os
+import sys
+import threading
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.budget import RequestBudget
+from common.dead_letter import DeadLetterStore
+from common.fetch_engine import FetchEngine
+from common.metering import CostMeter
+from common.rate_limiter import DomainRateLimiter
+from common.retry import RetryPolicy
+from common.unlocker_client import UnlockerResponse
+
+GRAPHQL_URL = 'https://api.example.com/graphql'
+SITE = contextvars.ContextVar('site', default=None)     # stands in for the orchestrator's per-site output
+
+
+class FakeUnlocker:
+    """Answers each GraphQL page with its page number; statuses[page] lists responses before a 200"""
+
+    def __init__(self, statuses=None):
+        self.statuses = {page: list(codes) for page, codes in (statuses or {}).items()}
+        self.requests = []
+
+    async def request(self, url, **options):
+        page = json.loads(options['body'])['variables']['page']
+        self.requests.append(page)
+        codes = self.statuses.get(page)
+        status = codes.pop(0) if codes else 200
+        return UnlockerResponse(status, json.dumps({'page': page}))
+
+    async def fetch(self, url):
+        return None
+
+    async def close(self):
+        pass
+
+
+def make_engine(client, tmp_path, max_attempts=3, budget=None, base_delay=0.0, **limits):
+    return FetchEngine(client, rate_limiter=DomainRateLimiter(default_rate=1000, default_burst=1000),
+                       budget=budget or RequestBudget(), meter=CostMeter(),
+                       retry_policy=RetryPolicy(max_attempts, base_delay=base_delay),
+                       dead_letters=DeadLetterStore(str(tmp_path / 'dead_letters.sqlite')), **limits)
+
+
+def calls(pages):
+    return [(page, GRAPHQL_URL, {'method': 'POST', 'body': json.dumps({'variables': {'page': page}})})
+            for page in pages]
+
+
+def test_request_all_returns_every_key(tmp_path):
+    engine = make_engine(FakeUnlocker(), tmp_path)
+    try:
+        results = dict(engine.request_all(calls(range(1, 9)), max_workers=4))
+    finally:
+        engine.close()
+    assert sorted(results) == list(range(1, 9))
+    assert all(json.loads(response.text)['page'] == page for page, response in results.items())
+
+
+def test_request_all_retries_and_reports_failures(tmp_path):
+    client = FakeUnlocker({2: [503], 3: [404]})
+    engine = make_engine(client, tmp_path, max_attempts=2)
+    try:
+        results = dict(engine.request_all(calls([1, 2, 3])))
+    finally:
+        engine.close()
+    assert results[2].ok                          # 5xx retried
+    assert results[3].status == 404               # 404 not retried, handed back as is
+    assert client.requests.count(2) == 2 and client.requests.count(3) == 1
+
+
+def test_request_all_stops_at_the_budget(tmp_path):
+    engine = make_engine(FakeUnlocker(), tmp_path, budget=RequestBudget(max_requests=2))
+    try:
+        results = dict(engine.request_all(calls([1, 2, 3, 4]), max_workers=1))
+    finally:
+        engine.close()
+    assert sum(response is not None for response in results.values()) == 2
+    assert sum(response is None for response in results.values()) == 2
+
+
+class RecordingCache:
+    """ResponseCache stand-in noting the thread and site context of each call"""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def get(self, url):
+        self.calls.append(('get', threading.current_thread().name, SITE.get()))
+        return None
+
+    def put(self, url, html):
+        self.calls.append(('put', threading.current_thread().name, SITE.get()))
+
+    def close(self):
+        pass
+
+
+class FailingUnlocker(FakeUnlocker):
+    async def request(self, url, **options):
+        if 'broken' in url:
+            raise ConnectionError('connection reset')
+        return UnlockerResponse(200, '<html></html>')
+
+
+def test_cache_io_and_messages_run_off_the_loop_in_the_callers_context(tmp_path):
+    calls = []
+    engine = make_engine(FailingUnlocker(), tmp_path, max_attempts=1)
+    engine.cache = RecordingCache(calls)
+    errors = []
+    record_error = engine._record_error
+    engine._record_error = lambda url, error: errors.append(SITE.get()) or record_error(url, error)
+    SITE.set('mephisto')
+    try:
+        pages = dict(engine.fetch_all(['https://example.com/ok', 'https://example.com/broken']))
+    finally:
+        engine.close()
+    assert pages['https://example.com/ok'] and pages['https://example.com/broken'] is None
+    assert {thread.split('_')[0] for _, thread, _ in calls} == {'fetch-io'}
+    assert {site for _, _, site in calls} == {'mephisto'} and errors == ['mephisto']
+
+
+class SlowUnlocker(FakeUnlocker):
+    """FakeUnlocker that holds each request open briefly, noting the most requests in flight at once"""
+
+    def __init__(self, statuses=None):
+        super().__init__(statuses)
+        self.in_flight = self.peak = 0
+
+    async def request(self, url, **options):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+        return await super().request(url, **options)
+
+
+def test_request_all_takes_the_global_slots(tmp_path):
+    client = SlowUnlocker()
+    engine = make_engine(client, tmp_path, max_workers=2)
+    try:
+        results = dict(engine.request_all(calls(range(1, 9)), max_workers=8))
+    finally:
+        engine.close()
+    assert len(results) == 8 and client.peak == 2
+
+
+def test_request_retry_waits_without_holding_the_worker(tmp_path):
+    engine = make_engine(FakeUnlocker({1: [503]}), tmp_path, base_delay=0.3)
+    try:
+        order = [page for page, _ in engine.request_all(calls([1, 2, 3, 4]), max_workers=1)]
+    finally:
+        engine.close()
+    assert order == [2, 3, 4, 1]
+
+
+class BrokenUnlocker(FakeUnlocker):
+    async def request(self, url, **options):
+        self.requests.append(url)
+        raise KeyError('zone')
+
+
+def test_request_raises_errors_that_are_not_transport_errors(tmp_path):
+    client = BrokenUnlocker()
+    engine = make_engine(client, tmp_path)
+    try:
+        with pytest.raises(KeyError):
+            engine.request(GRAPHQL_URL, method='POST', body='{}')
+    finally:
+        engine.close()
+    assert len(client.requests) == 1
+
+
+def test_request_needs_a_client(tmp_path):
+    engine = make_engine(lambda url: '<html></html>', tmp_path)
+    try:
+        with pytest.raises(ValueError):
+            engine.request(GRAPHQL_URL)
+    finally:
+        engine.close()
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+def test_blocking_fetch_statuses_are_classified_and_retried(tmp_path):
+    answers = {
+        'https://example.com/server': [UnlockerResponse(503, ''), UnlockerResponse(200, '<html>a</html>')],
+        'https://example.com/throttled': [http_error(429), '<html>b</html>'],
+        'https://example.com/gone': [UnlockerResponse(404, ''), '<html>never</html>'],
+    }
+    tried = []
+
+    def fetch(url):
+        tried.append(url)
+        answer = answers[url].pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    engine = make_engine(fetch, tmp_path)
+    try:
+        pages = dict(engine.fetch_all(list(answers)))
+    finally:
+        engine.close()
+    assert pages == {'https://example.com/server': '<html>a</html>',
+                     'https://example.com/throttled': '<html>b</html>',
+                     'https://example.com/gone': None}
+    assert tried.count('https://example.com/gone') == 1 and engine.stats['retried'] == 2
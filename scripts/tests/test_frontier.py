@@ -0,0 +1,58 @@
+"""normalize_url key stability and URLFrontier dedup / ordering across runs"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.frontier import URLFrontier, normalize_url
+
+PRODUCT = 'https://www.seedsman.com/us-en/blue-dream-feminized-seeds'
+
+
+def test_variants_of_one_page_share_a_key():
+    variants = [
+        PRODUCT,
+        PRODUCT + '/',
+        'HTTPS://WWW.Seedsman.com/us-en/blue-dream-feminized-seeds',
+        'https://www.seedsman.com:443/us-en/blue-dream-feminized-seeds',
+        PRODUCT + '#reviews',
+        f'  {PRODUCT}  ',
+        PRODUCT + '?utm_source=newsletter&utm_medium=email&utm_campaign=4-20',
+        PRODUCT + '?gclid=abc123&fbclid=xyz&_ga=2.1&srsltid=q&ref=home',
+        PRODUCT + '?store=us',
+    ]
+    assert {normalize_url(url) for url in variants} == {PRODUCT}
+
+
+def test_meaningful_query_params_are_kept_in_a_stable_order():
+    assert normalize_url(PRODUCT + '?size=10&pack=5') == normalize_url(PRODUCT + '?pack=5&size=10&utm_term=x')
+    assert normalize_url(PRODUCT + '?pack=5') != normalize_url(PRODUCT + '?pack=10')
+    assert normalize_url(PRODUCT + '?pack=') == PRODUCT + '?pack='
+
+
+def test_key_keeps_path_case_and_non_default_ports():
+    assert normalize_url('https://shop.example.com/Blue-Dream') != normalize_url('https://shop.example.com/blue-dream')
+    assert normalize_url('http://localhost:8080/p/') == 'http://localhost:8080/p'
+    assert normalize_url('https://shop.example.com') == 'https://shop.example.com/'
+
+
+def test_normalizing_is_idempotent():
+    for url in [PRODUCT + '/?utm_source=x&b=2&a=1#top', 'HTTP://Example.com:80/', 'https://example.com/a%20b?q=a+b']:
+        key = normalize_url(url)
+        assert normalize_url(key) == key
+
+
+def test_frontier_keeps_the_first_variant_and_puts_new_urls_first(tmp_path):
+    path = str(tmp_path / 'frontier.sqlite')
+    first_run = URLFrontier('seedsman', path)
+    assert first_run.extend([PRODUCT, PRODUCT + '/?utm_source=x', 'https://www.seedsman.com/us-en/gelato']) == 2
+    first_run.close()
+
+    second_run = URLFrontier('seedsman', path)
+    second_run.extend([PRODUCT + '?gclid=1', 'https://www.seedsman.com/us-en/new-strain',
+                       'https://www.seedsman.com/us-en/gelato/'])
+    assert second_run.ordered() == ['https://www.seedsman.com/us-en/new-strain',   # never seen: fetched first
+                                    PRODUCT,                                       # the URL used before
+                                    'https://www.seedsman.com/us-en/gelato']
+    assert second_run.stats['new'] == 1
+    second_run.close()
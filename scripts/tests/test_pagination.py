@@ -0,0 +1,83 @@
+"""ListingCrawler last-page detection: pagination widget versus probing"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.pagination import ListingCrawler
+
+BASE = 'https://shop.example.com/seeds/'
+
+
+def page_url(n):
+    return f"{BASE}page/{n}/"
+
+
+def listing_page(n, widget_pages=()):
+    products = ''.join(f'<a class="product" href="/product/strain-{n}-{i}/">Strain</a>' for i in range(3))
+    widget = ''.join(f'<a href="{page_url(p)}">{p}</a>' for p in widget_pages)
+    return f'<html><body>{products}<nav>{widget}</nav></body></html>'
+
+
+class FakeEngine:
+    """Serves pages 1..last (anything beyond is a 404: None); records every URL requested"""
+
+    def __init__(self, last, widget=None):
+        self.last = last
+        self.widget = widget or (lambda n: ())
+        self.requested = []
+        self.missing_ok = []
+
+    def _page(self, url):
+        self.requested.append(url)
+        n = 1 if url == BASE else int(url.rstrip('/').rsplit('/', 1)[1])
+        return listing_page(n, self.widget(n)) if n <= self.last else None
+
+    def fetch_one(self, url, missing_ok=False):
+        if missing_ok:
+            self.missing_ok.append(url)
+        return self._page(url)
+
+    def fetch_all(self, urls):
+        for url in urls:
+            yield url, self._page(url)
+
+
+def product_urls(soup):
+    return [link['href'] for link in soup.find_all('a', class_='product')]
+
+
+def crawl(engine):
+    crawler = ListingCrawler(engine)
+    return crawler, crawler.crawl(BASE, page_url, product_urls)
+
+
+def test_widget_last_page_is_trusted_without_a_probe_past_it():
+    engine = FakeEngine(last=12, widget=lambda n: range(1, 13))
+    crawler, urls = crawl(engine)
+    assert len(urls) == 36
+    assert sorted(set(engine.requested)) == sorted([BASE] + [page_url(n) for n in range(2, 13)])
+    assert crawler.stats['probes'] == 0
+
+
+def test_windowed_widget_is_followed_through_the_pages_it_links_to():
+    engine = FakeEngine(last=9, widget=lambda n: range(max(1, n - 2), min(9, n + 3) + 1))
+    crawler, urls = crawl(engine)
+    assert len(urls) == 27
+    assert page_url(10) not in engine.requested and crawler.stats['probes'] == 0
+
+
+def test_without_a_widget_the_end_is_found_by_probing():
+    engine = FakeEngine(last=11)
+    crawler, urls = crawl(engine)
+    assert len(urls) == 33
+    assert crawler.stats['probes'] > 0
+    assert page_url(12) in engine.missing_ok      # the 404 past the end is expected, not dead-lettered
+    assert len(engine.requested) == len(set(engine.requested))
+
+
+def test_stale_widget_stops_at_the_last_page_with_products():
+    engine = FakeEngine(last=5, widget=lambda n: range(1, 8))
+    crawler, urls = crawl(engine)
+    assert len(urls) == 15
+    assert page_url(8) not in engine.requested
@@ -0,0 +1,59 @@
+"""PatternSet keyword prefilter, case-insensitive and case-sensitive"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.patterns import ATTITUDE_DESCRIPTION, MULTIVERSE_DESCRIPTION, PatternSet, required_literals
+
+
+class SpyRegex:
+    """Compiled-pattern stand-in recording every text it is run on"""
+
+    def __init__(self, regex, seen):
+        self.regex = regex
+        self.seen = seen
+
+    def search(self, text):
+        self.seen.append(self.regex.pattern)
+        return self.regex.search(text)
+
+    def findall(self, text):
+        self.seen.append(self.regex.pattern)
+        return self.regex.findall(text)
+
+
+def spied(pattern_set):
+    seen = []
+    spy = PatternSet.__new__(PatternSet)
+    spy.ignore_case = pattern_set.ignore_case
+    spy.fields = [(field, [(SpyRegex(regex, seen), keywords) for regex, keywords in compiled])
+                  for field, compiled in pattern_set.fields]
+    return spy, seen
+
+
+def test_required_literals_keep_case_for_case_sensitive_sets():
+    assert required_literals(r'THC:\s*(\d+%)') == ['thc:']
+    assert required_literals(r'THC:\s*(\d+%)', ignore_case=False) == ['THC:']
+    assert required_literals(r'(?:flowering|flower|harvest)[:\s]*', ignore_case=False) == [
+        'flowering', 'flower', 'harvest']
+    assert required_literals(r'[0-9]+ weeks') is None
+
+
+def test_case_sensitive_description_without_keywords_never_reaches_the_regexes():
+    attitude, seen = spied(ATTITUDE_DESCRIPTION)
+    assert attitude.extract("A fruity indica with thc: 20% and a heavy yield: 500 gr/m2") == {}
+    assert seen == []
+
+
+def test_case_sensitive_set_runs_only_the_fields_whose_keyword_is_present():
+    attitude, seen = spied(ATTITUDE_DESCRIPTION)
+    text = "Cannabis Seeds by Dinafem\nTHC: 22%\nFlowering fast"
+    assert attitude.extract(text) == {'breeder_name': 'Dinafem', 'thc_content': '22%'}
+    assert seen == [r'Cannabis Seeds by ([^\n]+?)(?:\s|$)', r'THC:\s*(\d+%)']
+
+
+def test_case_insensitive_set_matches_keywords_in_any_case():
+    multiverse, seen = spied(MULTIVERSE_DESCRIPTION)
+    assert multiverse.extract("Flowering: 63 days. Smooth smoke")['flowering_time'] == '63 days'
+    assert len(seen) == 1
@@ -0,0 +1,87 @@
+"""ProgressJournal resume after a partial run, and finish() only completing a finished run"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.budget import RequestBudget
+from common.progress_journal import ProgressJournal
+
+URLS = [f'https://example.com/product/{n}' for n in range(1, 6)]
+
+
+@pytest.fixture(autouse=True)
+def no_dead_letters(monkeypatch):
+    monkeypatch.setenv('SCRAPER_DEAD_LETTER', 'off')     # keep the repo's dead-letter store out of it
+
+
+def open_journal(tmp_path):
+    return ProgressJournal.open('example', directory=str(tmp_path), resume=True)
+
+
+def test_restart_resumes_with_the_unfinished_urls(tmp_path):
+    journal = open_journal(tmp_path)
+    assert journal.plan(URLS) == URLS
+    journal.mark(URLS[0], 'stored')
+    journal.mark(URLS[1], 'skipped', 'below the quality bar')
+    journal.mark(URLS[2], 'fetched')
+    journal.mark(URLS[3], 'failed', 'fetch failed')
+    journal.close()                                    # the run dies here
+
+    resumed = open_journal(tmp_path)
+    assert resumed.path == journal.path and resumed.resumed
+    assert resumed.plan(URLS) == URLS[2:]              # fetched, failed and pending are retried
+    assert resumed.errors[URLS[3]] == 'fetch failed'
+    resumed.close()
+
+
+def test_torn_last_line_is_ignored_on_resume(tmp_path):
+    journal = open_journal(tmp_path)
+    journal.plan(URLS[:2])
+    journal.mark(URLS[0], 'stored')
+    journal.close()
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"url": "https://example.com/product/2", "sta')
+
+    resumed = open_journal(tmp_path)
+    assert resumed.plan(URLS[:2]) == URLS[1:2]
+    resumed.mark(URLS[1], 'stored')
+    resumed.close()
+    assert ProgressJournal(journal.path).states == {URLS[0]: 'stored', URLS[1]: 'stored'}
+
+
+def test_finish_leaves_an_unfinished_run_open(tmp_path):
+    journal = open_journal(tmp_path)
+    journal.plan(URLS[:2])
+    journal.mark(URLS[0], 'stored')
+    journal.mark(URLS[1], 'extracted')                 # still waiting on the sink
+    assert journal.finish() is False and not journal.completed
+    journal.close()
+    assert open_journal(tmp_path).path == journal.path
+
+
+def test_finish_leaves_the_run_open_when_the_budget_ran_out(tmp_path):
+    budget = RequestBudget(max_requests=1)
+    budget.take(URLS[0])
+    budget.take(URLS[1])                               # refused
+    journal = open_journal(tmp_path)
+    journal.plan(URLS[:1])
+    journal.mark(URLS[0], 'stored')
+    assert budget.exhausted and journal.finish(budget) is False
+    journal.close()
+
+
+def test_finish_completes_a_finished_run_and_the_next_start_is_new(tmp_path):
+    journal = open_journal(tmp_path)
+    journal.plan(URLS[:2])
+    journal.mark(URLS[0], 'stored')
+    journal.mark(URLS[1], 'failed', 'no strain name')
+    assert journal.finish(RequestBudget()) is True and journal.completed
+    journal.close()
+
+    fresh = open_journal(tmp_path)
+    assert fresh.path != journal.path and not fresh.resumed
+    assert fresh.plan(URLS[:2]) == URLS[:2]
+    fresh.close()
@@ -0,0 +1,74 @@
+"""Token bucket refill and the per-domain pause after a 429, on a fake clock"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import rate_limiter
+from common.rate_limiter import DomainRateLimiter, TokenBucket, domain_of
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() advances monotonic() instead of waiting"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', clock)
+    return clock
+
+
+def test_burst_then_one_token_per_interval(clock):
+    bucket = TokenBucket(rate=0.5, burst=2)
+    assert [bucket.reserve(), bucket.reserve()] == [0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(2.0)
+    assert bucket.reserve() == pytest.approx(4.0)     # reservations queue up behind each other
+
+
+def test_tokens_refill_with_elapsed_time_up_to_the_burst(clock):
+    bucket = TokenBucket(rate=1.0, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+    clock.now += 1.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0)
+    clock.now += 60.0
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, pytest.approx(1.0)]
+
+
+def test_a_slow_request_already_counts_towards_the_delay(clock):
+    limiter = DomainRateLimiter(rates={'seedsman.com': (0.5, 1)})
+    limiter.acquire('https://www.seedsman.com/a')
+    clock.now += 1.5                                  # the first request itself took 1.5s
+    limiter.acquire('https://www.seedsman.com/b')
+    assert clock.slept == [pytest.approx(0.5)]
+
+
+def test_pause_after_a_429_holds_back_the_whole_domain(clock):
+    limiter = DomainRateLimiter(rates={'seedsman.com': (1.0, 2), 'neptuneseedbank.com': (1.0, 2)})
+    limiter.pause('https://www.seedsman.com/product/a', 30)
+    limiter.acquire('https://www.seedsman.com/product/b')
+    assert clock.slept == [pytest.approx(31.0)]       # the paused 30s plus the token the request itself takes
+    limiter.acquire('https://neptuneseedbank.com/x')
+    assert clock.slept == [pytest.approx(31.0)]       # other domains are not paused
+    assert limiter.stats['seedsman.com']['paused'] == 1 and limiter.stats['seedsman.com']['throttled'] == 1
+
+
+def test_subdomains_share_their_seed_bank_bucket():
+    assert domain_of('https://www.seedsman.com/us-en/x') == 'seedsman.com'
+    assert domain_of('https://shop.example.org/') == 'shop.example.org'
+    assert domain_of('https://www.example.org/') == 'example.org'
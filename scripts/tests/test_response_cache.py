@@ -0,0 +1,78 @@
+"""ResponseCache TTL expiry and LRU eviction, on a fake clock"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import response_cache
+from common.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(response_cache, 'time', clock)
+    return clock
+
+
+def page(seed, size=4000):
+    """Page body that zlib can barely compress, so every blob has about the same size"""
+    rng = random.Random(seed)
+    return '<html>' + ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789') for _ in range(size)) + '</html>'
+
+
+def test_pages_expire_after_the_ttl(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / 'responses.sqlite'), ttl=3600)
+    cache.put('https://example.com/a', '<html>a</html>')
+    clock.now += 3599
+    assert cache.get('https://example.com/a') == '<html>a</html>'
+    clock.now += 2
+    assert cache.get('https://example.com/a') is None
+    assert cache.get('https://example.com/a', max_age=float('inf')) == '<html>a</html>'   # offline replay
+    assert cache.stats['stale'] == 1
+    assert cache.purge_expired() == 1 and cache.urls() == []
+    cache.close()
+
+
+def test_least_recently_used_pages_are_evicted_first(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(response_cache, 'EVICT_EVERY', 1)
+    cache = ResponseCache(str(tmp_path / 'responses.sqlite'), max_bytes=10 ** 9)
+    cache.put('https://example.com/a', page('a'))
+    blob_size = cache._total_bytes()
+    cache.max_bytes = int(blob_size * 2.5)
+    clock.now += 1
+    cache.put('https://example.com/b', page('b'))
+    clock.now += 1
+    assert cache.get('https://example.com/a')         # a is now more recently used than b
+    clock.now += 1
+    cache.put('https://example.com/c', page('c'))
+    assert cache.urls() == ['https://example.com/a', 'https://example.com/c']
+    assert cache.stats['evicted'] == 1 and cache._total_bytes() <= cache.max_bytes
+    cache.close()
+
+
+def blobs(cache):
+    return cache.conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+
+
+def test_identical_bodies_share_one_blob(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / 'responses.sqlite'))
+    cache.put('https://example.com/a', page('same'))
+    cache.put('https://example.com/b', page('same'))
+    assert blobs(cache) == 1
+    cache.put('https://example.com/a', page('changed'))
+    assert blobs(cache) == 2
+    cache.put('https://example.com/b', page('changed'))
+    assert blobs(cache) == 1                           # the old blob went with its last URL
+    cache.close()
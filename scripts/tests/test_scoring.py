@@ -0,0 +1,75 @@
+"""BatchScorer against each registered scraper's own calculate_quality_score / determine_quality_tier"""
+
+import os
+import random
+import sys
+from decimal import Decimal
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.scoring import BatchScorer
+from common.seed_banks import SEED_BANKS
+
+# Values around the "more than 2 characters once stripped" test, including non-strings stored records carry
+VALUES = [None, '', '  ', 'ab', ' ab ', 'abc', '  abc  ', 'Indica dominant', 0, 7, 63, 7.5, Decimal('18.5'),
+          True, False, ['a'], ['Berry', 'Sweet'], {'a': 1}, 'n/a']
+
+
+@pytest.fixture(scope='module')
+def scrapers():
+    classes = [bank.load_class() for bank in SEED_BANKS.values()]
+    return {cls.SEED_BANK: cls.parser() for cls in classes if getattr(cls, 'FIELD_WEIGHTS', None)}
+
+
+@pytest.fixture(scope='module')
+def scorer():
+    return BatchScorer.from_registry()
+
+
+def random_records(scrapers, count, seed=7):
+    rng = random.Random(seed)
+    fields = sorted({field for scraper in scrapers.values() for field in scraper.FIELD_WEIGHTS})
+    records = []
+    for i in range(count):
+        record = {'strain_id': f'strain-{i}'}
+        for field in fields:
+            if rng.random() < 0.6:
+                record[field] = rng.choice(VALUES)
+        record['seed_bank'] = rng.choice(sorted(scrapers))   # seed_bank is itself a weighted field for some
+        records.append(record)
+    return records
+
+
+def test_registry_weights_cover_every_four_method_scraper(scrapers, scorer):
+    assert set(scorer.seed_banks) == set(scrapers) and len(scrapers) >= 8
+
+
+def test_batch_scores_and_tiers_match_the_scrapers(scrapers, scorer):
+    records = random_records(scrapers, 2000)
+    scores, tiers, scored = scorer.score(scorer.table(records))
+    assert scored.all()
+    for record, score, tier in zip(records, scores, tiers):
+        scraper = scrapers[record['seed_bank']]
+        expected = scraper.calculate_quality_score(record)
+        assert score == expected, record
+        assert tier == scraper.determine_quality_tier(expected), record
+
+
+def test_every_tier_boundary_is_binned_like_determine_quality_tier(scrapers, scorer):
+    bank, scraper = next(iter(scrapers.items()))
+    fields = [field for field in scraper.FIELD_WEIGHTS if field != 'seed_bank']
+    records = [{**{field: 'filled' for field in fields[:n]}, 'seed_bank': bank} for n in range(len(fields) + 1)]
+    scores, tiers, _ = scorer.score(scorer.table(records))
+    assert [scraper.determine_quality_tier(scraper.calculate_quality_score(r)) for r in records] == list(tiers)
+    assert list(scores) == sorted(scores) and scores[-1] == 100
+    assert {'Minimal', 'Basic', 'Medium', 'High', 'Premium'} <= set(tiers)
+
+
+def test_seed_banks_without_weights_are_left_unscored(scorer):
+    records = [{'seed_bank': 'The Attitude Seed Bank', 'strain_name': 'Blue Dream'}, {'strain_name': 'No bank'}]
+    scores, tiers, scored = scorer.score(scorer.table(records))
+    assert not scored.any() and np.isnan(scores).all() and list(tiers) == [None, None]
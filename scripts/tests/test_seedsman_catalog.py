@@ -0,0 +1,92 @@
+"""Seedsman catalog records against the spec-table extraction of the same product page"""
+
+import importlib.util
+import os
+
+SCRIPTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_spec = importlib.util.spec_from_file_location(
+    'seedsman_graphql_scraper', os.path.join(SCRIPTS, 'Seedsman', 'seedsman_graphql_scraper.py'))
+seedsman = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(seedsman)
+from common.unlocker_client import UnlockerResponse      # importable once the scraper module set up sys.path
+
+ATTRIBUTES = {'data': {'attributesList': {'items': [
+    {'code': 'brand', 'label': 'Brand/breeder'},
+    {'code': 'thc_content', 'label': 'THC content'},
+    {'code': 'yield_indoor', 'label': 'Yield indoor'},
+    {'code': 'flowering_time', 'label': 'Photoperiod flowering time'},
+    {'code': 'aroma', 'label': 'Aroma'},
+    {'code': 'sex', 'label': 'Sex'},
+    {'label': 'Variety'},                               # no code: left unmapped
+    {'code': 'color', 'label': 'Colour'},               # not a spec field
+]}}}
+
+PRODUCT = {
+    'id': 4711,
+    'name': 'Blue Dream Feminized Seeds',
+    'sku': 'SMN-4711',
+    'url_key': 'blue-dream-feminized-seeds',
+    'short_description': {'html': '<p>A <b>classic</b> sativa-dominant hybrid.</p>'},
+    'custom_attributesV2': {'items': [
+        {'code': 'brand', 'selected_options': [{'label': 'Humboldt Seed Org'}]},
+        {'code': 'thc_content', 'value': '17-24%'},
+        {'code': 'yield_indoor', 'value': '500-600 g/m2'},
+        {'code': 'flowering_time', 'value': ' 9-10 weeks '},
+        {'code': 'aroma', 'selected_options': [{'label': 'Berry'}, {'label': 'Sweet'}, {'label': ''}]},
+        {'code': 'sex', 'selected_options': [{'label': 'Feminised'}]},
+        {'code': 'color', 'value': 'Purple'},
+        {'code': 'unknown_attribute', 'value': 'ignored'},
+    ]},
+}
+
+PRODUCT_PAGE = """
+<html><body>
+<div class="ProductActions-ShortDescription"><p>A <b>classic</b> sativa-dominant hybrid.</p></div>
+<table id="product-attribute-specs-table">
+  <tr><th class="col label"><h4>Brand/breeder</h4></th><td class="col data"><span>Humboldt Seed Org</span></td></tr>
+  <tr><th class="col label"><h4>THC content</h4></th><td class="col data"><h3>17-24%</h3></td></tr>
+  <tr><th class="col label"><h4>Yield indoor</h4></th><td class="col data"><h3>500-600 g/m2</h3></td></tr>
+  <tr><th class="col label"><h4>Photoperiod flowering time</h4></th><td class="col data"> 9-10 weeks </td></tr>
+  <tr><th class="col label"><h4>Aroma</h4></th><td class="col data"><span>Berry</span><span>Sweet</span></td></tr>
+  <tr><th class="col label"><h4>Sex</h4></th><td class="col data"><span>Feminised</span></td></tr>
+  <tr><th class="col label"><h4>Colour</h4></th><td class="col data"><span>Purple</span></td></tr>
+</table>
+</body></html>
+"""
+
+TIMESTAMPS = ('created_at', 'updated_at')
+
+
+def make_scraper():
+    scraper = seedsman.SeedsmanGraphQLScraper.__new__(seedsman.SeedsmanGraphQLScraper)
+    scraper._brightdata_graphql_request = lambda query, variables=None: ATTRIBUTES
+    scraper.attribute_codes = scraper.catalog_attribute_codes()
+    return scraper
+
+
+def without_timestamps(record):
+    return {field: value for field, value in record.items() if field not in TIMESTAMPS}
+
+
+def test_attribute_codes_skip_items_without_code():
+    assert make_scraper().attribute_codes == {
+        'brand': 'breeder_name', 'thc_content': 'thc_content', 'yield_indoor': 'yield_indoor',
+        'flowering_time': 'flowering_time', 'aroma': 'aroma', 'sex': 'sex'}
+
+
+def test_catalog_record_matches_spec_table_extraction():
+    scraper = make_scraper()
+    url = seedsman.PRODUCT_URL.format(url_key=PRODUCT['url_key'])
+    from_catalog = scraper.catalog_record(PRODUCT)
+    from_page = scraper.extract_strain_data_4method(PRODUCT_PAGE, url, PRODUCT)
+    assert without_timestamps(from_catalog) == without_timestamps(from_page)
+    assert from_catalog['aroma'] == 'Berry | Sweet'
+    assert from_catalog['flowering_time'] == '9-10 weeks'
+    assert from_catalog['breeder_name'] == 'Humboldt Seed Org'
+    assert from_catalog['extraction_methods_used'] == ['structured', 'description', 'patterns', 'fallback']
+
+
+def test_unparseable_graphql_body_is_a_failed_page():
+    scraper = make_scraper()
+    assert scraper._graphql_result(UnlockerResponse(200, '<html>challenge</html>')) is None
+    assert scraper._graphql_result(UnlockerResponse(200, '{"data": {}}')) == {'data': {}}
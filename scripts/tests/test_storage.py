@@ -0,0 +1,21 @@
+"""Local storage backends"""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.storage import SQLiteSink
+
+
+def test_sqlite_sink_flushes_from_another_thread(tmp_path):
+    sink = SQLiteSink(str(tmp_path / 'strains.sqlite'))
+    written = []
+    sink.on_written = written.extend
+    sink.put({'strain_id': 'blue-dream', 'strain_name': 'Blue Dream', 'seed_bank': 'Seedsman'})
+    worker = threading.Thread(target=sink.flush)
+    worker.start()
+    worker.join()
+    assert not sink.failed and len(written) == 1
+    assert [record['strain_name'] for record in sink.records()] == ['Blue Dream']
+    sink.close()